@@ -16,7 +16,17 @@ class Settings(BaseSettings):
     temperature: float = 0.3
 
     vector_dimension: int = 3072
-    qdrant_collection: str = "gorgia_products_hybrid_1"
+    # Alias the products pipelines repoint after each validated build (common.collection_versions)
+    qdrant_collection: str = "gorgia_products_hybrid"
+    # Read instead of the alias until `collection_alias.py migrate` has created it
+    qdrant_legacy_collection: str | None = "gorgia_products_hybrid_1"
+    # Oversampling for collections built with the "scalar" / "binary" presets (also used by benchmarks/quantization_bench.py)
+    scalar_oversampling: float = 2.0
+    binary_oversampling: float = 3.0
+
+    translation_cache_size: int = 2000
+    translation_cache_path: str | None = None
+    translation_concurrency: int = 4
 
     dev: bool = False
 
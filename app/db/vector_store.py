@@ -1,5 +1,6 @@
 from qdrant_client import QdrantClient, AsyncQdrantClient
 from qdrant_client.models import SparseVector, NamedSparseVector, Prefetch, SparseVector, Fusion, FusionQuery
+from qdrant_client.models import SearchParams, QuantizationSearchParams, ScalarQuantization, BinaryQuantization
 from typing import List, Dict, Any, Optional
 from ..config import settings
 from ..utils import embeddings
@@ -28,16 +29,62 @@ class VectorStore:
         self.collection_name = settings.qdrant_collection
         self._collection_cache = {}  # Cache collection configurations
 
-    async def _has_named_vectors(self, collection: str) -> bool:
+    async def resolve_collection(self):
+        """Serve the legacy collection until the products alias exists, i.e. until the migration has run."""
+        legacy = settings.qdrant_legacy_collection
+        if not legacy:
+            return
+        try:
+            aliases = (await self.async_client.get_aliases()).aliases
+            if not any(alias.alias_name == settings.qdrant_collection for alias in aliases):
+                if await self.async_client.collection_exists(legacy):
+                    self.collection_name = legacy
+        except Exception as e:
+            print(f"⚠️ Failed to look up alias {settings.qdrant_collection}: {e}")
+        print(f"📦 Serving products from {self.collection_name}")
+
+    def _quantization_search_params(self, quantization) -> Optional[SearchParams]:
+        """Rescore quantized candidates with the original vectors, oversampling to keep recall."""
+        if isinstance(quantization, BinaryQuantization):
+            oversampling = settings.binary_oversampling
+        elif isinstance(quantization, ScalarQuantization):
+            oversampling = settings.scalar_oversampling
+        else:
+            return None
+        return SearchParams(quantization=QuantizationSearchParams(rescore=True, oversampling=oversampling))
+
+    async def _dense_config(self, collection: str) -> Dict[str, Any]:
+        """
+        Dense vector layout of a collection: named or not, its size and the search params for its
+        quantization. Collections may store Matryoshka-truncated vectors (e.g. 768 or 1536 dims),
+        so the full query embedding is cut to `size` per collection.
+        """
         if collection not in self._collection_cache:
+            config = {"named": False, "size": None, "search_params": None}
             try:
                 info = await self.async_client.get_collection(collection)
-                has_named = isinstance(info.config.params.vectors, dict)
-                self._collection_cache[collection] = has_named
+                vectors = info.config.params.vectors
+                config["named"] = isinstance(vectors, dict)
+                dense = vectors.get("dense") if config["named"] else vectors
+                if dense is not None:
+                    config["size"] = dense.size
+                    config["search_params"] = self._quantization_search_params(
+                        dense.quantization_config or info.config.quantization_config
+                    )
             except Exception:
-                self._collection_cache[collection] = False
+                pass
+            self._collection_cache[collection] = config
         return self._collection_cache[collection]
 
+    async def _has_named_vectors(self, collection: str) -> bool:
+        return (await self._dense_config(collection))["named"]
+
+    def _fit_query_vector(self, vector, config: Dict[str, Any]) -> List[float]:
+        """Cut the float32 query embedding to the collection's size; Qdrant requests take plain floats."""
+        size = config["size"]
+        vector = vector[:size] if size and len(vector) > size else vector
+        return vector.tolist() if hasattr(vector, "tolist") else vector
+
     async def dense_search(
         self,
         query: str,
@@ -56,7 +103,9 @@ class VectorStore:
         query_vector = await self.embeddings.embed_query(query)
 
         collection = collection or self.collection_name
-        if collection and await self._has_named_vectors(collection):
+        dense_config = await self._dense_config(collection)
+        query_vector = self._fit_query_vector(query_vector, dense_config)
+        if collection and dense_config["named"]:
             vector_param = ("dense", query_vector)
         else:
             vector_param = query_vector
@@ -66,6 +115,7 @@ class VectorStore:
             query_vector=vector_param,
             limit=k,
             query_filter=filter,
+            search_params=dense_config["search_params"],
         )
         
         results = []
@@ -155,12 +205,18 @@ class VectorStore:
             sparse_vector = await self._create_sparse_embedding(query)
 
             collection = collection or self.collection_name
+            dense_config = await self._dense_config(collection)
 
             search_result = await self.async_client.query_points(
                 collection_name=collection,
                 prefetch=[
                     Prefetch(query=sparse_vector, using="bm25", limit=k*2),
-                    Prefetch(query=dense_vector, using="dense", limit=k*2)
+                    Prefetch(
+                        query=self._fit_query_vector(dense_vector, dense_config),
+                        using="dense",
+                        limit=k*2,
+                        params=dense_config["search_params"]
+                    )
                 ],
                 query=FusionQuery(fusion=Fusion.RRF),
                 limit=k,
@@ -183,6 +239,8 @@ class VectorStore:
 
         except Exception as e:
             print(f"Hybrid search failed: {e}")
+            # The alias may have moved to a version with another size / preset; re-read it
+            self._collection_cache.pop(collection or self.collection_name, None)
             return await self.dense_search(query, k, filter, collection)
     
     async def search_by_id(self, ids: List[int], collection: str = None) -> List[SearchResult]:
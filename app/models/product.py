@@ -1,6 +1,9 @@
 from typing import Any, Dict, Optional, Union
 from pydantic import BaseModel, model_validator, field_validator
 
+# Versions of the compact payload written by the products ingestion pipeline (2 added metadata.brand)
+COMPACT_PAYLOAD_SCHEMA_VERSIONS = {1, 2}
+
 
 class Product(BaseModel):
     id: Optional[int] = None
@@ -19,13 +22,18 @@ class Product(BaseModel):
     characteristics: Optional[str] = None
     branch_availability: Optional[str] = None
     image_url: Optional[str] = None
+    previous_price: Optional[Union[str, float]] = None
+    in_stock: Optional[bool] = None
+    url: Optional[str] = None
+    summary: Optional[str] = None
+    card: Optional[Dict[str, Any]] = None
 
     class Config:
         extra = "allow"
         populate_by_name = True
         validate_assignment = False
 
-    @field_validator('price', 'wholesale_price', mode='before')
+    @field_validator('price', 'wholesale_price', 'previous_price', mode='before')
     @classmethod
     def convert_price_to_string(cls, v):
         """Convert price values to strings for consistent handling"""
@@ -39,6 +47,8 @@ class Product(BaseModel):
     @classmethod
     def ensure_https_in_image_url(cls, v):
         """Ensure image URLs use HTTPS protocol"""
+        if v is None:
+            return None
         return f"https://{v}"
 
     @model_validator(mode='before')
@@ -119,6 +129,10 @@ class Product(BaseModel):
         else:
             data = payload
 
+        # Compact payloads already carry the precomputed strings under Product's field names
+        if data.get('schema_version') in COMPACT_PAYLOAD_SCHEMA_VERSIONS:
+            return Product(**data)
+
         # Manually assemble attributes
         attributes = {
             'id': data.get('id'),
@@ -201,6 +215,12 @@ class Product(BaseModel):
         if self.wholesale_price:
             result['wholesalePrice'] = self.wholesale_price
 
+        if self.previous_price:
+            result['previousPrice'] = self.previous_price
+
+        if self.in_stock is not None:
+            result['inStock'] = self.in_stock
+
         if need_location and self.branch_availability:
             result['branchAvailability'] = self.branch_availability
 
@@ -215,6 +235,10 @@ class Product(BaseModel):
             'price': self.price,
             'productUnit': self.product_unit,
             'wholesalePrice': self.wholesale_price,
+            'previousPrice': self.previous_price,
+            'inStock': self.in_stock,
+            'summary': self.summary,
+            'url': self.url,
         }
 
         if self.characteristics:
@@ -229,6 +253,10 @@ class Product(BaseModel):
         if not self.product:
             return {}
 
+        if self.card:
+            result = {**self.card, 'price': Product._format_currency(self.price)}
+            return {k: v for k, v in result.items() if v is not None}
+
         result = {
             'id': self.id,
             'title': self.product,
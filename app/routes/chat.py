@@ -12,7 +12,7 @@ from .chat_helpers import (
     build_message_with_images,
     find_last_ai_message,
 )
-from ..utils.translator import translate_if_needed
+from ..utils.translator import translate_if_needed, translator_service
 from ..config import settings
 from langchain_core.messages import SystemMessage
 
@@ -31,8 +31,15 @@ app.middleware("http")(token_validation_middleware)
 
 @app.on_event("startup")
 async def startup_event():
-    """Initialize database tables on server startup"""
+    """Initialize database tables and pick the products collection on server startup"""
     await chat.initialize_chat_table()
+    await vector_store.resolve_collection()
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Persist the translation cache (no-op unless TRANSLATION_CACHE_PATH is set)"""
+    await translator_service.asave()
 
 
 @app.get("/")
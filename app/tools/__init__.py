@@ -1,5 +1,6 @@
 from .search_products import search_products
 from .product_details import get_product_details
+from .brand_availability import get_brand_availability
 from .regular_response import respond_to_user
 # from .catalog_info import get_catalog_info
 from .store_policy import get_store_policy
@@ -12,6 +13,7 @@ from .check_order_status import check_order_status
 tools = [
     search_products,
     get_product_details,
+    get_brand_availability,
     respond_to_user,
     # get_catalog_info,
     get_store_policy,
@@ -0,0 +1,44 @@
+from langchain_core.tools import tool
+from pydantic import BaseModel, Field
+from typing import Optional
+from ..utils.brand_index import brand_index
+
+class BrandAvailabilityInput(BaseModel):
+    brand: Optional[str] = Field(
+        None,
+        description="Brand name the user asks about (e.g. 'Samsung'). Write it as the user wrote it."
+    )
+    category: Optional[str] = Field(
+        None,
+        description="Category or subcategory name the user asks about (e.g. 'Smartphones'). Only English names are accepted."
+    )
+
+@tool(args_schema=BrandAvailabilityInput)
+async def get_brand_availability(brand: Optional[str] = None, category: Optional[str] = None) -> str:
+    """
+    Tool to check which brands we carry and in which categories.
+    Use this when the user asks whether we have a brand, which brands exist in a category, or where a brand is sold.
+    """
+    print(f"[Brands] - brand: 🔸{brand}🔸 category: 🔸{category}🔸")
+    if not brand and not category:
+        return "Provide a brand, a category or both."
+
+    result = {}
+    if brand:
+        canonical_brand = brand_index.find_brand(brand)
+        result["brand"] = canonical_brand
+        result["brand_available"] = canonical_brand is not None
+        if canonical_brand:
+            result["categories"] = brand_index.categories_for_brand(canonical_brand)
+
+    if category:
+        canonical_category = brand_index.find_category(category)
+        result["category"] = canonical_category
+        if canonical_category:
+            brands = brand_index.brands_for_category(canonical_category)
+            if brand:
+                result["brand_in_category"] = result.get("brand") in brands
+            else:
+                result["brands"] = brands
+
+    return str(result)
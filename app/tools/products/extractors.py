@@ -1,5 +1,7 @@
 def extract_product_payload(item, is_lexical: bool) -> dict:
     metadata = item.payload.get("metadata", {})
+    if "schema_version" in metadata:
+        return _extract_compact_payload(metadata, is_lexical)
     product = metadata.get("product", {})
 
     route = product.get("route")
@@ -17,4 +19,19 @@ def extract_product_payload(item, is_lexical: bool) -> dict:
     if is_lexical:
         payload["barCode"] = product.get("barCode")
 
-    return payload
\ No newline at end of file
+    return payload
+
+def _extract_compact_payload(metadata: dict, is_lexical: bool) -> dict:
+    payload = {
+        "id": metadata.get("id"),
+        "name": metadata.get("product"),
+        "price": metadata.get("price"),
+        "isInStock": metadata.get("in_stock"),
+        "url": metadata.get("url"),
+    }
+    if metadata.get("previous_price") is not None:
+        payload["previousPrice"] = metadata.get("previous_price")
+    if is_lexical:
+        payload["barCode"] = metadata.get("bar_code")
+
+    return payload
@@ -16,14 +16,11 @@ async def build_products_text_and_id_map(rag_results, is_lexical: bool):
     products_texts = ""
     id_to_item = {}
     for item in rag_results:
-        metadata = item.payload.get("metadata", {})
-        product = metadata.get("product", {})
-        product_id = product.get("id")
+        p = extract_product_payload(item, is_lexical=is_lexical)
+        product_id = p.get("id")
         if product_id:
             id_to_item[str(product_id)] = item
 
-        p = extract_product_payload(item, is_lexical=is_lexical)
-
         price_line = f"Price: {p.get('price', 'N/A')} GEL" + (f" (was {p['previousPrice']} GEL)" if p.get('previousPrice') is not None else "")
         products_texts += (
             f"ID: {p.get('id')}\n"
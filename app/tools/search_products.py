@@ -4,6 +4,7 @@ from ..db import vector_store
 from .products.extractors import extract_product_payload
 from .products.rerank import rerank_products
 from ..models.product import Product
+from ..utils.brand_index import brand_index, brand_key
 from typing import Optional
 
 class PriceRange(BaseModel):
@@ -21,8 +22,9 @@ class PriceRange(BaseModel):
 
 class SearchFilters(BaseModel):
     price_range: Optional[PriceRange] = Field(None, description="Price range filter")
+    brand: Optional[str] = Field(None, description="Brand name filter, only when the user asks for a specific brand")
     
-    def to_qdrant_filters(self) -> Optional[dict]:
+    def to_qdrant_filters(self, include_brand: bool = True) -> Optional[dict]:
         conditions = []
         
         if self.price_range:
@@ -32,6 +34,14 @@ class SearchFilters(BaseModel):
                     "key": "metadata.price",
                     "range": range_params
                 })
+
+        if include_brand and self.brand:
+            canonical_brand = brand_index.find_brand(self.brand)
+            if canonical_brand:
+                conditions.append({
+                    "key": "metadata.brand",
+                    "match": {"value": brand_key(canonical_brand)}
+                })
         
         if not conditions:
             return None
@@ -44,7 +54,7 @@ class SearchProductsInput(BaseModel):
     )
     filters: Optional[SearchFilters] = Field(
         None,
-        description="Use price_range to filter by minimum and maximum price whenever the user query contains price range."
+        description="Use price_range to filter by minimum and maximum price whenever the user query contains price range. Use brand when the user asks for a specific brand."
     )
     need_location: bool = Field(
         False,
@@ -66,6 +76,16 @@ async def search_products(query: str, filters: Optional[SearchFilters] = None, n
         results = await vector_store.hybrid_search(query, k=20, filter=qdrant_filter)
         print(f"Found {len(results)} hybrid search results")
 
+        if not results and filters and filters.brand:
+            # Points embedded before the brand field existed (or brands missing from the index)
+            # never match metadata.brand, so fall back to matching the brand through the query text
+            brand_query = query if brand_key(filters.brand) in brand_key(query) else f"{filters.brand} {query}"
+            print(f"🏷️ No results for brand filter, retrying with brand in query: {brand_query}")
+            results = await vector_store.hybrid_search(
+                brand_query, k=20, filter=filters.to_qdrant_filters(include_brand=False)
+            )
+            print(f"Found {len(results)} hybrid search results without brand filter")
+
         cleaned = []
         for i in results:
             try:
@@ -0,0 +1,171 @@
+import difflib
+import json
+import os
+import time
+from pathlib import Path
+from threading import Lock
+from typing import Optional
+from ..config.settings import ROOT_DIR
+
+BRAND_SUMMARY_PATH = ROOT_DIR / "brand_summary.json"
+
+
+def _normalize(value: str) -> str:
+    return " ".join((value or "").casefold().split())
+
+
+def _stem_tokens(value: str) -> frozenset[str]:
+    """Words of a normalized name with a plural "s" dropped, so "smartphones" and "smartphone" compare equal."""
+    return frozenset(
+        token[:-1] if len(token) > 3 and token.endswith("s") and not token.endswith("ss") else token
+        for token in value.split()
+    )
+
+
+def brand_key(brand: str) -> str:
+    """Form of a brand name stored in the products payload (metadata.brand) and matched by the brand filter."""
+    return _normalize(brand)
+
+
+class BrandIndex:
+    """
+    In-memory inverted index over brand_summary.json (brand -> categories, category -> brands).
+
+    The file is re-read whenever its modification time changes, so regenerating it with
+    utils/mappers/brands.py is picked up by running workers without a restart.
+    """
+
+    def __init__(
+        self,
+        path: Path = BRAND_SUMMARY_PATH,
+        check_interval: float = 30.0,
+        fuzzy_cutoff: float = 0.8,
+        category_fuzzy_cutoff: float = 0.9,
+    ):
+        self.path = Path(path)
+        self.check_interval = check_interval
+        self.fuzzy_cutoff = fuzzy_cutoff
+        # Category names share long common words ("Smartphone Rings", "Smartphone Cases"),
+        # so misspellings are only accepted when they are very close
+        self.category_fuzzy_cutoff = category_fuzzy_cutoff
+        self._lock = Lock()
+        self._mtime = None
+        self._last_check = 0.0
+        self._brand_names: dict[str, str] = {}
+        self._category_names: dict[str, str] = {}
+        self._brand_to_categories: dict[str, set[str]] = {}
+        self._category_to_brands: dict[str, set[str]] = {}
+
+    def _build(self, entries: list[dict]):
+        brand_names, category_names = {}, {}
+        brand_to_categories, category_to_brands = {}, {}
+
+        for entry in entries:
+            parent = (entry.get("category") or "").strip()
+            subcategory = (entry.get("subcategory") or "").strip()
+            label = f"{parent} / {subcategory}" if subcategory else parent
+            if not label:
+                continue
+
+            # Brands are reachable through the parent, the subcategory and the full label
+            category_keys = {_normalize(label), _normalize(parent)}
+            if subcategory:
+                category_keys.add(_normalize(subcategory))
+                category_names.setdefault(_normalize(subcategory), subcategory)
+            category_names.setdefault(_normalize(parent), parent)
+            category_names[_normalize(label)] = label
+
+            for brand in entry.get("brands", []) or []:
+                key = _normalize(brand)
+                if not key:
+                    continue
+                brand_names.setdefault(key, brand.strip())
+                brand_to_categories.setdefault(key, set()).add(label)
+                for category_key in category_keys:
+                    category_to_brands.setdefault(category_key, set()).add(brand_names[key])
+
+        self._brand_names = brand_names
+        self._category_names = category_names
+        self._brand_to_categories = brand_to_categories
+        self._category_to_brands = category_to_brands
+
+    def refresh(self, force: bool = False) -> bool:
+        """Reload the index if the summary file changed. Returns True when a reload happened."""
+        now = time.monotonic()
+        if not force and now - self._last_check < self.check_interval and self._mtime is not None:
+            return False
+
+        with self._lock:
+            self._last_check = now
+            try:
+                mtime = os.stat(self.path).st_mtime
+            except FileNotFoundError:
+                return False
+            if not force and mtime == self._mtime:
+                return False
+
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    entries = json.load(f)
+            except (OSError, ValueError) as e:
+                print(f"⚠️ Failed to load brand index from {self.path}: {e}")
+                return False
+
+            self._build(entries)
+            self._mtime = mtime
+            print(f"🏷️ Brand index loaded: {len(self._brand_names)} brands, {len(self._category_names)} categories")
+            return True
+
+    def __len__(self) -> int:
+        self.refresh()
+        return len(self._brand_names)
+
+    def _resolve(self, value: str, names: dict[str, str], cutoff: float) -> Optional[str]:
+        """Exact, singular/plural, prefix and token matches are tried before the fuzzy match."""
+        key = _normalize(value)
+        if not key:
+            return None
+        if key in names:
+            return key
+
+        stem = _stem_tokens(key)
+        same_stem = [name for name in names if _stem_tokens(name) == stem]
+        if same_stem:
+            return min(same_stem, key=len)
+
+        prefixed = [name for name in names if name.startswith(key + " ")]
+        if len(prefixed) == 1:
+            return prefixed[0]
+
+        # The most specific known name whose words all appear in the value ("samsung galaxy" -> "samsung")
+        contained = [name for name in names if _stem_tokens(name) <= stem]
+        if contained:
+            return max(contained, key=lambda name: (len(_stem_tokens(name)), len(name)))
+
+        matches = difflib.get_close_matches(key, names.keys(), n=1, cutoff=cutoff)
+        return matches[0] if matches else None
+
+    def find_brand(self, name: str) -> Optional[str]:
+        """Return the canonical brand name for a case-insensitive or misspelled brand, or None."""
+        self.refresh()
+        key = self._resolve(name, self._brand_names, self.fuzzy_cutoff)
+        return self._brand_names[key] if key else None
+
+    def find_category(self, name: str) -> Optional[str]:
+        """Return the canonical category label for a case-insensitive or misspelled category, or None."""
+        self.refresh()
+        key = self._resolve(name, self._category_names, self.category_fuzzy_cutoff)
+        return self._category_names[key] if key else None
+
+    def categories_for_brand(self, name: str) -> list[str]:
+        self.refresh()
+        key = self._resolve(name, self._brand_names, self.fuzzy_cutoff)
+        return sorted(self._brand_to_categories.get(key, ())) if key else []
+
+    def brands_for_category(self, name: str) -> list[str]:
+        self.refresh()
+        key = self._resolve(name, self._category_names, self.category_fuzzy_cutoff)
+        return sorted(self._category_to_brands.get(key, ())) if key else []
+
+
+brand_index = BrandIndex()
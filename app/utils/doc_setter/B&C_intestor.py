@@ -1,5 +1,6 @@
 import asyncio
-from catalog import run_catalog_pipeline, run_brands_pipeline
+from catalog import run_catalog_build
+from common.orchestrator import IngestionOrchestrator, PipelineSpec
 from loguru import logger
 
 COLLECTION_NAME = "gorgia_catalog_hybrid"
@@ -7,12 +8,15 @@ COLLECTION_NAME = "gorgia_catalog_hybrid"
 async def run_all_pipelines():
     logger.info("Starting both pipelines concurrently...")
 
-    catalog_task = asyncio.create_task(run_catalog_pipeline())
-    brands_task = asyncio.create_task(run_brands_pipeline(collection_name=COLLECTION_NAME))
+    # Catalog and brands share one new version of the collection; the alias moves once both are in
+    success = await IngestionOrchestrator([
+        PipelineSpec("catalog_build", run_catalog_build, alias=COLLECTION_NAME),
+    ]).run()
 
-    await asyncio.gather(catalog_task, brands_task)
-
-    logger.info("All pipelines completed successfully!")
+    if success:
+        logger.info("All pipelines completed successfully!")
+    else:
+        logger.error(f"Catalog build failed; {COLLECTION_NAME} was left unchanged")
 
 
 if __name__ == "__main__":
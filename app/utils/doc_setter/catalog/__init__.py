@@ -1,5 +1,4 @@
-from .pipeline import run_catalog_pipeline
+from .pipeline import run_catalog_pipeline, run_catalog_build
 from .brands import run_brands_pipeline
 
-__all__ = ['run_catalog_pipeline', 'run_brands_pipeline']
-
+__all__ = ['run_catalog_pipeline', 'run_catalog_build', 'run_brands_pipeline']
@@ -30,8 +30,8 @@ def _add_id_to_metadata(metadata: dict) -> dict:
     return metadata
 
 
-async def _process_brands_data(brand_json_list: list[dict], max_batch_size: int, collection_name: str):
-    embedding_creator = EmbeddingCreator('gemini-embedding-001', VECTOR_SIZE)
+async def _process_brands_data(brand_json_list: list[dict], max_batch_size: int, collection_name: str, vector_size: int = VECTOR_SIZE):
+    embedding_creator = EmbeddingCreator('gemini-embedding-001', vector_size)
     point_inserter = PointInserter(collection_name=collection_name, max_retries=2)
     
     brand_json_list = [_add_id_to_metadata(item) for item in brand_json_list]
@@ -56,7 +56,7 @@ async def _process_brands_data(brand_json_list: list[dict], max_batch_size: int,
     return total_inserted
 
 
-async def run_brands_pipeline(file_path: str = 'brand_summary.json', max_batch_size: int = 20, collection_name: str = 'gorgia_catalog_hybrid'):
+async def run_brands_pipeline(file_path: str = 'brand_summary.json', max_batch_size: int = 20, collection_name: str = 'gorgia_catalog_hybrid', vector_size: int = VECTOR_SIZE):
     brand_json_list = await _read_json_file(file_path)
-    await _process_brands_data(brand_json_list, max_batch_size, collection_name)
+    return await _process_brands_data(brand_json_list, max_batch_size, collection_name, vector_size)
 
@@ -1,5 +1,6 @@
 from .clients import async_qdrant_client
 from qdrant_client.http import models
+from common.vector_presets import dense_vector_params
 from loguru import logger
 
 
@@ -11,14 +12,15 @@ async def delete_collection(collection_name: str):
     logger.info(f"Collection {collection_name} deleted")
 
 
-async def create_hybrid_collection(collection_name: str, vector_size: int):
-    logger.info(f"Creating hybrid collection {collection_name} with vector size {vector_size}")
+async def create_hybrid_collection(collection_name: str, vector_size: int, preset: str = "full"):
+    """preset: "full", "scalar" or "binary" (see common.vector_presets.COLLECTION_PRESETS)."""
+    logger.info(f"Creating hybrid collection {collection_name} with vector size {vector_size}, preset {preset}")
     if not await async_qdrant_client.collection_exists(collection_name):
         logger.info(f"Creating hybrid collection {collection_name} with vector size {vector_size}")
         await async_qdrant_client.create_collection(
             collection_name, 
             vectors_config={
-                "dense": models.VectorParams(size=vector_size, distance=models.Distance.COSINE)
+                "dense": dense_vector_params(vector_size, preset)
             },
             sparse_vectors_config={
               "bm25": models.SparseVectorParams(modifier=models.Modifier.IDF)
@@ -2,67 +2,26 @@ from abc import ABC
 from .clients import async_qdrant_client
 from qdrant_client.models import PointStruct
 import asyncio
+import numpy as np
 from loguru import logger
-from fastembed import SparseTextEmbedding
-import google.generativeai as genai
-
-bm25_embedding_model = SparseTextEmbedding("Qdrant/bm25")
+from common.budget import get_ingestion_budget
+from common.embedding_client import get_embedding_client
+from common.sparse_encoder import get_sparse_encoder
+from common.vectors import PendingPoint, to_point_structs
 
 
 class EmbeddingCreator(ABC):
     def __init__(self, model: str, vector_size: int):
         self.model = model
         self.vector_size = vector_size
+        self.client = get_embedding_client(model, vector_size)
+        self.sparse_encoder = get_sparse_encoder()
 
-    async def _gemini_create_dense_embeddings_batch(self, texts: list[str]):
-        result = await genai.embed_content_async(
-            model=self.model,
-            content=texts,
-            output_dimensionality=self.vector_size
-        )
-        return result['embedding']
-    
     async def create_dense_embeddings_batch(self, texts: list[str], max_batch_size: int):
-        if not texts:
-            return []
-        all_embeddings = []
-        batch_size_options = [max_batch_size, max_batch_size * 8 // 10, max_batch_size * 4 // 10, max_batch_size * 2 // 10, 5, 2, 1]
-        current_batch_size_index = 0
-        
-        created_up_to = 0
-        
-        while created_up_to < len(texts):
-            current_batch_size = batch_size_options[current_batch_size_index]
-            batch_end = min(created_up_to + current_batch_size, len(texts))
-            current_batch = texts[created_up_to:batch_end]
-            
-            try:
-                batch_embeddings = await self._gemini_create_dense_embeddings_batch(current_batch)
-                all_embeddings.extend(batch_embeddings)
-                created_up_to = batch_end
-                logger.info(f"Created dense embeddings for {len(all_embeddings)} texts out of {len(texts)}")
-                
-                if current_batch_size_index > 0:
-                    current_batch_size_index -= 1
-                                    
-            except Exception as e:
-                logger.error(f"Error embedding products {created_up_to} - {batch_end}: {str(e)[:100]}...")
-                
-                if current_batch_size_index >= len(batch_size_options) - 1:
-                    logger.error(f"Failed even with batch size 1. insterig None embeddings:")
-                    all_embeddings.extend([None] * len(current_batch))
-                    created_up_to = batch_end
-                    current_batch_size_index = 0
-                else:
-                    current_batch_size_index += 1
-                    logger.info(f"Reducing batch size to {batch_size_options[current_batch_size_index]}")
-
-                    await asyncio.sleep(2)
-        
-        return all_embeddings
+        return await self.client.embed(texts, batch_size=max_batch_size)
     
     async def create_sparse_embeddings_batch(self, texts: list[str]):
-        return list(bm25_embedding_model.embed(text.strip() for text in texts))
+        return await self.sparse_encoder.embed([text.strip() for text in texts])
 
 
 class PointInserter:
@@ -70,7 +29,7 @@ class PointInserter:
         self.max_retries = max_retries
         self.collection_name = collection_name
     
-    async def insert_points_with_adaptive_batch_size(self, points: list[PointStruct], batch_size: int):
+    async def insert_points_with_adaptive_batch_size(self, points: list[PendingPoint | PointStruct], batch_size: int):
         if not points:
             return
         
@@ -120,17 +79,18 @@ class PointInserter:
         return total_inserted
     
     
-    async def _insert_points_in_qdrant(self, points: list[PointStruct]):
+    async def _insert_points_in_qdrant(self, points: list[PendingPoint | PointStruct]):
         if not points:
             logger.info("Received empty points list; skipping Qdrant upsert.")
             return
         for attempt in range(self.max_retries):
             try:
-                await async_qdrant_client.upsert(
-                    collection_name=self.collection_name,
-                    points=points,
-                    wait=True
-                )
+                async with get_ingestion_budget().qdrant.slot(len(points)):
+                    await async_qdrant_client.upsert(
+                        collection_name=self.collection_name,
+                        points=to_point_structs(points),
+                        wait=True
+                    )
                 return
             except Exception as e:
                 logger.error(
@@ -141,20 +101,18 @@ class PointInserter:
         raise Exception(f"Failed to insert points after {self.max_retries} attempts")
 
 
-    def create_qdrant_points_with_sparse_and_dense_vectors(self, metadatas: list[dict], dense_embeddings: list[list[float] | None], sparse_embeddings: list[list[float] | None]) -> list[PointStruct]:
+    def create_qdrant_points_with_sparse_and_dense_vectors(self, metadatas: list[dict], dense_embeddings: list[np.ndarray | None], sparse_embeddings: list | None) -> list[PendingPoint]:
         return [self._create_qdrant_point_with_sparse_and_dense_vectors(product_metadata, dense_embedding, sparse_embedding) for product_metadata, dense_embedding, sparse_embedding in zip(metadatas, dense_embeddings, sparse_embeddings) if dense_embedding is not None and sparse_embedding is not None]
 
-    def _create_qdrant_point_with_sparse_and_dense_vectors(self, metadata: dict, dense_embedding: list[float] | None, sparse_embedding: list[float] | None) -> PointStruct:
+    def _create_qdrant_point_with_sparse_and_dense_vectors(self, metadata: dict, dense_embedding: np.ndarray | None, sparse_embedding) -> PendingPoint:
         if dense_embedding is None or sparse_embedding is None:
             return None
         
-        point = PointStruct(
+        # Vectors stay float32 until the insert batch is sent (see common.vectors.PendingPoint)
+        return PendingPoint(
             id=metadata['id'],
-            vector={
-                'dense': dense_embedding,
-                'bm25': sparse_embedding.as_object()
-            },
+            dense=dense_embedding,
+            sparse=sparse_embedding,
             payload={'metadata': metadata}
         )
-        return point
 
@@ -1,16 +1,18 @@
+import asyncio
 import json
 import hashlib
 from .embedder import EmbeddingCreator, PointInserter
-from .collection import create_hybrid_collection, delete_collection
+from .clients import async_qdrant_client
+from .collection import create_hybrid_collection
+from .brands import run_brands_pipeline
+from common.budget import as_pipeline
+from common.collection_versions import CollectionVersions
 from loguru import logger
 import aiofiles
 
 COLLECTION_NAME = "gorgia_catalog_hybrid"
 VECTOR_SIZE = 3072
 
-embedding_creator = EmbeddingCreator('gemini-embedding-001', VECTOR_SIZE)
-point_inserter = PointInserter(collection_name=COLLECTION_NAME, max_retries=2)
-
 
 async def _read_json_file(file_path: str) -> list[dict]:
     async with aiofiles.open(file_path, 'r') as file:
@@ -37,10 +39,11 @@ def _add_id_to_metadata(metadata: dict) -> dict:
     return metadata
 
 
-async def _process_catalog_data(product_catalog_json_list: list[dict], max_batch_size: int):
+async def _process_catalog_data(product_catalog_json_list: list[dict], max_batch_size: int, collection_name: str, vector_size: int = VECTOR_SIZE):
+    embedding_creator = EmbeddingCreator('gemini-embedding-001', vector_size)
+    point_inserter = PointInserter(collection_name=collection_name, max_retries=2)
     product_catalog_json_list = [_add_id_to_metadata(item) for item in product_catalog_json_list]
-    await delete_collection(collection_name=COLLECTION_NAME)
-    await create_hybrid_collection(collection_name=COLLECTION_NAME, vector_size=VECTOR_SIZE)
+    await create_hybrid_collection(collection_name=collection_name, vector_size=vector_size)
     
     texts = [_map_product_to_text(item) for item in product_catalog_json_list]
     logger.info(f"Created {len(texts)} texts for embedding")
@@ -62,7 +65,40 @@ async def _process_catalog_data(product_catalog_json_list: list[dict], max_batch
     return total_inserted
 
 
-async def run_catalog_pipeline(file_path: str = 'products.json', max_batch_size: int = 20):
+async def run_catalog_pipeline(file_path: str = 'products.json', max_batch_size: int = 20, collection_name: str = COLLECTION_NAME, vector_size: int = VECTOR_SIZE):
     product_catalog_json_list = await _read_json_file(file_path)
-    await _process_catalog_data(product_catalog_json_list, max_batch_size)
+    return await _process_catalog_data(product_catalog_json_list, max_batch_size, collection_name, vector_size)
+
+
+async def run_catalog_build(
+    catalog_file_path: str = 'products.json',
+    brands_file_path: str = 'brand_summary.json',
+    max_batch_size: int = 20,
+    alias: str = COLLECTION_NAME,
+    vector_size: int = VECTOR_SIZE,
+    preset: str = "full"
+) -> bool:
+    """
+    Rebuild catalog + brands into a new version of `alias` and swap the alias once both are in.
+    The live collection keeps serving until then, and stays as it is if the build fails validation.
+    """
+    versions = CollectionVersions(async_qdrant_client, alias)
+    if await versions.needs_migration():
+        logger.error(f"{alias} is still a plain collection; run `python collection_alias.py migrate {alias}` first")
+        return False
+    collection_name = versions.new_version_name()
+    logger.info(f"Building {alias} into {collection_name}")
+    await create_hybrid_collection(collection_name=collection_name, vector_size=vector_size, preset=preset)
+
+    # Separate pipelines for the shared budget, so neither one's requests queue behind the other's
+    catalog_inserted, brands_inserted = await asyncio.gather(
+        as_pipeline("catalog", run_catalog_pipeline(catalog_file_path, max_batch_size, collection_name, vector_size)),
+        as_pipeline("brands", run_brands_pipeline(brands_file_path, max_batch_size, collection_name, vector_size))
+    )
+
+    if not await versions.validate(collection_name, (catalog_inserted or 0) + (brands_inserted or 0)):
+        logger.error(f"Not promoting {collection_name}; {alias} keeps serving {await versions.current()}")
+        return False
+    await versions.promote(collection_name)
+    return True
 
@@ -0,0 +1,34 @@
+import argparse
+import asyncio
+from products.clients import async_qdrant_client
+from common.collection_versions import CollectionVersions
+from loguru import logger
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Inspect or roll back blue/green collection versions")
+    parser.add_argument("command", choices=["status", "rollback", "prune", "migrate"])
+    parser.add_argument("alias", help="e.g. gorgia_products_hybrid, gorgia_docs_hybrid, gorgia_catalog_hybrid")
+    parser.add_argument(
+        "--legacy-collection",
+        help="migrate: collection served before the alias existed, e.g. gorgia_products_hybrid_1 for gorgia_products_hybrid"
+    )
+    args = parser.parse_args()
+
+    versions = CollectionVersions(async_qdrant_client, args.alias, legacy_collection=args.legacy_collection)
+    if args.command == "migrate":
+        await versions.migrate()
+    elif args.command == "rollback":
+        await versions.rollback()
+    elif args.command == "prune":
+        await versions.prune()
+
+    current = await versions.current()
+    logger.info(f"{args.alias} -> {current}")
+    for version in await versions.versions():
+        count = (await async_qdrant_client.count(collection_name=version, exact=True)).count
+        logger.info(f"  {'*' if version == current else ' '} {version}: {count} points")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
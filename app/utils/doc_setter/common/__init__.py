@@ -0,0 +1,17 @@
+from .budget import IngestionBudget, as_pipeline, configure_ingestion_budget, get_ingestion_budget
+from .collection_versions import CollectionVersions
+from .embedding_cache import EmbeddingCache, get_embedding_cache
+from .embedding_client import EmbeddingClient, TokenBucket, get_embedding_client
+from .orchestrator import IngestionOrchestrator, PipelineSpec
+from .sparse_encoder import SparseEncoder, get_sparse_encoder
+from .vector_presets import COLLECTION_PRESETS, dense_vector_params, quantization_search_params
+
+__all__ = [
+    'IngestionBudget', 'as_pipeline', 'configure_ingestion_budget', 'get_ingestion_budget',
+    'CollectionVersions',
+    'EmbeddingCache', 'get_embedding_cache',
+    'EmbeddingClient', 'TokenBucket', 'get_embedding_client',
+    'IngestionOrchestrator', 'PipelineSpec',
+    'SparseEncoder', 'get_sparse_encoder',
+    'COLLECTION_PRESETS', 'dense_vector_params', 'quantization_search_params',
+]
@@ -0,0 +1,116 @@
+import asyncio
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+
+# Set by IngestionOrchestrator for each pipeline task (and inherited by the tasks it spawns)
+current_pipeline: ContextVar[str] = ContextVar("current_pipeline", default="default")
+
+
+def as_pipeline(name: str, coro) -> asyncio.Task:
+    """
+    Run `coro` in its own task as pipeline `name` (nested as parent.name when started from another
+    pipeline), so its embedding and Qdrant calls are scheduled and reported separately.
+    """
+    parent = current_pipeline.get()
+
+    async def scoped():
+        current_pipeline.set(name if parent == "default" else f"{parent}.{name}")
+        return await coro
+
+    return asyncio.create_task(scoped())
+
+
+class FairLimiter:
+    """
+    Concurrency limit shared by every pipeline in the process.
+
+    Waiters queue per pipeline and a freed slot goes to the next pipeline in round-robin order,
+    so one with a deep backlog (products) cannot starve a small one (brands) that started later.
+    """
+
+    def __init__(self, name: str, limit: int):
+        self.name = name
+        self.limit = limit
+        self.in_use = 0
+        self._waiters: dict[str, deque] = {}
+        self._rotation = deque()
+        # pipeline -> {"calls", "items", "busy_seconds", "wait_seconds"}
+        self.stats: dict[str, dict] = {}
+
+    def _grant_next(self):
+        while self.in_use < self.limit and self._rotation:
+            pipeline = self._rotation.popleft()
+            waiters = self._waiters[pipeline]
+            future = waiters.popleft()
+            if waiters:
+                self._rotation.append(pipeline)
+            else:
+                del self._waiters[pipeline]
+            if not future.done():
+                self.in_use += 1
+                future.set_result(None)
+
+    async def _acquire(self, pipeline: str):
+        if self.in_use < self.limit and not self._rotation:
+            self.in_use += 1
+            return
+        future = asyncio.get_running_loop().create_future()
+        if pipeline not in self._waiters:
+            self._waiters[pipeline] = deque()
+            self._rotation.append(pipeline)
+        self._waiters[pipeline].append(future)
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # The slot was granted in the same tick the waiter got cancelled
+                self._release()
+            raise
+
+    def _release(self):
+        self.in_use -= 1
+        self._grant_next()
+
+    @asynccontextmanager
+    async def slot(self, items: int = 1):
+        pipeline = current_pipeline.get()
+        requested_at = time.monotonic()
+        await self._acquire(pipeline)
+        acquired_at = time.monotonic()
+        try:
+            yield
+        finally:
+            self._release()
+            stats = self.stats.setdefault(pipeline, {"calls": 0, "items": 0, "busy_seconds": 0.0, "wait_seconds": 0.0})
+            stats["calls"] += 1
+            stats["items"] += items
+            stats["busy_seconds"] += time.monotonic() - acquired_at
+            stats["wait_seconds"] += acquired_at - requested_at
+
+
+class IngestionBudget:
+    """
+    Process-wide budget: how many Gemini embedding requests and Qdrant writes may be in flight
+    across all pipelines. The per-client limits (EmbeddingClient.max_concurrency, PointInserter
+    max_in_flight) still apply inside it.
+    """
+
+    def __init__(self, embedding_concurrency: int = 8, qdrant_concurrency: int = 8):
+        self.embedding = FairLimiter("embedding", embedding_concurrency)
+        self.qdrant = FairLimiter("qdrant", qdrant_concurrency)
+
+
+_budget = IngestionBudget()
+
+
+def get_ingestion_budget() -> IngestionBudget:
+    return _budget
+
+
+def configure_ingestion_budget(embedding_concurrency: int, qdrant_concurrency: int) -> IngestionBudget:
+    """Replace the process budget; call before any pipeline starts."""
+    global _budget
+    _budget = IngestionBudget(embedding_concurrency, qdrant_concurrency)
+    return _budget
@@ -0,0 +1,234 @@
+import argparse
+import asyncio
+import gzip
+import json
+import os
+import re
+import time
+import httpx
+import numpy as np
+from qdrant_client import AsyncQdrantClient
+from qdrant_client.http import models
+from loguru import logger
+from .collection_versions import CollectionVersions
+from .vector_presets import dense_vector_params, preset_of
+
+DEFAULT_DUMP_DIR = os.getenv(
+    "COLLECTION_DUMP_DIR",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".collection_dumps")
+)
+DEFAULT_ALIASES = ("gorgia_products_hybrid", "gorgia_docs_hybrid", "gorgia_catalog_hybrid")
+SHARD_SIZE = 2000
+
+
+def _timestamp() -> str:
+    return time.strftime("%Y%m%d%H%M%S", time.gmtime())
+
+
+async def _create_hybrid_collection(client: AsyncQdrantClient, collection_name: str, vector_size: int, preset: str):
+    await client.create_collection(
+        collection_name,
+        vectors_config={"dense": dense_vector_params(vector_size, preset)},
+        sparse_vectors_config={"bm25": models.SparseVectorParams(modifier=models.Modifier.IDF)}
+    )
+    await client.create_payload_index(collection_name, field_name="metadata.brand", field_schema=models.PayloadSchemaType.KEYWORD)
+
+
+async def _promote(versions: CollectionVersions, collection_name: str, expected_points: int) -> bool:
+    if not await versions.validate(collection_name, expected_points, min_ratio=0.0):
+        logger.error(f"Restored {collection_name} failed validation; {versions.alias} was not moved")
+        return False
+    await versions.promote(collection_name)
+    return True
+
+
+def _check_hybrid_layout(collection_name: str, info):
+    """Dumps hold exactly the hybrid layout: a named "dense" vector and a "bm25" sparse vector."""
+    vectors = info.config.params.vectors
+    dense_names = sorted(vectors) if isinstance(vectors, dict) else ["<unnamed>"]
+    sparse_names = sorted(info.config.params.sparse_vectors or {})
+    if dense_names != ["dense"] or sparse_names != ["bm25"]:
+        raise ValueError(
+            f"{collection_name} has dense vectors {dense_names} and sparse vectors {sparse_names}; "
+            f"dumps expect exactly a named 'dense' vector and a 'bm25' sparse vector (use --format snapshot instead)"
+        )
+
+
+async def export_dump(client: AsyncQdrantClient, alias: str, dump_dir: str = DEFAULT_DUMP_DIR, shard_size: int = SHARD_SIZE) -> str:
+    """
+    Write the live version of `alias` to <dump_dir>/<alias>_<timestamp>/:
+    part-NNNNN.npy (float32 dense vectors) + part-NNNNN.jsonl.gz (id, payload, bm25) per shard,
+    and manifest.json, written last, so an interrupted export is never mistaken for a complete one.
+    """
+    source = await CollectionVersions(client, alias).resolve()
+    info = await client.get_collection(source)
+    _check_hybrid_layout(source, info)
+    dense = info.config.params.vectors["dense"]
+    path = os.path.join(dump_dir, f"{alias}_{_timestamp()}")
+    os.makedirs(path)
+
+    shards, points_total, offset = [], 0, None
+    rows, vectors = [], []
+
+    def write_shard():
+        name = f"part-{len(shards):05d}"
+        np.save(os.path.join(path, f"{name}.npy"), np.asarray(vectors, dtype=np.float32))
+        with gzip.open(os.path.join(path, f"{name}.jsonl.gz"), "wt", encoding="utf-8") as f:
+            f.writelines(json.dumps(row, ensure_ascii=False) + "\n" for row in rows)
+        shards.append(name)
+        rows.clear()
+        vectors.clear()
+
+    while True:
+        points, offset = await client.scroll(collection_name=source, limit=256, offset=offset, with_payload=True, with_vectors=True)
+        for point in points:
+            sparse = point.vector.get("bm25")
+            rows.append({
+                "id": point.id,
+                "payload": point.payload,
+                "bm25": {"indices": sparse.indices, "values": sparse.values} if sparse is not None else None,
+            })
+            vectors.append(point.vector["dense"])
+            if len(rows) >= shard_size:
+                write_shard()
+        points_total += len(points)
+        if offset is None:
+            break
+    if rows:
+        write_shard()
+
+    manifest = {
+        "alias": alias,
+        "source_collection": source,
+        "created_at": int(time.time()),
+        "dense_size": dense.size,
+        "preset": preset_of(dense.quantization_config or info.config.quantization_config),
+        "points": points_total,
+        "shards": shards,
+    }
+    with open(os.path.join(path, "manifest.json"), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+    logger.info(f"Exported {points_total} points of {source} to {path}")
+    return path
+
+
+async def import_dump(client: AsyncQdrantClient, path: str, alias: str | None = None, concurrency: int = 4, batch_size: int = 256) -> bool:
+    """Restore a dump into a new version of its alias with parallel batched upserts, then swap the alias."""
+    with open(os.path.join(path, "manifest.json"), "r", encoding="utf-8") as f:
+        manifest = json.load(f)
+    versions = CollectionVersions(client, alias or manifest["alias"])
+    if await versions.needs_migration():
+        logger.error(f"{versions.alias} is still a plain collection; run `python collection_alias.py migrate {versions.alias}` first")
+        return False
+    collection_name = versions.new_version_name()
+    await _create_hybrid_collection(client, collection_name, manifest["dense_size"], manifest["preset"])
+    logger.info(f"Restoring {manifest['points']} points from {path} into {collection_name}")
+
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def upsert(rows: list[dict], dense: np.ndarray):
+        async with semaphore:
+            # Built per batch so only `concurrency` batches of Python float lists exist at a time
+            points = [
+                models.PointStruct(
+                    id=row["id"],
+                    vector={"dense": vector.tolist(), **({"bm25": models.SparseVector(**row["bm25"])} if row["bm25"] else {})},
+                    payload=row["payload"]
+                )
+                for row, vector in zip(rows, dense)
+            ]
+            await client.upsert(collection_name=collection_name, points=points, wait=True)
+
+    for shard in manifest["shards"]:
+        dense = np.load(os.path.join(path, f"{shard}.npy"))
+        with gzip.open(os.path.join(path, f"{shard}.jsonl.gz"), "rt", encoding="utf-8") as f:
+            rows = [json.loads(line) for line in f]
+        await asyncio.gather(*(
+            upsert(rows[i:i + batch_size], dense[i:i + batch_size]) for i in range(0, len(rows), batch_size)
+        ))
+        logger.info(f"Restored {shard} ({len(rows)} points)")
+
+    return await _promote(versions, collection_name, manifest["points"])
+
+
+async def export_snapshot(client: AsyncQdrantClient, url: str, api_key: str | None, alias: str, dump_dir: str = DEFAULT_DUMP_DIR) -> str:
+    """Create a Qdrant snapshot of the live version of `alias` and download it to <dump_dir>/<alias>_<timestamp>.snapshot."""
+    source = await CollectionVersions(client, alias).resolve()
+    snapshot = await client.create_snapshot(collection_name=source, wait=True)
+    path = os.path.join(dump_dir, f"{alias}_{_timestamp()}.snapshot")
+    os.makedirs(dump_dir, exist_ok=True)
+    try:
+        async with httpx.AsyncClient(timeout=None, headers={"api-key": api_key or ""}) as http:
+            async with http.stream("GET", f"{url}/collections/{source}/snapshots/{snapshot.name}") as response:
+                response.raise_for_status()
+                with open(f"{path}.part", "wb") as f:
+                    async for chunk in response.aiter_bytes(1 << 20):
+                        f.write(chunk)
+        os.replace(f"{path}.part", path)
+    finally:
+        await client.delete_snapshot(collection_name=source, snapshot_name=snapshot.name, wait=True)
+    logger.info(f"Downloaded snapshot of {source} ({snapshot.size / 1e6:.0f} MB) to {path}")
+    return path
+
+
+async def import_snapshot(client: AsyncQdrantClient, url: str, api_key: str | None, path: str, alias: str | None = None) -> bool:
+    """Upload a snapshot file into a new version of its alias (taken from the file name by default), then swap the alias."""
+    alias = alias or re.sub(r"_\d{14}\.snapshot$", "", os.path.basename(path))
+    versions = CollectionVersions(client, alias)
+    collection_name = versions.new_version_name()
+    async with httpx.AsyncClient(timeout=None, headers={"api-key": api_key or ""}) as http:
+        with open(path, "rb") as f:
+            response = await http.post(
+                f"{url}/collections/{collection_name}/snapshots/upload",
+                params={"priority": "snapshot", "wait": "true"},
+                files={"snapshot": (os.path.basename(path), f)}
+            )
+    response.raise_for_status()
+    points = (await client.count(collection_name=collection_name, exact=True)).count
+    logger.info(f"Recovered {path} into {collection_name} ({points} points)")
+    return await _promote(versions, collection_name, points)
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Export collections to local dumps / snapshots and restore them into any Qdrant")
+    parser.add_argument("--url", default=os.getenv("QDRANT_URL", "http://localhost:6333"))
+    parser.add_argument("--api-key", default=os.getenv("QDRANT_API_KEY"))
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    export_parser = subparsers.add_parser("export", help="Export the live version of each alias")
+    export_parser.add_argument("aliases", nargs="*", default=list(DEFAULT_ALIASES))
+    export_parser.add_argument("--format", choices=["dump", "snapshot"], default="dump")
+    export_parser.add_argument("--dump-dir", default=DEFAULT_DUMP_DIR)
+    import_parser = subparsers.add_parser("import", help="Restore dump directories or .snapshot files")
+    import_parser.add_argument("paths", nargs="+")
+    import_parser.add_argument("--concurrency", type=int, default=4)
+    import_parser.add_argument("--batch-size", type=int, default=256)
+    args = parser.parse_args()
+
+    client = AsyncQdrantClient(url=args.url, api_key=args.api_key)
+    if args.command == "export":
+        failed = False
+        for alias in args.aliases:
+            if args.format == "snapshot":
+                await export_snapshot(client, args.url, args.api_key, alias, args.dump_dir)
+                continue
+            try:
+                await export_dump(client, alias, args.dump_dir)
+            except ValueError as e:
+                logger.error(f"Not exporting {alias}: {e}")
+                failed = True
+        if failed:
+            raise SystemExit(1)
+        return
+
+    results = []
+    for path in args.paths:
+        if path.endswith(".snapshot"):
+            results.append(await import_snapshot(client, args.url, args.api_key, path))
+        else:
+            results.append(await import_dump(client, path, concurrency=args.concurrency, batch_size=args.batch_size))
+    if not all(results):
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,206 @@
+import re
+import time
+from qdrant_client.http import models
+from loguru import logger
+
+
+class CollectionVersions:
+    """
+    Blue/green builds behind a Qdrant alias.
+
+    Every full rebuild writes into a fresh `<alias>_v<timestamp>` collection while the alias keeps
+    serving the previous one. After validation the alias is repointed in a single atomic
+    update_collection_aliases call; the last `keep_versions` collections are kept for rollback.
+
+    Before `migrate()` has run, reads and in-place writes go to the collection served before aliases
+    existed: `legacy_collection` (e.g. gorgia_products_hybrid_1) or a plain collection named like the alias.
+    """
+
+    def __init__(self, client, alias: str, keep_versions: int = 2, legacy_collection: str | None = None):
+        self.client = client
+        self.alias = alias
+        self.keep_versions = keep_versions
+        self.legacy_collection = legacy_collection
+        self._version_pattern = re.compile(rf"^{re.escape(alias)}_v(\d{{14}})$")
+
+    def new_version_name(self) -> str:
+        return f"{self.alias}_v{time.strftime('%Y%m%d%H%M%S', time.gmtime())}"
+
+    async def current(self) -> str | None:
+        """Collection the alias points at, or None if there is no alias yet."""
+        response = await self.client.get_aliases()
+        for alias in response.aliases:
+            if alias.alias_name == self.alias:
+                return alias.collection_name
+        return None
+
+    async def _pre_alias_collection(self) -> str | None:
+        """Collection served while there is no alias yet: the legacy one, else a plain one named like the alias."""
+        for name in (self.legacy_collection, self.alias):
+            if name and await self.client.collection_exists(name):
+                return name
+        return None
+
+    async def needs_migration(self) -> bool:
+        """True while the alias name is still held by a plain collection, so no alias can be created."""
+        return await self.current() is None and await self.client.collection_exists(self.alias)
+
+    async def resolve(self) -> str:
+        """Physical collection for in-place writes (incremental runs, refreshes): the alias target if any."""
+        return await self.current() or await self._pre_alias_collection() or self.alias
+
+    async def versions(self) -> list[str]:
+        """Versioned collections of this alias, oldest first."""
+        response = await self.client.get_collections()
+        return sorted(c.name for c in response.collections if self._version_pattern.match(c.name))
+
+    async def unfinished_build(self) -> str | None:
+        """Newest version that is newer than the live one, i.e. a build that never got promoted."""
+        current = await self.current()
+        versions = await self.versions()
+        if versions and versions[-1] != current and (current is None or versions[-1] > current):
+            return versions[-1]
+        return None
+
+    async def validate(self, collection_name: str, expected_points: int, min_ratio: float = 0.9) -> bool:
+        """
+        Check a finished build before it goes live: it holds at least `expected_points` (for products the
+        whole listing minus dead-lettered products), is not much smaller than the live version (the legacy
+        collection before migration), and a point can be found by its own vectors.
+        """
+        count = (await self.client.count(collection_name=collection_name, exact=True)).count
+        if count == 0 or count < expected_points:
+            logger.error(f"Validation of {collection_name} failed: {count} points, expected {expected_points}")
+            return False
+
+        current = await self.current() or await self._pre_alias_collection()
+        if current and current != collection_name and await self.client.collection_exists(current):
+            live_count = (await self.client.count(collection_name=current, exact=True)).count
+            if count < live_count * min_ratio:
+                logger.error(
+                    f"Validation of {collection_name} failed: {count} points vs {live_count} in live {current} "
+                    f"(below {min_ratio:.0%})"
+                )
+                return False
+
+        points, _ = await self.client.scroll(collection_name=collection_name, limit=1, with_payload=False, with_vectors=True)
+        sample = points[0]
+        for vector_name, vector in sample.vector.items():
+            response = await self.client.query_points(
+                collection_name=collection_name, query=vector, using=vector_name, limit=5, with_payload=False
+            )
+            if sample.id not in {point.id for point in response.points}:
+                logger.error(f"Validation of {collection_name} failed: smoke query on {vector_name} did not find point {sample.id}")
+                return False
+
+        logger.info(f"Validated {collection_name}: {count} points, smoke queries passed")
+        return True
+
+    async def _point_alias(self, collection_name: str):
+        if collection_name == self.alias:
+            raise ValueError(f"Cannot point alias {self.alias} at itself")
+        operations = []
+        if await self.current() is not None:
+            operations.append(models.DeleteAliasOperation(delete_alias=models.DeleteAlias(alias_name=self.alias)))
+        elif await self.client.collection_exists(self.alias):
+            raise RuntimeError(
+                f"{self.alias} is still a plain collection; run `python collection_alias.py migrate {self.alias}` first"
+            )
+        # Switching is one call; deleting an alias that does not exist would fail the whole call
+        operations.append(models.CreateAliasOperation(create_alias=models.CreateAlias(collection_name=collection_name, alias_name=self.alias)))
+        await self.client.update_collection_aliases(change_aliases_operations=operations)
+
+    async def _count(self, collection_name: str) -> int:
+        return (await self.client.count(collection_name=collection_name, exact=True)).count
+
+    async def _copy_collection(self, source: str, target: str, batch_size: int = 256):
+        """Copy points, vector layout, quantization and payload indexes of `source` into a new `target`."""
+        info = await self.client.get_collection(source)
+        await self.client.create_collection(
+            collection_name=target,
+            vectors_config=info.config.params.vectors,
+            sparse_vectors_config=info.config.params.sparse_vectors,
+            quantization_config=info.config.quantization_config
+        )
+        for field_name, schema in (info.payload_schema or {}).items():
+            await self.client.create_payload_index(target, field_name=field_name, field_schema=schema.data_type)
+
+        offset = None
+        while True:
+            points, offset = await self.client.scroll(
+                collection_name=source, limit=batch_size, offset=offset, with_payload=True, with_vectors=True
+            )
+            if points:
+                await self.client.upsert(
+                    collection_name=target,
+                    points=[models.PointStruct(id=point.id, vector=point.vector, payload=point.payload) for point in points],
+                    wait=True
+                )
+            if offset is None:
+                break
+
+    async def migrate(self) -> str | None:
+        """
+        One-time switch to aliases; returns the collection the alias now serves, or None if nothing changed.
+
+        The alias is pointed at the collection served so far. Qdrant cannot create an alias whose name a
+        collection holds, so a plain collection named like the alias is first copied to a version name; it is
+        dropped only once the copy holds every point, and the copy stays for rollback.
+        """
+        current = await self.current()
+        if current is not None:
+            logger.info(f"{self.alias} is already an alias of {current}")
+            return None
+        served = await self._pre_alias_collection()
+        if served is None:
+            versions = await self.versions()
+            served = versions[-1] if versions else None
+        if served is None:
+            logger.warning(f"No collection to serve through {self.alias}")
+            return None
+
+        if await self.client.collection_exists(self.alias):
+            copy = self.new_version_name()
+            expected = await self._count(self.alias)
+            logger.info(f"Copying plain collection {self.alias} ({expected} points) to {copy}")
+            await self._copy_collection(self.alias, copy)
+            copied = await self._count(copy)
+            if copied != expected:
+                logger.error(f"Copy {copy} holds {copied} of {expected} points; {self.alias} was left untouched")
+                return None
+            if served == self.alias:
+                served = copy
+            await self.client.delete_collection(collection_name=self.alias)
+            logger.info(f"Dropped plain collection {self.alias}; its data is kept in {copy}")
+
+        await self._point_alias(served)
+        logger.info(f"Alias {self.alias} now points at {served}")
+        return served
+
+    async def promote(self, collection_name: str):
+        previous = await self.current()
+        await self._point_alias(collection_name)
+        logger.info(f"Alias {self.alias} now points at {collection_name} (was {previous})")
+        await self.prune()
+
+    async def rollback(self) -> str | None:
+        """Point the alias back at the newest version older than the live one."""
+        current = await self.current()
+        older = [version for version in await self.versions() if current is None or version < current]
+        if not older:
+            logger.error(f"No previous version of {self.alias} to roll back to")
+            return None
+        await self._point_alias(older[-1])
+        logger.info(f"Rolled {self.alias} back from {current} to {older[-1]}")
+        return older[-1]
+
+    async def prune(self):
+        """Delete versions older than the newest `keep_versions` that are not live."""
+        current = await self.current()
+        versions = await self.versions()
+        if current in versions:
+            versions = versions[:versions.index(current) + 1]
+        for version in versions[:-self.keep_versions]:
+            if version != current:
+                await self.client.delete_collection(collection_name=version)
+                logger.info(f"Deleted old version {version}")
@@ -0,0 +1,221 @@
+import argparse
+import atexit
+import hashlib
+import json
+import os
+import re
+import time
+import numpy as np
+from loguru import logger
+
+DEFAULT_CACHE_DIR = os.getenv(
+    "EMBEDDING_CACHE_DIR",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".embedding_cache")
+)
+INITIAL_CAPACITY = 1024
+SAVE_EVERY = 2000
+
+
+def text_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class EmbeddingCache:
+    """
+    Content-addressed store of dense vectors for one (model, dimension).
+
+    Vectors live in a float32 memory-mapped file (one row per text) and index.json maps
+    sha256(text) -> [row, last_used_day] and names that file. The index is written after the
+    vectors are flushed, so a crash can only lose recent entries, never point at a half-written row.
+    Compaction writes a new vectors file and switches to it with the same single index replace.
+    Not safe for several processes writing the same directory at once.
+    """
+
+    def __init__(self, model: str, vector_size: int, cache_dir: str = DEFAULT_CACHE_DIR):
+        self.model = model
+        self.vector_size = vector_size
+        safe_model = re.sub(r"[^A-Za-z0-9_.-]", "_", model)
+        self.path = os.path.join(cache_dir, f"{safe_model}_{vector_size}")
+        self.index_path = os.path.join(self.path, "index.json")
+        # Bumped by every prune; generation 0 is the original vectors.f32
+        self.generation = 0
+        self.vectors_path = self._vectors_path(0)
+        self.index: dict[str, list[int]] = {}
+        self.size = 0
+        self.capacity = 0
+        self.vectors = None
+        self.hits = 0
+        self.misses = 0
+        self._unsaved = 0
+        self._today = int(time.time() // 86400)
+        self._load()
+
+    def _vectors_path(self, generation: int) -> str:
+        return os.path.join(self.path, f"vectors.{generation}.f32" if generation else "vectors.f32")
+
+    def _remove_stale_files(self):
+        # Leftovers of a prune interrupted before (new file) or after (old file) its index switch
+        for name in os.listdir(self.path):
+            path = os.path.join(self.path, name)
+            if re.fullmatch(r"vectors(\.\d+)?\.f32", name) and path != self.vectors_path:
+                os.remove(path)
+
+    def _open(self, capacity: int):
+        row_bytes = self.vector_size * 4
+        if self.vectors is not None:
+            self.vectors.flush()
+            del self.vectors
+        with open(self.vectors_path, "ab") as f:
+            f.truncate(max(os.path.getsize(self.vectors_path), capacity * row_bytes))
+        self.capacity = os.path.getsize(self.vectors_path) // row_bytes
+        self.vectors = np.memmap(self.vectors_path, dtype=np.float32, mode="r+", shape=(self.capacity, self.vector_size))
+
+    def _load(self):
+        os.makedirs(self.path, exist_ok=True)
+        if os.path.exists(self.index_path):
+            try:
+                with open(self.index_path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+                if "entries" in data:
+                    self.index = data["entries"]
+                    self.generation = data["generation"]
+                else:
+                    # Index written before compaction got versioned vectors files
+                    self.index = data
+            except (OSError, ValueError, KeyError) as e:
+                logger.warning(f"Embedding cache index at {self.index_path} is unreadable, starting empty: {e}")
+                self.index = {}
+        self.vectors_path = self._vectors_path(self.generation)
+        self._remove_stale_files()
+        self.size = max((row for row, _ in self.index.values()), default=-1) + 1
+        self._open(max(INITIAL_CAPACITY, self.size))
+        logger.info(f"Embedding cache {self.path}: {len(self.index)} vectors")
+
+    def save(self):
+        if not self._unsaved:
+            return
+        self.vectors.flush()
+        tmp_path = f"{self.index_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"generation": self.generation, "entries": self.index}, f)
+        os.replace(tmp_path, self.index_path)
+        self._unsaved = 0
+
+    def get_many(self, texts: list[str]) -> list[np.ndarray | None]:
+        result = []
+        for text in texts:
+            entry = self.index.get(text_hash(text))
+            if entry is None:
+                self.misses += 1
+                result.append(None)
+                continue
+            self.hits += 1
+            if entry[1] != self._today:
+                entry[1] = self._today
+                self._unsaved += 1
+            # Copy, so the row stays valid when the memmap is grown or compacted
+            result.append(np.array(self.vectors[entry[0]]))
+        return result
+
+    def put_many(self, texts: list[str], embeddings: list) -> None:
+        for text, embedding in zip(texts, embeddings):
+            if embedding is None or len(embedding) != self.vector_size:
+                continue
+            key = text_hash(text)
+            entry = self.index.get(key)
+            if entry is None:
+                if self.size >= self.capacity:
+                    self._open(self.capacity * 2)
+                entry = [self.size, self._today]
+                self.index[key] = entry
+                self.size += 1
+            self.vectors[entry[0]] = np.asarray(embedding, dtype=np.float32)
+            self._unsaved += 1
+        if self._unsaved >= SAVE_EVERY:
+            self.save()
+
+    def prune(self, older_than_days: int) -> int:
+        """
+        Drop entries not used for `older_than_days` and compact the vectors into a new file.
+        The index switches to that file in one atomic replace; until then the old pair stays intact.
+        """
+        cutoff = self._today - older_than_days
+        live = sorted(((key, entry) for key, entry in self.index.items() if entry[1] >= cutoff), key=lambda item: item[1][0])
+        removed = len(self.index) - len(live)
+
+        generation = self.generation + 1
+        compacted_path = self._vectors_path(generation)
+        compacted = np.memmap(compacted_path, dtype=np.float32, mode="w+", shape=(max(len(live), 1), self.vector_size))
+        new_index = {}
+        for new_row, (key, (old_row, last_used)) in enumerate(live):
+            compacted[new_row] = self.vectors[old_row]
+            new_index[key] = [new_row, last_used]
+        compacted.flush()
+        del compacted
+
+        old_path = self.vectors_path
+        del self.vectors
+        self.vectors = None
+        self.index = new_index
+        self.size = len(new_index)
+        self.generation = generation
+        self.vectors_path = compacted_path
+        self._open(max(INITIAL_CAPACITY, self.size))
+        self._unsaved += 1
+        self.save()
+        os.remove(old_path)
+        logger.info(f"Pruned {removed} embeddings older than {older_than_days} days from {self.path}; {self.size} left")
+        return removed
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self.index),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+        }
+
+
+_caches: dict[tuple[str, int], EmbeddingCache] = {}
+
+
+def get_embedding_cache(model: str, vector_size: int, cache_dir: str = DEFAULT_CACHE_DIR) -> EmbeddingCache:
+    key = (model, vector_size)
+    if key not in _caches:
+        _caches[key] = EmbeddingCache(model, vector_size, cache_dir)
+    return _caches[key]
+
+
+@atexit.register
+def _save_all():
+    for cache in _caches.values():
+        cache.save()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Maintain the on-disk embedding cache")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    prune_parser = subparsers.add_parser("prune", help="Remove entries that were not used recently")
+    prune_parser.add_argument("--older-than-days", type=int, default=30)
+    prune_parser.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR)
+    stats_parser = subparsers.add_parser("stats", help="Show the number of cached vectors per model")
+    stats_parser.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR)
+    args = parser.parse_args()
+
+    if not os.path.isdir(args.cache_dir):
+        logger.info(f"No embedding cache at {args.cache_dir}")
+        return
+    for name in sorted(os.listdir(args.cache_dir)):
+        model, _, vector_size = name.rpartition("_")
+        if not vector_size.isdigit():
+            continue
+        cache = EmbeddingCache(model, int(vector_size), args.cache_dir)
+        if args.command == "prune":
+            cache.prune(args.older_than_days)
+        else:
+            logger.info(f"{name}: {len(cache.index)} vectors, {os.path.getsize(cache.vectors_path) / 1e6:.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,232 @@
+import asyncio
+import random
+import re
+import time
+import numpy as np
+from loguru import logger
+import google.generativeai as genai
+from .budget import get_ingestion_budget
+from .embedding_cache import EmbeddingCache, get_embedding_cache
+from .vectors import as_float32_rows
+
+# Defaults for gemini-embedding-001 on a paid tier; override per process if the project quota differs
+DEFAULT_REQUESTS_PER_MINUTE = 1500
+DEFAULT_TOKENS_PER_MINUTE = 1_000_000
+CHARS_PER_TOKEN = 4
+
+_RETRY_AFTER_RE = re.compile(r"retry[ _-]?(?:in|after|delay)\D{0,20}?(\d+(?:\.\d+)?)", re.IGNORECASE)
+
+
+class TokenBucket:
+    """Continuously refilled bucket holding at most `per_minute` units."""
+
+    def __init__(self, per_minute: float):
+        self.capacity = float(per_minute)
+        self.base_rate = self.capacity / 60.0
+        self.rate = self.base_rate
+        self.tokens = self.capacity
+        self.updated_at = time.monotonic()
+        self._lock = None
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    def set_rate_factor(self, factor: float):
+        self._refill()
+        self.rate = self.base_rate * factor
+
+    async def acquire(self, amount: float = 1.0):
+        amount = min(float(amount), self.capacity)
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        # The lock keeps waiters in FIFO order so a large batch isn't starved by small ones
+        async with self._lock:
+            while True:
+                self._refill()
+                if self.tokens >= amount:
+                    self.tokens -= amount
+                    return
+                await asyncio.sleep((amount - self.tokens) / self.rate)
+
+
+def _status_code(error: Exception):
+    return getattr(error, "code", None) or getattr(error, "status_code", None)
+
+
+def is_rate_limit_error(error: Exception) -> bool:
+    return _status_code(error) == 429 or type(error).__name__ in ("ResourceExhausted", "TooManyRequests")
+
+
+def is_payload_error(error: Exception) -> bool:
+    """The request itself was rejected (bad or oversized input), so a smaller batch may succeed."""
+    return _status_code(error) in (400, 413) or type(error).__name__ in ("InvalidArgument", "BadRequest", "PayloadTooLarge")
+
+
+def retry_after_seconds(error: Exception) -> float | None:
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None)
+    if headers:
+        value = headers.get("retry-after") or headers.get("Retry-After")
+        if value:
+            try:
+                return float(value)
+            except ValueError:
+                pass
+    match = _RETRY_AFTER_RE.search(str(error))
+    if match:
+        return float(match.group(1))
+    return None
+
+
+class EmbeddingClient:
+    """
+    Dense embedding client shared by the ingestion pipelines.
+
+    Splits texts into batches and keeps up to `max_concurrency` of them in flight, paced by
+    request and token buckets. A 429 pauses every in-flight worker for Retry-After (or an
+    exponential delay) and lowers the bucket rate, which then recovers on successful calls.
+    A rejected payload (400 / 413) bisects the failing batch so a single bad text ends up as None
+    instead of dropping its neighbours; rate limits that outlast the retries and other errors are
+    raised for the caller to handle as a failed batch.
+    """
+
+    def __init__(
+        self,
+        model: str,
+        vector_size: int,
+        max_concurrency: int = 4,
+        requests_per_minute: int = DEFAULT_REQUESTS_PER_MINUTE,
+        tokens_per_minute: int = DEFAULT_TOKENS_PER_MINUTE,
+        max_rate_limit_retries: int = 8,
+        min_rate_factor: float = 0.1,
+        cache: EmbeddingCache | None = None
+    ):
+        self.model = model
+        self.vector_size = vector_size
+        self.max_concurrency = max_concurrency
+        self.max_rate_limit_retries = max_rate_limit_retries
+        self.min_rate_factor = min_rate_factor
+        self.cache = cache
+        self.request_bucket = TokenBucket(requests_per_minute)
+        self.token_bucket = TokenBucket(tokens_per_minute)
+        self.rate_factor = 1.0
+        self._paused_until = 0.0
+        self._semaphore = None
+        self.texts_embedded = 0
+        self.rate_limited = 0
+        self.seconds_embedding = 0.0
+
+    @property
+    def semaphore(self) -> asyncio.Semaphore:
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._semaphore
+
+    def _set_rate_factor(self, factor: float):
+        self.rate_factor = max(self.min_rate_factor, min(1.0, factor))
+        self.request_bucket.set_rate_factor(self.rate_factor)
+        self.token_bucket.set_rate_factor(self.rate_factor)
+
+    async def _wait_for_pause(self):
+        delay = self._paused_until - time.monotonic()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    async def _request(self, texts: list[str]) -> list[np.ndarray]:
+        estimated_tokens = sum(len(text) for text in texts) / CHARS_PER_TOKEN + len(texts)
+        for attempt in range(self.max_rate_limit_retries + 1):
+            await self._wait_for_pause()
+            try:
+                # This client's own pacing (pause, buckets, concurrency) is waited out before the process-wide
+                # slot is taken, so a slot is only held while a request is actually in flight
+                await self.request_bucket.acquire(1)
+                await self.token_bucket.acquire(estimated_tokens)
+                async with self.semaphore:
+                    async with get_ingestion_budget().embedding.slot(len(texts)):
+                        result = await genai.embed_content_async(
+                            model=self.model,
+                            content=texts,
+                            output_dimensionality=self.vector_size
+                        )
+                if self.rate_factor < 1.0:
+                    self._set_rate_factor(self.rate_factor * 1.05)
+                return as_float32_rows(result['embedding'])
+            except Exception as e:
+                if not is_rate_limit_error(e) or attempt >= self.max_rate_limit_retries:
+                    raise
+                self.rate_limited += 1
+                delay = retry_after_seconds(e) or min(60.0, 2 ** attempt + random.uniform(0, 1))
+                self._paused_until = max(self._paused_until, time.monotonic() + delay)
+                self._set_rate_factor(self.rate_factor * 0.7)
+                logger.warning(
+                    f"Embedding rate limited (429); pausing {delay:.1f}s, "
+                    f"rate now {self.rate_factor:.0%} of configured"
+                )
+
+    async def _embed_batch(self, texts: list[str]) -> list[np.ndarray | None]:
+        try:
+            return await self._request(texts)
+        except Exception as e:
+            if not is_payload_error(e):
+                # Splitting would only multiply requests against an exhausted quota or a failing backend
+                raise
+            if len(texts) == 1:
+                logger.error(f"Failed to embed text, inserting None embedding: {str(e)[:100]}...")
+                return [None]
+            logger.error(f"Error embedding batch of {len(texts)}, splitting it: {str(e)[:100]}...")
+            middle = len(texts) // 2
+            left, right = await asyncio.gather(
+                self._embed_batch(texts[:middle]),
+                self._embed_batch(texts[middle:])
+            )
+            return left + right
+
+    async def embed(self, texts: list[str], batch_size: int = 100) -> list[np.ndarray | None]:
+        """float32 vectors in input order; None for texts that failed even on their own."""
+        if not texts:
+            return []
+        start = time.perf_counter()
+        embeddings = self.cache.get_many(texts) if self.cache else [None] * len(texts)
+
+        # Duplicate texts within one call are embedded once
+        missing_texts = list(dict.fromkeys(text for text, embedding in zip(texts, embeddings) if embedding is None))
+        batches = [missing_texts[i:i + batch_size] for i in range(0, len(missing_texts), batch_size)]
+        results = await asyncio.gather(*(self._embed_batch(batch) for batch in batches), return_exceptions=True)
+        created = {
+            text: embedding
+            for batch, batch_embeddings in zip(batches, results)
+            if not isinstance(batch_embeddings, BaseException)
+            for text, embedding in zip(batch, batch_embeddings)
+            if embedding is not None
+        }
+        if self.cache and created:
+            self.cache.put_many(list(created), list(created.values()))
+        elapsed = time.perf_counter() - start
+        self.texts_embedded += len(created)
+        self.seconds_embedding += elapsed
+        # The batches that did succeed are cached above, so a retry of this call only pays for the failed ones
+        error = next((result for result in results if isinstance(result, BaseException)), None)
+        if error is not None:
+            raise error
+        embeddings = [embedding if embedding is not None else created.get(text) for text, embedding in zip(texts, embeddings)]
+
+        logger.info(
+            f"Created dense embeddings for {len(texts)} texts in {elapsed:.1f}s "
+            f"({len(texts) / max(elapsed, 1e-9):.1f} texts/s, {len(texts) - len(missing_texts)} from cache, "
+            f"{len(batches)} batches, {self.rate_limited} rate limits so far)"
+        )
+        return embeddings
+
+
+_clients: dict[tuple[str, int], EmbeddingClient] = {}
+
+
+def get_embedding_client(model: str, vector_size: int, use_cache: bool = True, **kwargs) -> EmbeddingClient:
+    """One client per (model, dimension) so every pipeline in the process shares the same limits and cache."""
+    key = (model, vector_size)
+    if key not in _clients:
+        cache = get_embedding_cache(model, vector_size) if use_cache else None
+        _clients[key] = EmbeddingClient(model, vector_size, cache=cache, **kwargs)
+    return _clients[key]
@@ -0,0 +1,107 @@
+import asyncio
+import time
+from loguru import logger
+from .budget import as_pipeline, configure_ingestion_budget
+
+
+class PipelineSpec:
+    """One entry of the orchestrator's pipeline list: a name, the coroutine function that runs it and its kwargs."""
+
+    def __init__(self, name: str, run, **kwargs):
+        self.name = name
+        self.run = run
+        self.kwargs = kwargs
+
+
+class IngestionOrchestrator:
+    """
+    Runs a declarative list of pipelines concurrently under one process-wide IngestionBudget.
+
+    Embedding requests and Qdrant writes of every pipeline draw from the same fair limiters
+    (common.budget), and a combined progress / throughput report is logged every `report_interval`
+    seconds and once at the end. A pipeline fails when it raises or returns False; the others keep going.
+    """
+
+    def __init__(self, pipelines: list[PipelineSpec], embedding_concurrency: int = 4, qdrant_concurrency: int = 4, report_interval: float = 30.0):
+        names = [spec.name for spec in pipelines]
+        if len(set(names)) != len(names):
+            raise ValueError(f"Pipeline names must be unique: {names}")
+        self.pipelines = pipelines
+        self.embedding_concurrency = embedding_concurrency
+        self.qdrant_concurrency = qdrant_concurrency
+        self.report_interval = report_interval
+        self.results = {}
+        self._started_at = {}
+        self._finished_at = {}
+
+    async def _run_pipeline(self, spec: PipelineSpec):
+        self._started_at[spec.name] = time.monotonic()
+        try:
+            self.results[spec.name] = await spec.run(**spec.kwargs)
+        except Exception as e:
+            logger.exception(f"Pipeline {spec.name} failed: {e}")
+            self.results[spec.name] = e
+        finally:
+            self._finished_at[spec.name] = time.monotonic()
+
+    def succeeded(self, name: str) -> bool:
+        result = self.results.get(name)
+        return name in self.results and result is not False and not isinstance(result, Exception)
+
+    def _totals(self, limiter, name: str) -> dict:
+        totals = {"calls": 0, "items": 0, "busy_seconds": 0.0, "wait_seconds": 0.0}
+        for pipeline, stats in limiter.stats.items():
+            # Sub-pipelines started with as_pipeline (e.g. catalog.brands) count towards their parent
+            if pipeline == name or pipeline.startswith(f"{name}."):
+                for key in totals:
+                    totals[key] += stats[key]
+        return totals
+
+    def report(self):
+        now = time.monotonic()
+        lines = []
+        all_texts = all_points = 0
+        for spec in self.pipelines:
+            started_at = self._started_at.get(spec.name, now)
+            elapsed = max(self._finished_at.get(spec.name, now) - started_at, 1e-9)
+            if spec.name not in self._finished_at:
+                status = "running"
+            else:
+                status = "ok" if self.succeeded(spec.name) else "FAILED"
+            embedding = self._totals(self._budget.embedding, spec.name)
+            qdrant = self._totals(self._budget.qdrant, spec.name)
+            all_texts += embedding["items"]
+            all_points += qdrant["items"]
+            lines.append(
+                f"  {spec.name}: {status} {elapsed:.0f}s | embedded {embedding['items']} ({embedding['items'] / elapsed:.1f}/s, "
+                f"{embedding['wait_seconds']:.0f}s queued for slots) | wrote {qdrant['items']} points "
+                f"({qdrant['items'] / elapsed:.1f}/s, {qdrant['wait_seconds']:.0f}s queued)"
+            )
+        elapsed = max(now - self._run_started_at, 1e-9)
+        logger.info(
+            f"Ingestion {elapsed:.0f}s: {all_texts} texts embedded ({all_texts / elapsed:.1f}/s), "
+            f"{all_points} points written ({all_points / elapsed:.1f}/s); "
+            f"slots in use: embedding {self._budget.embedding.in_use}/{self._budget.embedding.limit}, "
+            f"qdrant {self._budget.qdrant.in_use}/{self._budget.qdrant.limit}\n" + "\n".join(lines)
+        )
+
+    async def _report_periodically(self):
+        while True:
+            await asyncio.sleep(self.report_interval)
+            self.report()
+
+    async def run(self) -> bool:
+        """Run every pipeline to completion; True when all of them succeeded."""
+        self._budget = configure_ingestion_budget(self.embedding_concurrency, self.qdrant_concurrency)
+        self._run_started_at = time.monotonic()
+        logger.info(
+            f"Starting {len(self.pipelines)} pipelines ({', '.join(spec.name for spec in self.pipelines)}) with "
+            f"{self.embedding_concurrency} embedding and {self.qdrant_concurrency} Qdrant slots"
+        )
+        reporter = asyncio.create_task(self._report_periodically())
+        try:
+            await asyncio.gather(*(as_pipeline(spec.name, self._run_pipeline(spec)) for spec in self.pipelines))
+        finally:
+            reporter.cancel()
+        self.report()
+        return all(self.succeeded(spec.name) for spec in self.pipelines)
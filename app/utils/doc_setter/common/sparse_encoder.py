@@ -0,0 +1,87 @@
+import asyncio
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from loguru import logger
+from fastembed import SparseTextEmbedding
+
+DEFAULT_SPARSE_MODEL = "Qdrant/bm25"
+
+_worker_model = None
+
+
+def _init_worker(model_name: str):
+    global _worker_model
+    _worker_model = SparseTextEmbedding(model_name)
+
+
+def _encode_chunk(texts: list[str]) -> list:
+    return list(_worker_model.embed(texts))
+
+
+class SparseEncoder:
+    """
+    BM25 encoding off the event loop.
+
+    BM25 tokenization and stemming are pure Python and hold the GIL, so texts are split into
+    chunks and spread over a persistent process pool, each worker loading the model once.
+    With workers=0 encoding runs in a thread instead (no speedup, but the loop stays free).
+    """
+
+    def __init__(self, model_name: str = DEFAULT_SPARSE_MODEL, workers: int | None = None, chunk_size: int = 256):
+        self.model_name = model_name
+        self.workers = max(0, (os.cpu_count() or 1) - 1) if workers is None else workers
+        self.chunk_size = chunk_size
+        self._pool = None
+        self._local_model = None
+
+    @property
+    def pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            # spawn: forking a process that already holds gRPC / HTTP clients is unsafe
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(self.model_name,)
+            )
+            logger.info(f"Started {self.workers} sparse encoding workers for {self.model_name}")
+        return self._pool
+
+    def _encode_locally(self, texts: list[str]) -> list:
+        if self._local_model is None:
+            self._local_model = SparseTextEmbedding(self.model_name)
+        return list(self._local_model.embed(texts))
+
+    def _submit(self, chunk: list[str]) -> asyncio.Future:
+        loop = asyncio.get_running_loop()
+        if self.workers:
+            return loop.run_in_executor(self.pool, _encode_chunk, chunk)
+        return loop.run_in_executor(None, self._encode_locally, chunk)
+
+    async def iter_embed(self, texts: list[str]):
+        """Yield embeddings chunk by chunk, in input order, while later chunks are still encoding."""
+        chunks = [texts[i:i + self.chunk_size] for i in range(0, len(texts), self.chunk_size)]
+        futures = [self._submit(chunk) for chunk in chunks]
+        for future in futures:
+            yield await future
+
+    async def embed(self, texts: list[str]) -> list:
+        embeddings = []
+        async for chunk_embeddings in self.iter_embed(texts):
+            embeddings.extend(chunk_embeddings)
+        return embeddings
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+
+_encoders: dict[str, SparseEncoder] = {}
+
+
+def get_sparse_encoder(model_name: str = DEFAULT_SPARSE_MODEL, **kwargs) -> SparseEncoder:
+    if model_name not in _encoders:
+        _encoders[model_name] = SparseEncoder(model_name, **kwargs)
+    return _encoders[model_name]
@@ -0,0 +1,59 @@
+from qdrant_client.http import models
+
+# Full output size of gemini-embedding-001; smaller sizes are Matryoshka prefixes of it
+FULL_DENSE_DIMENSION = 3072
+
+# "full"   - float32 vectors in RAM (previous behaviour)
+# "scalar" - int8 copies in RAM (4x smaller), float32 originals on disk for rescoring
+# "binary" - 1 bit per dimension in RAM (32x smaller), originals on disk; needs more oversampling
+COLLECTION_PRESETS = {
+    "full": {"quantization": None, "on_disk": False},
+    "scalar": {
+        "quantization": models.ScalarQuantization(
+            scalar=models.ScalarQuantizationConfig(type=models.ScalarType.INT8, quantile=0.99, always_ram=True)
+        ),
+        "on_disk": True,
+    },
+    "binary": {
+        "quantization": models.BinaryQuantization(binary=models.BinaryQuantizationConfig(always_ram=True)),
+        "on_disk": True,
+    },
+}
+
+def dense_vector_params(vector_size: int, preset: str = "full") -> models.VectorParams:
+    if preset not in COLLECTION_PRESETS:
+        raise ValueError(f"Unknown collection preset {preset!r}; expected one of {list(COLLECTION_PRESETS)}")
+    if not 0 < vector_size <= FULL_DENSE_DIMENSION:
+        raise ValueError(f"vector_size must be between 1 and {FULL_DENSE_DIMENSION}, got {vector_size}")
+    config = COLLECTION_PRESETS[preset]
+    return models.VectorParams(
+        size=vector_size,
+        distance=models.Distance.COSINE,
+        on_disk=config["on_disk"] or None,
+        quantization_config=config["quantization"]
+    )
+
+
+def preset_of(quantization) -> str:
+    """Preset a collection was built with, from its dense vector's (or the collection's) quantization config."""
+    if isinstance(quantization, models.BinaryQuantization):
+        return "binary"
+    if isinstance(quantization, models.ScalarQuantization):
+        return "scalar"
+    return "full"
+
+
+def quantization_search_params(oversampling: float | None) -> models.SearchParams | None:
+    """
+    Query params for the quantized presets: candidates are picked on the quantized vectors, then the top
+    `limit * oversampling` are rescored with the originals. The oversampling values the app serves with
+    are its settings (scalar_oversampling / binary_oversampling); None means no quantization.
+    """
+    if not oversampling:
+        return None
+    return models.SearchParams(quantization=models.QuantizationSearchParams(rescore=True, oversampling=oversampling))
+
+
+def truncate_dense(vector: list[float], vector_size: int) -> list[float]:
+    """Matryoshka truncation; cosine distance makes re-normalising the prefix unnecessary."""
+    return vector if len(vector) <= vector_size else vector[:vector_size]
@@ -0,0 +1,37 @@
+from typing import Any, NamedTuple
+import numpy as np
+from qdrant_client.models import PointStruct
+
+
+def as_float32_rows(embeddings: list) -> list[np.ndarray]:
+    """
+    Copy a batch of API embeddings (lists of Python floats) into one contiguous float32 matrix and
+    return its rows, so the boxed floats can be freed right after the response is parsed.
+    """
+    return list(np.asarray(embeddings, dtype=np.float32))
+
+
+class PendingPoint(NamedTuple):
+    """
+    A point whose vectors stay as float32 / sparse arrays until the insert batch that sends it.
+    PointStruct holds Python lists, so it is only built right before upsert; tolist() is used
+    because pydantic validates a NumPy array element by element, which is several times slower.
+    """
+    id: Any
+    dense: np.ndarray
+    sparse: Any
+    payload: dict
+
+    def to_point_struct(self) -> PointStruct:
+        return PointStruct(
+            id=self.id,
+            vector={
+                'dense': self.dense.tolist(),
+                'bm25': {'indices': self.sparse.indices.tolist(), 'values': self.sparse.values.tolist()}
+            },
+            payload=self.payload
+        )
+
+
+def to_point_structs(points: list) -> list[PointStruct]:
+    return [point.to_point_struct() if isinstance(point, PendingPoint) else point for point in points]
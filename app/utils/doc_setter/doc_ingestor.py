@@ -21,6 +21,6 @@ if __name__ == "__main__":
         chunk_overlap=200,
         max_batch_size=100,
         batch_insert_size=100,
-        recreate_collection=True
+        recreate_collection=False
     ))
 
@@ -1,6 +1,7 @@
 import asyncio
 from .clients import async_qdrant_client
 from qdrant_client.http import models
+from common.vector_presets import dense_vector_params
 from loguru import logger
 
 
@@ -12,14 +13,15 @@ async def delete_collection(collection_name: str):
     logger.info(f"Collection {collection_name} deleted")
 
 
-async def create_hybrid_collection(collection_name: str, vector_size: int):
-    logger.info(f"Creating hybrid collection {collection_name} with vector size {vector_size}")
+async def create_hybrid_collection(collection_name: str, vector_size: int, preset: str = "full"):
+    """preset: "full", "scalar" or "binary" (see common.vector_presets.COLLECTION_PRESETS)."""
+    logger.info(f"Creating hybrid collection {collection_name} with vector size {vector_size}, preset {preset}")
     if not await async_qdrant_client.collection_exists(collection_name):
         logger.info(f"Creating hybrid collection {collection_name} with vector size {vector_size}")
         await async_qdrant_client.create_collection(
             collection_name, 
             vectors_config={
-                "dense": models.VectorParams(size=vector_size, distance=models.Distance.COSINE)
+                "dense": dense_vector_params(vector_size, preset)
             },
             sparse_vectors_config={
               "bm25": models.SparseVectorParams(modifier=models.Modifier.IDF)
@@ -27,6 +29,39 @@ async def create_hybrid_collection(collection_name: str, vector_size: int):
         )
 
 
+async def fetch_point_ids(collection_name: str, batch_size: int = 1000) -> set:
+    point_ids = set()
+    if not await async_qdrant_client.collection_exists(collection_name):
+        return point_ids
+    offset = None
+    while True:
+        points, offset = await async_qdrant_client.scroll(
+            collection_name=collection_name,
+            limit=batch_size,
+            offset=offset,
+            with_payload=False,
+            with_vectors=False
+        )
+        point_ids.update(point.id for point in points)
+        if offset is None:
+            break
+    return point_ids
+
+
+async def delete_points(collection_name: str, point_ids: list, batch_size: int = 1000) -> int:
+    deleted = 0
+    for i in range(0, len(point_ids), batch_size):
+        batch = point_ids[i:i + batch_size]
+        await async_qdrant_client.delete(
+            collection_name=collection_name,
+            points_selector=models.PointIdsList(points=batch),
+            wait=True
+        )
+        deleted += len(batch)
+    logger.info(f"Deleted {deleted} points from {collection_name}")
+    return deleted
+
+
 async def run_create():
     create_hybrid_collection('test_hybrid', 3072)
 
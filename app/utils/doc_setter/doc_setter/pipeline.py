@@ -2,8 +2,9 @@ import asyncio
 from langchain.text_splitter import RecursiveCharacterTextSplitter
 from .txt_document_embedder import read_txt_files_add_filename_metadata_and_return_chunks
 from .embedder import EmbeddingCreator, PointInserter
-from .collection import create_hybrid_collection
-import uuid
+from .clients import async_qdrant_client
+from .collection import create_hybrid_collection, fetch_point_ids, delete_points
+from common.collection_versions import CollectionVersions
 import google.generativeai as genai
 from loguru import logger
 
@@ -18,6 +19,11 @@ async def embed_text_documents_from_path(
     max_batch_size: int = 100,
     batch_insert_size: int = 100
 ):
+    """
+    Sync the chunks of every .txt file under base_path into the collection. Chunk IDs come from
+    (filename, chunk index, content hash), so only new or changed chunks are embedded and upserted,
+    and points of chunks that no longer exist are deleted once the upserts went through.
+    """
     embedder = EmbeddingCreator(model=model, vector_size=vector_size)
     point_inserter = PointInserter(collection_name=collection_name, max_retries=2)
     text_splitter = RecursiveCharacterTextSplitter(
@@ -33,12 +39,33 @@ async def embed_text_documents_from_path(
     )
 
     if not chunks:
+        # Also guards against a wrong docs path wiping the collection
         logger.warning("No chunks found to embed")
         return 0
 
-    for chunk in chunks:
-        chunk["metadata"]["id"] = str(uuid.uuid4())
+    existing_ids = await fetch_point_ids(collection_name)
+    chunk_ids = {chunk["metadata"]["id"] for chunk in chunks}
+    stale_ids = list(existing_ids - chunk_ids)
+    chunks = [chunk for chunk in chunks if chunk["metadata"]["id"] not in existing_ids]
+    logger.info(
+        f"{len(chunk_ids)} chunks: {len(chunk_ids) - len(chunks)} unchanged, "
+        f"{len(chunks)} new or changed, {len(stale_ids)} stale points to delete"
+    )
+
+    total_inserted = 0
+    if chunks:
+        total_inserted = await _embed_and_insert_chunks(chunks, embedder, point_inserter, max_batch_size, batch_insert_size)
+
+    if stale_ids:
+        if total_inserted < len(chunks):
+            # Keep the old versions searchable until their replacements are in; the next run retries
+            logger.warning(f"{len(chunks) - total_inserted} chunks were not inserted; keeping {len(stale_ids)} stale points for now")
+        else:
+            await delete_points(collection_name, stale_ids)
+    return total_inserted
+
 
+async def _embed_and_insert_chunks(chunks: list[dict], embedder: EmbeddingCreator, point_inserter: PointInserter, max_batch_size: int, batch_insert_size: int) -> int:
     texts = [chunk["content"] for chunk in chunks]
     metadatas = [chunk["metadata"] for chunk in chunks]
 
@@ -62,7 +89,7 @@ async def embed_text_documents_from_path(
     total_inserted = await point_inserter.insert_points_with_adaptive_batch_size(
         points=points,
         batch_size=batch_insert_size
-    )
+    ) or 0
 
     logger.info(f"Successfully inserted {total_inserted} document chunks")
     return total_inserted
@@ -78,18 +105,25 @@ async def run_doc_setter_pipeline(
     chunk_overlap: int = 200,
     max_batch_size: int = 100,
     batch_insert_size: int = 100,
+    preset: str = "full",
     recreate_collection: bool = False
 ):
     if api_key:
         genai.configure(api_key=api_key)
     
     logger.info(f"Starting document setter pipeline with collection: {collection_name}")
-    
-    await create_hybrid_collection(collection_name, vector_size)
+
+    # recreate_collection builds a new version behind the alias; otherwise the live one is synced chunk by chunk
+    versions = CollectionVersions(async_qdrant_client, collection_name)
+    if recreate_collection and await versions.needs_migration():
+        logger.error(f"{collection_name} is still a plain collection; run `python collection_alias.py migrate {collection_name}` first")
+        return 0
+    target_collection = versions.new_version_name() if recreate_collection else await versions.resolve()
+    await create_hybrid_collection(target_collection, vector_size, preset)
     
     total_inserted = await embed_text_documents_from_path(
         base_path=docs_path,
-        collection_name=collection_name,
+        collection_name=target_collection,
         model=model,
         vector_size=vector_size,
         chunk_size=chunk_size,
@@ -98,6 +132,12 @@ async def run_doc_setter_pipeline(
         batch_insert_size=batch_insert_size
     )
     
+    if recreate_collection:
+        if await versions.validate(target_collection, total_inserted or 0):
+            await versions.promote(target_collection)
+        else:
+            logger.error(f"Not promoting {target_collection}; {collection_name} keeps serving {await versions.current()}")
+
     logger.info(f"Document setter pipeline completed. Total inserted: {total_inserted}")
     return total_inserted
 
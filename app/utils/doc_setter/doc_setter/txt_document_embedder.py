@@ -1,14 +1,27 @@
 from langchain.text_splitter import RecursiveCharacterTextSplitter
+import hashlib
 import os
+import uuid
 from pathlib import Path
 import aiofiles
 
+# Fixed namespace, so a chunk gets the same point ID on every run and machine
+DOC_CHUNK_NAMESPACE = uuid.UUID("3043de15-f3f5-470e-9ea1-52b8384c8d32")
+
+
+def chunk_point_id(filename: str, chunk_index: int, content_hash: str) -> str:
+    return str(uuid.uuid5(DOC_CHUNK_NAMESPACE, f"{filename}:{chunk_index}:{content_hash}"))
+
 
 def split_document_and_add_metadatas_to_chunks(document_content_str:str, additional_metadata: dict, text_splitter: RecursiveCharacterTextSplitter):
     chunks = text_splitter.split_text(document_content_str)
     result = []
-    for c in chunks:
+    for chunk_index, c in enumerate(chunks):
+        content_hash = hashlib.sha256(c.encode("utf-8")).hexdigest()[:16]
         additional_metadata['content'] = c
+        additional_metadata['chunk_index'] = chunk_index
+        additional_metadata['content_hash'] = content_hash
+        additional_metadata['id'] = chunk_point_id(additional_metadata.get('filename', ''), chunk_index, content_hash)
         result.append(
             {
                 "metadata": {**additional_metadata},
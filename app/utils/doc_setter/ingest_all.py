@@ -0,0 +1,40 @@
+import asyncio
+import os
+from catalog import run_catalog_build
+from doc_setter.pipeline import run_doc_setter_pipeline
+from products import run_products_pipeline
+from common.orchestrator import IngestionOrchestrator, PipelineSpec
+from loguru import logger
+
+# Everything that is usually run from the separate *_ingestor scripts, under one embedding / Qdrant budget
+PIPELINES = [
+    PipelineSpec(
+        "products",
+        run_products_pipeline,
+        collection_name="gorgia_products_hybrid",
+        bulk_fetch_size=100,
+        batch_create_embeddings_size=50,
+        batch_insert_points_size=50,
+        max_in_flight_uploads=4,
+        incremental=True
+    ),
+    PipelineSpec(
+        "docs",
+        run_doc_setter_pipeline,
+        collection_name="gorgia_docs_hybrid",
+        docs_path=os.path.join(os.path.dirname(__file__), 'doc_setter', 'docs'),
+        api_key=os.getenv('GEMINI_API_KEY'),
+        chunk_size=500,
+        chunk_overlap=200,
+        recreate_collection=False
+    ),
+    PipelineSpec("catalog_build", run_catalog_build, alias="gorgia_catalog_hybrid"),
+]
+
+if __name__ == "__main__":
+    if not os.getenv('GEMINI_API_KEY'):
+        logger.error("GEMINI_API_KEY environment variable not set")
+        exit(1)
+
+    success = asyncio.run(IngestionOrchestrator(PIPELINES, embedding_concurrency=6, qdrant_concurrency=6).run())
+    exit(0 if success else 1)
@@ -0,0 +1,82 @@
+import json
+import os
+import time
+from loguru import logger
+
+DEFAULT_STATE_DIR = os.getenv(
+    "INGESTION_STATE_DIR",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".ingestion_state")
+)
+
+
+def _write_json(path: str, data) -> None:
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f)
+    os.replace(tmp_path, path)
+
+
+class IngestionCheckpoint:
+    """
+    Resumable progress of one pipeline run, kept under <state_dir>/<name>/.
+
+    snapshot.json  - product-ID list and batch size the run was started with
+    progress.json  - offsets of batches that have fully gone through the pipeline
+    """
+
+    def __init__(self, name: str, state_dir: str = DEFAULT_STATE_DIR):
+        self.path = os.path.join(state_dir, name)
+        self.snapshot_path = os.path.join(self.path, "snapshot.json")
+        self.progress_path = os.path.join(self.path, "progress.json")
+        self.product_ids: list = []
+        self.batch_size = 0
+        self.completed: set[int] = set()
+        self.active = False
+        os.makedirs(self.path, exist_ok=True)
+
+    def load(self, batch_size: int) -> bool:
+        """Load an unfinished run; returns False when there is nothing compatible to resume."""
+        try:
+            with open(self.snapshot_path, "r", encoding="utf-8") as f:
+                snapshot = json.load(f)
+            with open(self.progress_path, "r", encoding="utf-8") as f:
+                progress = json.load(f)
+        except (OSError, ValueError):
+            return False
+        if snapshot.get("batch_size") != batch_size:
+            logger.warning(f"Checkpoint at {self.path} used batch size {snapshot.get('batch_size')}, not {batch_size}; starting over")
+            return False
+        self.product_ids = snapshot["product_ids"]
+        self.batch_size = batch_size
+        self.completed = set(progress.get("completed_offsets", []))
+        self.active = True
+        return True
+
+    def start(self, product_ids: list, batch_size: int) -> None:
+        self.product_ids = list(product_ids)
+        self.batch_size = batch_size
+        self.completed = set()
+        _write_json(self.snapshot_path, {"created_at": int(time.time()), "batch_size": batch_size, "product_ids": self.product_ids})
+        _write_json(self.progress_path, {"completed_offsets": []})
+        self.active = True
+
+    def all_offsets(self) -> list[int]:
+        return list(range(0, len(self.product_ids), self.batch_size))
+
+    def pending_offsets(self) -> list[int]:
+        return [offset for offset in self.all_offsets() if offset not in self.completed]
+
+    def batch_ids(self, offset: int) -> list:
+        return self.product_ids[offset:offset + self.batch_size]
+
+    def mark_done(self, offset: int) -> None:
+        if not self.active or offset is None:
+            return
+        self.completed.add(offset)
+        _write_json(self.progress_path, {"completed_offsets": sorted(self.completed)})
+
+    def finish(self) -> None:
+        for path in (self.snapshot_path, self.progress_path):
+            if os.path.exists(path):
+                os.remove(path)
+        self.active = False
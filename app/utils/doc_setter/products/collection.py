@@ -1,5 +1,6 @@
 from .clients import async_qdrant_client
 from qdrant_client.http import models
+from common.vector_presets import dense_vector_params
 from loguru import logger
 
 
@@ -11,17 +12,96 @@ async def delete_collection(collection_name: str):
     logger.info(f"Collection {collection_name} deleted")
 
 
-async def create_hybrid_collection(collection_name: str, vector_size: int):
-    logger.info(f"Creating hybrid collection {collection_name} with vector size {vector_size}")
+async def create_hybrid_collection(collection_name: str, vector_size: int, preset: str = "full"):
+    """preset: "full", "scalar" or "binary" (see common.vector_presets.COLLECTION_PRESETS)."""
+    logger.info(f"Creating hybrid collection {collection_name} with vector size {vector_size}, preset {preset}")
     if not await async_qdrant_client.collection_exists(collection_name):
         logger.info(f"Creating hybrid collection {collection_name} with vector size {vector_size}")
         await async_qdrant_client.create_collection(
             collection_name, 
             vectors_config={
-                "dense": models.VectorParams(size=vector_size, distance=models.Distance.COSINE)
+                "dense": dense_vector_params(vector_size, preset)
             },
             sparse_vectors_config={
               "bm25": models.SparseVectorParams(modifier=models.Modifier.IDF)
             }
         )
+    # Keyword index behind the search tool's brand filter; a no-op when it already exists
+    await async_qdrant_client.create_payload_index(collection_name, field_name="metadata.brand", field_schema=models.PayloadSchemaType.KEYWORD)
 
+
+
+async def fetch_payload_fields(collection_name: str, keys: list[str], batch_size: int = 1000) -> dict:
+    """Scroll the whole collection and return {point_id: {key: payload value}} for the given (dotted) keys."""
+    fields = {}
+    if not await async_qdrant_client.collection_exists(collection_name):
+        return fields
+    offset = None
+    while True:
+        points, offset = await async_qdrant_client.scroll(
+            collection_name=collection_name,
+            limit=batch_size,
+            offset=offset,
+            with_payload=keys or False,
+            with_vectors=False
+        )
+        for point in points:
+            point_fields = {}
+            for key in keys:
+                value = point.payload
+                for part in key.split("."):
+                    value = value.get(part) if isinstance(value, dict) else None
+                point_fields[key] = value
+            fields[point.id] = point_fields
+        if offset is None:
+            break
+    logger.info(f"Loaded {', '.join(keys) or 'IDs'} for {len(fields)} points from {collection_name}")
+    return fields
+
+
+async def fetch_point_ids(collection_name: str, batch_size: int = 1000) -> set:
+    return set(await fetch_payload_fields(collection_name, [], batch_size))
+
+
+async def fetch_payload_values(collection_name: str, key: str, batch_size: int = 1000) -> dict:
+    """{point_id: payload value at `key`} for every point in the collection."""
+    fields = await fetch_payload_fields(collection_name, [key], batch_size)
+    return {point_id: point_fields[key] for point_id, point_fields in fields.items()}
+
+
+async def set_nested_payloads(collection_name: str, updates: dict, key: str, batch_size: int = 500) -> int:
+    """
+    Merge {point_id: partial payload} into the object at `key` of each point.
+    Vectors are untouched; all updates of a chunk go in one batch_update_points request.
+    """
+    items = list(updates.items())
+    updated = 0
+    for i in range(0, len(items), batch_size):
+        chunk = items[i:i + batch_size]
+        await async_qdrant_client.batch_update_points(
+            collection_name=collection_name,
+            update_operations=[
+                models.SetPayloadOperation(
+                    set_payload=models.SetPayload(payload=payload, points=[point_id], key=key)
+                )
+                for point_id, payload in chunk
+            ],
+            wait=True
+        )
+        updated += len(chunk)
+    logger.info(f"Updated {key} payload of {updated} points in {collection_name}")
+    return updated
+
+
+async def delete_points(collection_name: str, point_ids: list, batch_size: int = 1000) -> int:
+    deleted = 0
+    for i in range(0, len(point_ids), batch_size):
+        batch = point_ids[i:i + batch_size]
+        await async_qdrant_client.delete(
+            collection_name=collection_name,
+            points_selector=models.PointIdsList(points=batch),
+            wait=True
+        )
+        deleted += len(batch)
+    logger.info(f"Deleted {deleted} points from {collection_name}")
+    return deleted
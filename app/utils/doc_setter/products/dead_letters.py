@@ -0,0 +1,99 @@
+import json
+import os
+import sys
+import time
+from collections import Counter
+from loguru import logger
+from .checkpoint import DEFAULT_STATE_DIR, _write_json
+
+
+class DeadLetterStore:
+    """
+    Products that could not be fetched, mapped, embedded or inserted, one entry per product ID:
+    {"id", "stage", "reason", "attempts", "first_failed_at", "last_failed_at"}.
+
+    Entries stay until the product makes it into Qdrant (or is found unchanged), so a retry run
+    only has to feed ids() back into the pipeline. Kept in <state_dir>/<name>/dead_letters.json.
+    """
+
+    def __init__(self, name: str, state_dir: str = DEFAULT_STATE_DIR):
+        self.path = os.path.join(state_dir, name, "dead_letters.json")
+        self.entries: dict[str, dict] = {}
+        self.added = Counter()
+        self.resolved = 0
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                self.entries = {str(entry["id"]): entry for entry in json.load(f)}
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError) as e:
+            logger.warning(f"Could not read dead letters from {self.path}, starting empty: {e}")
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def ids(self) -> list:
+        return [entry["id"] for entry in self.entries.values()]
+
+    def add(self, product_ids: list, stage: str, reason) -> None:
+        if not product_ids:
+            return
+        now = int(time.time())
+        reason = str(reason)[:500]
+        for product_id in product_ids:
+            entry = self.entries.get(str(product_id))
+            if entry is None:
+                entry = self.entries[str(product_id)] = {"id": product_id, "attempts": 0, "first_failed_at": now}
+            entry.update(stage=stage, reason=reason, last_failed_at=now, attempts=entry["attempts"] + 1)
+        self.added[stage] += len(product_ids)
+        logger.warning(f"{len(product_ids)} products dead-lettered at {stage}: {reason[:100]}")
+        self.save()
+
+    def resolve(self, product_ids: list) -> None:
+        resolved = [key for key in map(str, product_ids) if self.entries.pop(key, None) is not None]
+        if resolved:
+            self.resolved += len(resolved)
+            self.save()
+
+    def discard(self, product_ids) -> None:
+        """Drop entries without counting them as resolved, e.g. products removed from the catalog."""
+        discarded = [key for key in map(str, product_ids) if self.entries.pop(key, None) is not None]
+        if discarded:
+            logger.info(f"Discarded {len(discarded)} dead letters for products that are no longer listed")
+            self.save()
+
+    def save(self) -> None:
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        _write_json(self.path, list(self.entries.values()))
+
+    def stats(self) -> dict:
+        return {
+            "pending": len(self.entries),
+            "pending_by_stage": dict(Counter(entry["stage"] for entry in self.entries.values())),
+            "added_this_run": dict(self.added),
+            "resolved_this_run": self.resolved,
+        }
+
+    def log_stats(self) -> None:
+        stats = self.stats()
+        logger.info(
+            f"Dead letters: {stats['pending']} pending {stats['pending_by_stage']}, "
+            f"{sum(self.added.values())} added {stats['added_this_run']}, {self.resolved} resolved this run"
+        )
+
+
+def main(argv: list[str]) -> None:
+    """python -m products.dead_letters <collection_name> [stats|list]"""
+    if not argv:
+        raise SystemExit(main.__doc__)
+    store = DeadLetterStore(f"products_{argv[0]}")
+    command = argv[1] if len(argv) > 1 else "stats"
+    if command == "list":
+        for entry in sorted(store.entries.values(), key=lambda entry: entry["last_failed_at"]):
+            print(json.dumps(entry, ensure_ascii=False))
+    else:
+        print(json.dumps(store.stats(), indent=2))
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -1,25 +1,40 @@
 import asyncio
+import math
 import httpx
+import ijson
 import random
 from loguru import logger
 from abc import ABC, abstractmethod
+from .response_cache import ResponseCache
 
 ELITE_DETAIL_BASE_URL = "https://api.zoommer.ge/v1/Products/details/"
 ELITE_BULK_BASE_URL = "https://api.zoommer.ge/v1/Products/v3"
+LISTING_PAGE_SIZE = 1000
+# Keys the listing may report its total under; without one, pages are probed in concurrent waves
+LISTING_TOTAL_KEYS = ("totalCount", "total", "productsCount", "count", "totalItems")
 
 
 class BaseFetcher(ABC):
-    def __init__(self, set_total_products_found_callback: callable = None, max_retries=2, concurrency=5, timeout=10.0):
+    def __init__(self, set_total_products_found_callback: callable = None, max_retries=2, concurrency=5, timeout=10.0, response_cache: ResponseCache | None = None):
         self.max_retries = max_retries
         self.concurrency = concurrency
         self.timeout = timeout
         self._client = None
         self._sem = None
         self.set_total_products_found_callback = set_total_products_found_callback
+        self.response_cache = response_cache
+
+    def _new_client(self) -> httpx.AsyncClient:
+        return httpx.AsyncClient(
+            timeout=self.timeout,
+            http2=False,
+            headers={"User-Agent": "python-httpx", "Accept-Language": "en"},
+            limits=httpx.Limits(max_connections=self.concurrency * 2, max_keepalive_connections=self.concurrency * 2)
+        )
 
     async def __aenter__(self):
         self._sem = asyncio.Semaphore(self.concurrency)
-        self._client = httpx.AsyncClient(timeout=self.timeout, http2=False, headers={"User-Agent": "python-httpx", "Accept-Language": "en"})
+        self._client = self._new_client()
         return self
 
     async def __aexit__(self, exc_type, exc, tb):
@@ -27,6 +42,8 @@ class BaseFetcher(ABC):
             await self._client.aclose()
         self._client = None
         self._sem = None
+        if self.response_cache is not None:
+            logger.info(f"Detail response cache: {self.response_cache.stats()}")
 
     @abstractmethod
     async def fetch_all_product_ids(self):
@@ -41,9 +58,18 @@ class BaseFetcher(ABC):
         for attempt in range(self.max_retries + 1):
             async with (self._sem or sem):
                 try:
-                    r = await (self._client or client).get(product_detail_url)
+                    cached = await self.response_cache.get(product_detail_url) if self.response_cache else None
+                    headers = self.response_cache.conditional_headers(cached) if self.response_cache else None
+                    r = await (self._client or client).get(product_detail_url, headers=headers)
+                    if r.status_code == 304 and cached is not None:
+                        self.response_cache.record_hit(cached)
+                        return cached["body"]
                     r.raise_for_status()
-                    return r.json()
+                    body = r.json()
+                    if self.response_cache:
+                        self.response_cache.misses += 1
+                        await self.response_cache.put(product_detail_url, r, body)
+                    return body
                 except (httpx.ConnectError, httpx.ReadTimeout, httpx.WriteError, httpx.RemoteProtocolError) as e:
                     if attempt < self.max_retries:
                         await asyncio.sleep(delay + random.uniform(0, 0.5))
@@ -83,6 +109,9 @@ class BaseFetcher(ABC):
                     ans.append(result)
             return ans
 
+    async def fetch_product_details(self, product_ids: list) -> list[dict]:
+        return await self._fetch_bulk_product_details(self.build_product_detail_urls(product_ids))
+
     async def iterate_over_bulk_product_details(self, start_page: int, bulk_size: int, product_ids: None | list = None) -> dict:
         if product_ids is None:
             product_ids = await self.fetch_all_product_ids()
@@ -92,32 +121,111 @@ class BaseFetcher(ABC):
         start_idx = (start_page - 1) * bulk_size
         for i in range(start_idx, len(product_ids), bulk_size):
             product_ids_batch = product_ids[i:i+bulk_size]
-            product_detail_urls = self.build_product_detail_urls(product_ids_batch)
-            details = await self._fetch_bulk_product_details(product_detail_urls)
-            yield details
+            yield await self.fetch_product_details(product_ids_batch)
 
 
 class ZoommerFetcher(BaseFetcher):
-    def __init__(self, bulk_base_url: str = ELITE_BULK_BASE_URL, detail_base_url: str = ELITE_DETAIL_BASE_URL, set_total_products_found_callback: callable = None):
-        super().__init__(set_total_products_found_callback=set_total_products_found_callback)
+    def __init__(self, bulk_base_url: str = ELITE_BULK_BASE_URL, detail_base_url: str = ELITE_DETAIL_BASE_URL, set_total_products_found_callback: callable = None, response_cache: ResponseCache | None = None):
+        super().__init__(set_total_products_found_callback=set_total_products_found_callback, response_cache=response_cache or ResponseCache())
         self.bulk_base_url = bulk_base_url
         self.detail_base_url = detail_base_url
 
+    @staticmethod
+    async def _parse_listing_page(response: httpx.Response, fields: tuple | None, with_totals: bool = False) -> dict:
+        """
+        Parse a listing page with ijson while it downloads, cutting products down to `fields` when given.
+        Without with_totals products are built one at a time; with it the top-level keys are read whole
+        (the products list included), which is only needed on the first page.
+        """
+        def project(product: dict) -> dict:
+            return {key: product[key] for key in fields if key in product} if fields else product
+
+        body = ijson.from_iter(response.aiter_bytes())
+        if not with_totals:
+            return {"products": [project(product) async for product in ijson.items_async(body, "products.item", use_float=True)]}
+        page = {}
+        async for key, value in ijson.kvitems_async(body, "", use_float=True):
+            if key == "products":
+                page[key] = [project(product) for product in value or []]
+            elif key in LISTING_TOTAL_KEYS:
+                page[key] = value
+        return page
+
+    async def _fetch_listing_page(self, client: httpx.AsyncClient, page: int, fields: tuple | None = None, missing_ok: bool = False) -> dict | None:
+        """
+        One listing page, or None when it could not be fetched. 5xx and 429 answers are retried with
+        backoff; other 4xx answers are final and, with missing_ok (probing past the end), an empty page.
+        """
+        url = f"{self.bulk_base_url}?Limit={LISTING_PAGE_SIZE}&Page={page}"
+        delay = 0.5
+        for attempt in range(self.max_retries + 1):
+            try:
+                async with client.stream("GET", url) as r:
+                    if r.status_code == 200:
+                        return await self._parse_listing_page(r, fields, with_totals=page == 1)
+                    if 400 <= r.status_code < 500 and r.status_code != 429:
+                        if missing_ok:
+                            return {"products": []}
+                        logger.warning(f"Listing page {page} answered {r.status_code}")
+                        return None
+                    r.raise_for_status()
+            except (httpx.HTTPError, ijson.JSONError) as e:
+                if attempt < self.max_retries:
+                    await asyncio.sleep(delay + random.uniform(0, 0.5))
+                    delay *= 2
+                else:
+                    logger.warning(f"Failed to fetch listing page {page}: {e}")
+                    return None
+
+    async def _fetch_listing_pages(self, client: httpx.AsyncClient, pages: list[int], fields: tuple | None = None, missing_ok: bool = False) -> list[list[dict]]:
+        sem = asyncio.Semaphore(self.concurrency)
+
+        async def fetch(page):
+            async with sem:
+                data = await self._fetch_listing_page(client, page, fields, missing_ok)
+                return page, data
+
+        results = await asyncio.gather(*(fetch(page) for page in pages))
+        failed = [page for page, data in results if data is None]
+        if failed:
+            # A listing with holes would make incremental runs delete the missing products
+            raise RuntimeError(f"Failed to fetch listing pages {failed}")
+        return [data.get("products", []) for _, data in results]
+
+    async def fetch_listing(self, fields: tuple | None = None) -> list[dict]:
+        """All listed products; with `fields`, each one keeps only those keys, which is all most callers need."""
+        client = self._client or self._new_client()
+        try:
+            first_page = await self._fetch_listing_page(client, 1, fields)
+            res = list((first_page or {}).get("products", []))
+            if not res:
+                return res
+
+            total = next((first_page[key] for key in LISTING_TOTAL_KEYS if isinstance(first_page.get(key), int)), None)
+            if total is not None:
+                pages = list(range(2, math.ceil(total / LISTING_PAGE_SIZE) + 1))
+                for products in await self._fetch_listing_pages(client, pages, fields):
+                    res.extend(products)
+            elif len(res) >= LISTING_PAGE_SIZE:
+                # Unknown total: probe `concurrency` pages at a time until one comes back short;
+                # a 4xx past the last page counts as an empty one
+                next_page = 2
+                while True:
+                    pages = list(range(next_page, next_page + self.concurrency))
+                    results = await self._fetch_listing_pages(client, pages, fields, missing_ok=True)
+                    for products in results:
+                        res.extend(products)
+                    if any(len(products) < LISTING_PAGE_SIZE for products in results):
+                        break
+                    next_page += self.concurrency
+            logger.info(f"Fetched listing of {len(res)} products")
+            return res
+        finally:
+            if client is not self._client:
+                await client.aclose()
+
     async def fetch_all_product_ids(self) -> list[int]:
-        res = []
-        start_page = 1
-        async with httpx.AsyncClient(timeout=self.timeout, http2=False, headers={"User-Agent": "python-httpx", "Accept-Language": "en"}) as client:
-            while True:
-                url = f"{self.bulk_base_url}?Limit=1000&Page={start_page}"
-                r = await client.get(url)
-                if r.status_code != 200:
-                    break
-                data = r.json()
-                product_ids = [item["id"] for item in data.get("products", [])]
-                if not product_ids:
-                    break
-                res.extend(product_ids)
-                start_page += 1
+        res = [item["id"] for item in await self.fetch_listing(fields=("id",))]
         if self.set_total_products_found_callback:
             await self.set_total_products_found_callback(len(res))
         return res
@@ -1,7 +1,23 @@
+import hashlib
 from abc import ABC, abstractmethod
 from loguru import logger
 
 
+# Bump when the point payload layout changes; Product.from_search_result keys its fast path on it
+PAYLOAD_SCHEMA_VERSION = 2
+ZOOMMER_SITE_URL = "https://zoommer.ge"
+# Specification names Zoommer uses for the brand when the product has no brand field of its own
+BRAND_SPECIFICATION_NAMES = {"brand", "ბრენდი"}
+
+
+def compute_content_hash(dense_text: str, sparse_text: str) -> str:
+    """
+    Hash of both embedding inputs; a product only needs re-embedding when this changes.
+    Neither text carries price, discount or stock, so daily commercial changes never alter it.
+    """
+    return hashlib.sha256(f"{dense_text}\x1f{sparse_text}".encode("utf-8")).hexdigest()
+
+
 class Mapper(ABC):
     
     @abstractmethod
@@ -36,7 +52,92 @@ class ZoommerMapper(Mapper):
             return None
         mapped['dense_text'] = self.map_metadata_to_embedding_text(mapped)
         mapped['sparse_text'] = self.map_metadata_to_sparse_embedding_text(mapped)
+        mapped['content_hash'] = compute_content_hash(mapped['dense_text'], mapped['sparse_text'])
+        mapped['payload'] = self.map_metadata_to_payload(mapped)
         return mapped
+
+    def map_metadata_to_payload(self, metadata: dict) -> dict:
+        """
+        Compact, versioned point payload holding only what the runtime reads.
+        Field names follow app.models.Product; price and stock are kept out of summary/card
+        so payload-only refreshes never leave them stale.
+        """
+        product = metadata.get("product", {}) or {}
+        name = product.get("name")
+        route = product.get("route")
+        url = f"{ZOOMMER_SITE_URL}/{route}" if route else None
+        image_url = product.get("imageUrl") or product.get("image")
+        if image_url:
+            # Product.image_url prepends the scheme itself
+            image_url = image_url.split("://", 1)[-1]
+
+        return {
+            "schema_version": PAYLOAD_SCHEMA_VERSION,
+            "id": metadata["id"],
+            "product": name,
+            "bar_code": product.get("barCode"),
+            "brand": self._map_brand(product),
+            "price": product.get("price"),
+            "previous_price": product.get("previousPrice"),
+            "in_stock": product.get("isInStock", False),
+            "category": product.get("categoryName"),
+            "parent_category": product.get("parentCategoryName"),
+            "image_url": image_url,
+            "url": url,
+            "characteristics": self._map_characteristics_summary(product),
+            "branch_availability": self._map_branch_availability_summary(metadata.get("availabilityInStores")),
+            "summary": self._map_summary(product),
+            "card": {
+                "id": metadata["id"],
+                "title": name,
+                "imageUrl": f"https://{image_url}" if image_url else None,
+                "url": url,
+            },
+            "content_hash": metadata.get("content_hash"),
+        }
+
+    def _map_brand(self, product: dict) -> str | None:
+        """Casefolded, whitespace-collapsed brand (app.utils.brand_index.brand_key), indexed as a keyword for exact filtering."""
+        brand = product.get("brandName") or product.get("brand")
+        if not brand:
+            specifications = [spec for group in product.get("specificationGroup", []) or [] for spec in group.get("specifications", []) or []]
+            specifications += product.get("mainSpecification", []) or []
+            brand = next(
+                (spec.get("specificationMeaning") for spec in specifications
+                 if (spec.get("specificationName") or "").strip().casefold() in BRAND_SPECIFICATION_NAMES and spec.get("specificationMeaning")),
+                None
+            )
+        return " ".join(brand.casefold().split()) if isinstance(brand, str) and brand.strip() else None
+
+    def _map_characteristics_summary(self, product: dict) -> str | None:
+        parts = []
+        for group in product.get("specificationGroup", []) or []:
+            for spec in group.get("specifications", []) or []:
+                name = spec.get("specificationName")
+                meaning = spec.get("specificationMeaning")
+                if name and meaning:
+                    parts.append(f"{name}: {meaning}")
+        return " | ".join(parts) or None
+
+    def _map_branch_availability_summary(self, availability_in_stores: list) -> str | None:
+        stores = [
+            f"{store.get('branchName', '')} - {store.get('address', '')}"
+            for store in availability_in_stores or []
+            if store.get("inStock")
+        ]
+        return "; ".join(stores) or None
+
+    def _map_summary(self, product: dict) -> str:
+        category = " / ".join(part for part in (product.get("parentCategoryName"), product.get("categoryName")) if part)
+        key_specs = self._map_key_specification(product.get("keySpecification")) or self._map_main_specification_inline(product.get("mainSpecification"))
+        return " | ".join(part for part in (product.get("name"), category, key_specs) if part)
+
+    def _map_main_specification_inline(self, main_specification: list) -> str:
+        return ", ".join(
+            f"{spec.get('specificationName')}: {spec.get('specificationMeaning')}"
+            for spec in main_specification or []
+            if spec.get("specificationName") and spec.get("specificationMeaning")
+        )
     
     def map_metadata_to_sparse_embedding_text(self, metadata: dict) -> str:
         product_dict = metadata.get("product", {})
@@ -70,39 +171,19 @@ class ZoommerMapper(Mapper):
             "name": product_dict.get("name", ""),
             "description": product_dict.get("description", ""),
             "sellType": product_dict.get("sellType", ""),
-            "price": product_dict.get("price", ""),
-            "previousPrice": product_dict.get("previousPrice", ""),
             "parentCategoryName": product_dict.get("parentCategoryName", ""),
             "categoryName": product_dict.get("categoryName", ""),
-            "isInStock": product_dict.get("isInStock", False),
-            "discountPercent": product_dict.get("discountPercent", ""),
-            "hasDiscount": product_dict.get("hasDiscount", False),
-            "discountAmount": product_dict.get("discountAmount", ""),
-            "discountType": product_dict.get("discountType", ""),
             "metaTitle": product_dict.get("metaTitle", ""),
             "route": product_dict.get("route", ""),
-            "availabilityInStores": self._map_availability_in_stores(metadata.get("availabilityInStores")),
             "specificationGroup": self._map_specification_group(product_dict.get("specificationGroup")),
             "mainSpecification": self._map_main_specification(product_dict.get("mainSpecification")),
             "keySpecification": self._map_key_specification(product_dict.get("keySpecification"))
         }
+        # Price, discount and stock (overall and per store) stay out of the embedded text: they change daily,
+        # live in the payload and are kept current there without re-embedding
         text_parts = []
-        not_regular_keys = ["id", "isInStock", "hasDiscount"]
         for key in product.keys():
-            if key in not_regular_keys:
-                continue
             text_parts.append(f"{key}: {product[key]}")
-        
-        if product['isInStock']:
-            text_parts.append(f" In Stock ")
-        else:
-            text_parts.append(f" Out of Stock ")
-        
-        if product['hasDiscount']:
-            text_parts.append(f" On Discount ")
-        else:
-            text_parts.append(f" Not On Discount ")
-            
         return "\n".join(text_parts)
 
 
@@ -169,40 +250,3 @@ class ZoommerMapper(Mapper):
         except Exception as e:
             logger.error(f"Error mapping main specification: {e}")
             return ""
-
-
-    def _map_availability_in_stores(self, availability_in_stores: list) -> str:
-        if not availability_in_stores:
-            return ""
-        try:
-            available_stores = []
-            not_available_stores = []
-            
-            for store in availability_in_stores:
-                branch_name = store.get("branchName", "")
-                city = store.get("city", "")
-                address = store.get("address", "")
-                in_stock = store.get("inStock", False)
-                
-                store_info = f"branchname: {branch_name}, city: {city}, address: {address}"
-                
-                if in_stock:
-                    available_stores.append(f"## Available In {store_info}")
-                else:
-                    not_available_stores.append(f"## Not available in {store_info}")
-            
-            result_parts = []
-            if available_stores:
-                result_parts.append("# Availability in stores")
-                result_parts.extend(available_stores)
-            
-            if not_available_stores:
-                if not result_parts:
-                    result_parts.append("# Availability in stores")
-                result_parts.extend(not_available_stores)
-            
-            return "\n".join(result_parts)
-        except Exception as e:
-            logger.error(f"Error mapping availability in stores: {e}")
-            return ""
-
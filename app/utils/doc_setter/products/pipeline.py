@@ -1,9 +1,24 @@
+import json
+import time
+import aiofiles
 from .embedder import EmbeddingCreator, PointInserter
-from .mapper import ZoommerMapper
+from .stages import StagePipeline, Batch
+from .checkpoint import IngestionCheckpoint, DEFAULT_STATE_DIR
+from .dead_letters import DeadLetterStore
+from .mapper import ZoommerMapper, PAYLOAD_SCHEMA_VERSION
 from .fetcher import ZoommerFetcher
-from .collection import create_hybrid_collection, delete_collection
+from .clients import async_qdrant_client
+from .collection import create_hybrid_collection, fetch_payload_fields, fetch_point_ids, delete_points, set_nested_payloads
+from common.collection_versions import CollectionVersions
 from loguru import logger
 
+# Listing fields that change daily and can be refreshed without re-embedding -> compact payload keys
+REFRESH_FIELDS = {"price": "price", "previousPrice": "previous_price", "isInStock": "in_stock"}
+# Payloads written before schema_version existed keep the raw product (price, previousPrice, isInStock) here
+LEGACY_PRODUCT_KEY = "metadata.product"
+# Payload keys the content hash does not cover; incremental runs rewrite only these for unchanged products
+VOLATILE_PAYLOAD_KEYS = (*REFRESH_FIELDS.values(), "branch_availability")
+
 
 class ProductPipelineConfig:
     def __init__(
@@ -15,7 +30,18 @@ class ProductPipelineConfig:
         bulk_fetch_size: int, 
         batch_create_embeddings_size: int, 
         batch_insert_points_size: int,
-        fetcher_kwargs: dict = None
+        fetcher_kwargs: dict = None,
+        raw_archive_path: str | None = None,
+        checkpoint_dir: str | None = DEFAULT_STATE_DIR,
+        alias: str | None = None,
+        fetch_concurrency: int = 2,
+        map_concurrency: int = 1,
+        dense_concurrency: int = 2,
+        sparse_concurrency: int = 2,
+        insert_concurrency: int = 2,
+        max_in_flight_uploads: int = 0,
+        queue_size: int = 4,
+        log_interval: float = 15.0
     ):
         self.embedding_model = embedding_model
         self.vector_size = vector_size
@@ -25,6 +51,19 @@ class ProductPipelineConfig:
         self.batch_create_embeddings_size = batch_create_embeddings_size
         self.batch_insert_points_size = batch_insert_points_size
         self.fetcher_kwargs = fetcher_kwargs or {}
+        self.fetch_concurrency = fetch_concurrency
+        self.map_concurrency = map_concurrency
+        self.dense_concurrency = dense_concurrency
+        self.sparse_concurrency = sparse_concurrency
+        self.insert_concurrency = insert_concurrency
+        # > 0: upload with wait=False, this many batches in flight, and a point count barrier at the end
+        self.max_in_flight_uploads = max_in_flight_uploads
+        self.queue_size = queue_size
+        self.log_interval = log_interval
+        self.raw_archive_path = raw_archive_path
+        self.checkpoint_dir = checkpoint_dir
+        # Name the runtime reads; collection_name may be one of its versions (see CollectionVersions)
+        self.alias = alias or collection_name
 
 
 class ProductEmbedderPipeline:
@@ -35,63 +74,337 @@ class ProductEmbedderPipeline:
             model=config.embedding_model,
             vector_size=config.vector_size
         )
-        self.inserter = PointInserter(collection_name=config.collection_name)
+        self.inserter = PointInserter(collection_name=config.collection_name, max_in_flight=max(config.max_in_flight_uploads, 1))
         self.mapper = ZoommerMapper()
         self.config = config
         self.to_be_inserted = [0]
+        self.checkpoint = None
+        self.dead_letters = None
+        if config.checkpoint_dir:
+            # Progress belongs to the collection being written (a new version or the live one); failed
+            # products belong to the catalogue, whichever collection serves it
+            self.checkpoint = product_checkpoint(config.collection_name, config.checkpoint_dir)
+            self.dead_letters = DeadLetterStore(f"products_{config.alias}", config.checkpoint_dir)
 
     async def _set_to_be_inserted(self, to_be_inserted: int):
         self.to_be_inserted[0] = to_be_inserted
         logger.info(f"Total products to be inserted: {to_be_inserted}")
 
-    async def run_hybrid(self) -> bool:
-        total_inserted = 0
-        total_processed = 0
+    def _diff_listing(self, listing: list[dict], stored_fields: dict) -> tuple[dict, dict]:
+        """
+        ({point_id: changed compact fields}, {point_id: changed legacy fields}) for the listed products.
+        Points without schema_version predate the compact payload and keep these fields under
+        metadata.product with the listing's own names.
+        """
+        updates, legacy_updates = {}, {}
+        for item in listing:
+            stored = stored_fields.get(item.get("id"))
+            if stored is None:
+                continue
+            if stored.get("metadata.schema_version") is None:
+                changed = {
+                    field: item[field] for field in REFRESH_FIELDS
+                    if field in item and stored.get(f"{LEGACY_PRODUCT_KEY}.{field}") != item[field]
+                }
+                if changed:
+                    legacy_updates[item["id"]] = changed
+                continue
+            changed = {
+                payload_key: item[field] for field, payload_key in REFRESH_FIELDS.items()
+                if field in item and stored.get(f"metadata.{payload_key}") != item[field]
+            }
+            if changed:
+                updates[item["id"]] = changed
+        return updates, legacy_updates
+
+    async def run_refresh(self) -> bool:
+        """
+        Sync price / discount / stock from the bulk listing into existing payloads.
+        Neither the vectors nor content_hash depend on these fields, so the next incremental run still
+        treats the refreshed products as unchanged; new products are picked up by that run.
+        """
+        stored_fields = await fetch_payload_fields(
+            self.collection_name,
+            [
+                "metadata.schema_version",
+                *(f"metadata.{payload_key}" for payload_key in REFRESH_FIELDS.values()),
+                *(f"{LEGACY_PRODUCT_KEY}.{field}" for field in REFRESH_FIELDS),
+            ]
+        )
+
+        async with self.fetcher_class(**self.config.fetcher_kwargs) as fetcher:
+            listing = await fetcher.fetch_listing(fields=("id", *REFRESH_FIELDS))
+        if not listing:
+            logger.warning("Product listing came back empty; nothing to refresh")
+            return False
+
+        updates, legacy_updates = self._diff_listing(listing, stored_fields)
+        changed = len(updates) + len(legacy_updates)
+        not_indexed = sum(1 for item in listing if item.get("id") not in stored_fields)
+        logger.info(
+            f"Refresh: {len(listing)} listed, {changed} changed ({len(legacy_updates)} with the legacy payload), "
+            f"{len(listing) - changed - not_indexed} unchanged, {not_indexed} not indexed yet"
+        )
+
+        if updates:
+            await set_nested_payloads(self.collection_name, updates, key="metadata")
+        if legacy_updates:
+            await set_nested_payloads(self.collection_name, legacy_updates, key=LEGACY_PRODUCT_KEY)
+        return True
+
+    async def _archive_raw_details(self, product_metadatas: list[dict]):
+        """Raw Zoommer details no longer go into Qdrant; keep them as JSONL for debugging and re-mapping."""
+        fetched_at = int(time.time())
+        lines = "".join(
+            json.dumps({"id": metadata["id"], "fetched_at": fetched_at, "detail": {
+                key: value for key, value in metadata.items()
+                if key not in ("id", "dense_text", "sparse_text", "content_hash", "payload")
+            }}, ensure_ascii=False) + "\n"
+            for metadata in product_metadatas
+        )
+        async with aiofiles.open(self.config.raw_archive_path, "a", encoding="utf-8") as f:
+            await f.write(lines)
+
+    def _diff_volatile_payload(self, product_metadatas: list[dict], stored_fields: dict) -> dict:
+        updates = {}
+        for metadata in product_metadatas:
+            stored = stored_fields.get(metadata["id"], {})
+            changed = {
+                payload_key: metadata["payload"].get(payload_key) for payload_key in VOLATILE_PAYLOAD_KEYS
+                if stored.get(f"metadata.{payload_key}") != metadata["payload"].get(payload_key)
+            }
+            if changed:
+                updates[metadata["id"]] = changed
+        return updates
+
+    def _filter_changed(self, product_metadatas: list[dict], stored_hashes: dict) -> list[dict]:
+        return [
+            metadata for metadata in product_metadatas
+            if stored_hashes.get(metadata['id']) != metadata['content_hash']
+        ]
+
+    def _dead_letter(self, product_ids: list, stage: str, reason):
+        if self.dead_letters is not None:
+            self.dead_letters.add(product_ids, stage, reason)
+
+    def _resolve_dead_letters(self, product_ids: list):
+        if self.dead_letters is not None:
+            self.dead_letters.resolve(product_ids)
+
+    def _on_batch_failed(self, stage: str, batch: Batch, error: Exception):
+        # A stage raised for the whole batch; the offset key maps back to the product IDs it started with
+        self._dead_letter(self._batch_ids.get(batch.key, []), stage, error)
+
+    def _drop_failed_embeddings(self, records: list[dict], vector_name: str) -> list[dict]:
+        failed_ids = [record["metadata"]["id"] for record in records if record[vector_name] is None]
+        if failed_ids:
+            self._dead_letter(failed_ids, vector_name, f"{vector_name} embedding failed even at batch size 1")
+            return [record for record in records if record[vector_name] is not None]
+        return records
+
+    def _on_batch_done(self, offset: int):
+        if self.checkpoint is not None and self._use_progress:
+            self.checkpoint.mark_done(offset)
+
+    async def retry_dead_letters(self, incremental: bool = False) -> bool:
+        if self.dead_letters is None:
+            logger.warning("Checkpointing is disabled, so there is no dead-letter store to retry")
+            return True
+        product_ids = self.dead_letters.ids()
+        if not product_ids:
+            logger.info("No dead-lettered products to retry")
+            return True
+        logger.info(f"Retrying {len(product_ids)} dead-lettered products")
+        return await self.run_hybrid(incremental=incremental, product_ids=product_ids)
+
+    async def run_hybrid(self, incremental: bool = False, product_ids: list | None = None) -> bool:
+        """
+        Full / incremental ingestion. With product_ids given (retry runs) only those products are
+        processed, progress is not checkpointed and nothing is deleted.
+
+        Products failing at any stage go to the dead-letter store and leave it once inserted.
+        """
+        is_retry = product_ids is not None
+        self._use_progress = self.checkpoint is not None and not is_retry
+        resumed = self._use_progress and self.checkpoint.load(self.config.bulk_fetch_size)
+        if resumed:
+            product_ids = self.checkpoint.product_ids
+            logger.info(
+                f"Resuming from checkpoint: {len(self.checkpoint.completed)}/{len(self.checkpoint.all_offsets())} "
+                f"batches of {len(product_ids)} products already done"
+            )
+
+        self.total_inserted = 0
+        self.total_listed = 0
+        self.total_processed = 0
+        self.total_unchanged = 0
+        self.total_payload_updated = 0
+        stored_hashes = {}
+        stored_fields = {}
+        non_blocking = self.config.max_in_flight_uploads > 0
+        uploaded_ids = set()
+
+        if incremental:
+            stored_fields = await fetch_payload_fields(
+                self.collection_name,
+                ["metadata.content_hash", "metadata.schema_version", *(f"metadata.{payload_key}" for payload_key in VOLATILE_PAYLOAD_KEYS)]
+            )
+            # Points written with an older payload schema count as changed so they get rewritten
+            stored_hashes = {
+                point_id: fields["metadata.content_hash"] if fields["metadata.schema_version"] == PAYLOAD_SCHEMA_VERSION else None
+                for point_id, fields in stored_fields.items()
+            }
+            logger.info(f"Incremental mode: {len(stored_hashes)} products already in {self.collection_name}")
+        existing_ids = set(stored_hashes)
+        if non_blocking and not incremental:
+            # The final barrier waits for the union of what was there and what this run uploads
+            existing_ids = await fetch_point_ids(self.collection_name)
 
         async with self.fetcher_class(set_total_products_found_callback=self._set_to_be_inserted, **self.config.fetcher_kwargs) as fetcher:
-            async for product_batch in fetcher.iterate_over_bulk_product_details(1, self.config.bulk_fetch_size):
-                logger.info(f"Processing batch of {len(product_batch)} products")
+            if product_ids is None:
+                product_ids = await fetcher.fetch_all_product_ids()
+                if self._use_progress:
+                    self.checkpoint.start(product_ids, self.config.bulk_fetch_size)
 
-                product_metadatas = self.mapper.map_fetched_details_to_product_metadatas(product_batch)
+            self.total_listed = len(product_ids)
+            batch_size = self.config.bulk_fetch_size
+            self._batch_ids = {offset: product_ids[offset:offset + batch_size] for offset in range(0, len(product_ids), batch_size)}
+            offsets = self.checkpoint.pending_offsets() if self._use_progress else list(self._batch_ids)
+            await self._set_to_be_inserted(sum(len(self._batch_ids[offset]) for offset in offsets))
+
+            async def id_batches():
+                for offset in offsets:
+                    yield Batch(self._batch_ids[offset], key=offset)
 
-                dense_texts = self.mapper.map_metadatas_to_embedding_texts(product_metadatas)
-                sparse_texts = self.mapper.map_metadatas_to_sparse_embedding_texts(product_metadatas)
+            async def fetch_stage(ids_batch: list) -> list[dict]:
+                details = await fetcher.fetch_product_details(ids_batch)
+                fetched_ids = {detail.get("product", {}).get("id") for detail in details}
+                self._dead_letter([pid for pid in ids_batch if pid not in fetched_ids], "fetch", "product detail request failed")
+                return details
 
-                logger.info(f"Generating dense embeddings for {len(dense_texts)} product texts")
+            async def map_stage(product_batch: list[dict]) -> list[dict]:
+                product_metadatas = self.mapper.map_fetched_details_to_product_metadatas(product_batch)
+                if self.config.raw_archive_path:
+                    await self._archive_raw_details(product_metadatas)
+                self.total_processed += len(product_batch)
+                if incremental:
+                    changed_metadatas = self._filter_changed(product_metadatas, stored_hashes)
+                    self.total_unchanged += len(product_metadatas) - len(changed_metadatas)
+                    changed_ids = {metadata["id"] for metadata in changed_metadatas}
+                    unchanged_metadatas = [metadata for metadata in product_metadatas if metadata["id"] not in changed_ids]
+                    # Same content, possibly new price / stock: update the payload in place, no re-embedding
+                    payload_updates = self._diff_volatile_payload(unchanged_metadatas, stored_fields)
+                    if payload_updates:
+                        await set_nested_payloads(self.collection_name, payload_updates, key="metadata")
+                        self.total_payload_updated += len(payload_updates)
+                    self._resolve_dead_letters([metadata["id"] for metadata in unchanged_metadatas])
+                    product_metadatas = changed_metadatas
+                return [{"metadata": metadata} for metadata in product_metadatas]
+
+            async def dense_stage(records: list[dict]) -> list[dict]:
                 dense_embeddings = await self.embedder.create_dense_embeddings_batch(
-                    dense_texts,
+                    [record["metadata"]["dense_text"] for record in records],
                     self.config.batch_create_embeddings_size
                 )
+                for record, embedding in zip(records, dense_embeddings):
+                    record["dense"] = embedding
+                return self._drop_failed_embeddings(records, "dense")
 
-                logger.info(f"Generating sparse embeddings for {len(sparse_texts)} product texts")
-                sparse_embeddings = await self.embedder.create_sparse_embeddings_batch(sparse_texts)
-
-                logger.info(f"Generated {len(dense_embeddings)} dense embeddings")
-                logger.info(f"Generated {len(sparse_embeddings)} sparse embeddings")
+            async def sparse_stage(records: list[dict]) -> list[dict]:
+                sparse_embeddings = await self.embedder.create_sparse_embeddings_batch(
+                    [record["metadata"]["sparse_text"] for record in records]
+                )
+                for record, embedding in zip(records, sparse_embeddings):
+                    record["sparse"] = embedding
+                return self._drop_failed_embeddings(records, "sparse")
 
-                logger.info(f"Inserting {len(product_metadatas)} product models into qdrant")
+            async def insert_stage(records: list[dict]) -> None:
                 points = self.inserter.create_qdrant_points_with_sparse_and_dense_vectors(
-                    product_metadatas,
-                    dense_embeddings,
-                    sparse_embeddings
+                    [record["metadata"] for record in records],
+                    [record.get("dense") for record in records],
+                    [record.get("sparse") for record in records]
                 )
+                failed_ids = set()
 
-                inserted = await self.inserter.insert_points_with_adaptive_batch_size(
+                def on_insert_failed(failed_points, error):
+                    failed_ids.update(point.id for point in failed_points)
+                    self._dead_letter([point.id for point in failed_points], "insert", error)
+
+                insert = self.inserter.insert_points_concurrently if non_blocking else self.inserter.insert_points_with_adaptive_batch_size
+                inserted = await insert(
                     points,
-                    self.config.batch_insert_points_size
-                )
+                    self.config.batch_insert_points_size,
+                    on_failed=on_insert_failed
+                ) or 0
+                self.total_inserted += inserted
+                uploaded_ids.update(point.id for point in points if point.id not in failed_ids)
+                self._resolve_dead_letters([point.id for point in points if point.id not in failed_ids])
+                logger.info(f"Total processed: {self.total_processed}, Total inserted: {self.total_inserted}, Total unchanged: {self.total_unchanged}")
+
+            stage_pipeline = StagePipeline(
+                [
+                    ("fetch", fetch_stage, self.config.fetch_concurrency),
+                    ("map", map_stage, self.config.map_concurrency),
+                    ("dense", dense_stage, self.config.dense_concurrency),
+                    ("sparse", sparse_stage, self.config.sparse_concurrency),
+                    ("insert", insert_stage, self.config.insert_concurrency),
+                ],
+                queue_size=self.config.queue_size,
+                log_interval=self.config.log_interval,
+                on_batch_done=self._on_batch_done,
+                on_batch_failed=self._on_batch_failed
+            )
+            await stage_pipeline.run(id_batches())
 
-                logger.info(f"Inserted {inserted} product models into qdrant")
-                total_processed += len(product_batch)
-                total_inserted += inserted
-                logger.info(f"Total processed: {total_processed}, Total inserted: {total_inserted}")
+        consistent = True
+        if non_blocking:
+            consistent = await self.inserter.wait_until_consistent(len(existing_ids | uploaded_ids))
 
-        logger.info(f"Finished fetching. Total inserted: {total_inserted}/{self.to_be_inserted[0]}")
-        if self.to_be_inserted[0] > 0 and total_inserted + 100 < self.to_be_inserted[0]:
-            logger.warning(f"Total inserted is less than expected by 100+. Total inserted: {total_inserted}/{self.to_be_inserted[0]}")
+        if self._use_progress:
+            self.checkpoint.finish()
+        if self.dead_letters is not None:
+            if not is_retry and product_ids:
+                # Products that are no longer listed can never be recovered
+                self.dead_letters.discard(set(self.dead_letters.ids()) - set(product_ids))
+            self.dead_letters.log_stats()
+
+        total_inserted = self.total_inserted
+        total_unchanged = self.total_unchanged
+
+        if incremental and not is_retry:
+            # Only trust the listing for deletions when it actually returned products
+            if product_ids:
+                removed_ids = list(set(stored_hashes) - set(product_ids))
+                if removed_ids:
+                    logger.info(f"Deleting {len(removed_ids)} products that are no longer listed")
+                    await delete_points(self.collection_name, removed_ids)
+            else:
+                logger.warning("Product listing came back empty; skipping deletion of stale products")
+            logger.info(
+                f"Incremental run: {total_unchanged} products unchanged, "
+                f"{total_unchanged} dense + {total_unchanged} sparse embeddings saved, "
+                f"{self.total_payload_updated} of them with updated price / stock, {total_inserted} products re-embedded"
+            )
+
+        total_up_to_date = total_inserted + total_unchanged
+        logger.info(f"Finished fetching. Total up to date: {total_up_to_date}/{self.to_be_inserted[0]}")
+        if self.to_be_inserted[0] > 0 and total_up_to_date + 100 < self.to_be_inserted[0]:
+            logger.warning(
+                f"Total up to date is less than expected by 100+. Total up to date: {total_up_to_date}/{self.to_be_inserted[0]}"
+                + (f"; {len(self.dead_letters)} products dead-lettered, see dead_letters.json" if self.dead_letters is not None else "")
+            )
             return False
         
-        return True
+        return consistent
+
+    def expected_points(self) -> int:
+        """Points a full build must hold: every listed product except the ones that ended up dead-lettered."""
+        failed = len(self.dead_letters) if self.dead_letters is not None else 0
+        return self.total_listed - failed
+
+
+def product_checkpoint(collection_name: str, checkpoint_dir: str) -> IngestionCheckpoint:
+    return IngestionCheckpoint(f"products_{collection_name}", checkpoint_dir)
 
 
 async def run_products_pipeline(
@@ -101,28 +414,86 @@ async def run_products_pipeline(
     bulk_fetch_size: int = 100,
     batch_create_embeddings_size: int = 100,
     batch_insert_points_size: int = 100,
-    recreate_collection: bool = False
+    fetch_concurrency: int = 2,
+    dense_concurrency: int = 2,
+    sparse_concurrency: int = 2,
+    insert_concurrency: int = 2,
+    max_in_flight_uploads: int = 0,
+    queue_size: int = 4,
+    raw_archive_path: str | None = None,
+    checkpoint_dir: str | None = DEFAULT_STATE_DIR,
+    preset: str = "full",
+    recreate_collection: bool = False,
+    incremental: bool = False,
+    refresh: bool = False,
+    retry_failed: bool = False,
+    legacy_collection: str | None = "gorgia_products_hybrid_1"
 ):
     logger.info(f"Starting Zoommer products pipeline with collection: {collection_name}")
-    
+
+    # Until `collection_alias.py migrate` has run, in-place runs keep writing the legacy collection the app reads
+    versions = CollectionVersions(async_qdrant_client, collection_name, legacy_collection=legacy_collection)
+    if recreate_collection and await versions.needs_migration():
+        logger.error(f"{collection_name} is still a plain collection; run `python collection_alias.py migrate {collection_name}` first")
+        return False
     if recreate_collection:
-        await delete_collection(collection_name=collection_name)
-    
-    await create_hybrid_collection(collection_name=collection_name, vector_size=vector_size)
-    
+        if incremental:
+            logger.warning("recreate_collection=True drops every stored hash; running a full ingestion instead of incremental")
+            incremental = False
+        # Full rebuilds go into a new version while the alias keeps serving the old one. An unfinished
+        # build is only resumed when its own checkpoint survived; otherwise the batches it already holds are unknown
+        target_collection = await versions.unfinished_build()
+        if target_collection and checkpoint_dir and product_checkpoint(target_collection, checkpoint_dir).load(bulk_fetch_size):
+            logger.info(f"Found an unfinished build; resuming it in {target_collection}")
+        else:
+            if target_collection and checkpoint_dir:
+                product_checkpoint(target_collection, checkpoint_dir).finish()
+            target_collection = versions.new_version_name()
+    else:
+        target_collection = await versions.resolve()
+
     config = ProductPipelineConfig(
         embedding_model=model,
         vector_size=vector_size,
-        collection_name=collection_name,
+        collection_name=target_collection,
+        alias=collection_name,
         fetcher_class=ZoommerFetcher,
         bulk_fetch_size=bulk_fetch_size,
         batch_create_embeddings_size=batch_create_embeddings_size,
-        batch_insert_points_size=batch_insert_points_size
+        batch_insert_points_size=batch_insert_points_size,
+        fetch_concurrency=fetch_concurrency,
+        dense_concurrency=dense_concurrency,
+        sparse_concurrency=sparse_concurrency,
+        insert_concurrency=insert_concurrency,
+        max_in_flight_uploads=max_in_flight_uploads,
+        queue_size=queue_size,
+        raw_archive_path=raw_archive_path,
+        checkpoint_dir=checkpoint_dir
     )
+
+    if refresh:
+        success = await ProductEmbedderPipeline(config).run_refresh()
+        logger.info(f"Zoommer products refresh completed. Success: {success}")
+        return success
     
+    if retry_failed:
+        success = await ProductEmbedderPipeline(config).retry_dead_letters()
+        logger.info(f"Zoommer products retry completed. Success: {success}")
+        return success
+
     pipeline = ProductEmbedderPipeline(config)
-    success = await pipeline.run_hybrid()
+    # preset / vector_size only take effect for new collections, i.e. recreate_collection=True
+    await create_hybrid_collection(collection_name=target_collection, vector_size=vector_size, preset=preset)
+    
+    success = await pipeline.run_hybrid(incremental=incremental)
+
+    if recreate_collection:
+        # Checked against the whole listing, so a build missing resumed or skipped batches never goes live
+        if success and await versions.validate(target_collection, pipeline.expected_points()):
+            await versions.promote(target_collection)
+        else:
+            logger.error(f"Not promoting {target_collection}; {collection_name} keeps serving {await versions.current()}")
+            success = False
     
     logger.info(f"Zoommer products pipeline completed. Success: {success}")
     return success
-
@@ -0,0 +1,81 @@
+import asyncio
+import hashlib
+import json
+import os
+from loguru import logger
+
+DEFAULT_RESPONSE_CACHE_DIR = os.getenv(
+    "ZOOMMER_RESPONSE_CACHE_DIR",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".http_cache")
+)
+
+
+class ResponseCache:
+    """
+    Disk cache of JSON responses with their ETag / Last-Modified validators, one file per URL.
+    Lets the fetcher send conditional GETs and reuse the stored body on 304 Not Modified.
+    File reads and writes (and the JSON work on them) run in the default executor, off the event loop.
+    """
+
+    def __init__(self, cache_dir: str = DEFAULT_RESPONSE_CACHE_DIR):
+        self.cache_dir = cache_dir
+        self.hits = 0
+        self.misses = 0
+        self.bytes_saved = 0
+
+    def _path(self, url: str) -> str:
+        key = hashlib.sha1(url.encode("utf-8")).hexdigest()
+        return os.path.join(self.cache_dir, key[:2], f"{key}.json")
+
+    def _read(self, path: str) -> dict | None:
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    async def get(self, url: str) -> dict | None:
+        return await asyncio.get_running_loop().run_in_executor(None, self._read, self._path(url))
+
+    def conditional_headers(self, entry: dict | None) -> dict:
+        headers = {}
+        if entry is None:
+            return headers
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def _write(self, url: str, entry: dict):
+        path = self._path(url)
+        tmp_path = f"{path}.tmp"
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(entry, f, ensure_ascii=False)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"Failed to cache response for {url}: {e}")
+
+    async def put(self, url: str, response, body) -> None:
+        etag = response.headers.get("etag")
+        last_modified = response.headers.get("last-modified")
+        # Without a validator the server can never answer 304, so there is nothing to gain from storing it
+        if not etag and not last_modified:
+            return
+        entry = {"etag": etag, "last_modified": last_modified, "size": len(response.content), "body": body}
+        await asyncio.get_running_loop().run_in_executor(None, self._write, url, entry)
+
+    def record_hit(self, entry: dict):
+        self.hits += 1
+        self.bytes_saved += entry.get("size", 0)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "not_modified": self.hits,
+            "full_responses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "mb_saved": round(self.bytes_saved / 1e6, 1),
+        }
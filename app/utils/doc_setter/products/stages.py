@@ -0,0 +1,116 @@
+import asyncio
+import time
+from loguru import logger
+
+_DONE = object()
+
+
+class Batch(list):
+    """List of items tagged with a key (e.g. its offset) that follows it through every stage."""
+
+    def __init__(self, items=(), key=None):
+        super().__init__(items)
+        self.key = key
+
+
+class StageStats:
+    def __init__(self, name: str, concurrency: int):
+        self.name = name
+        self.concurrency = concurrency
+        self.batches = 0
+        self.items = 0
+        self.busy_seconds = 0.0
+        self.started_at = time.perf_counter()
+
+    def summary(self) -> str:
+        elapsed = max(time.perf_counter() - self.started_at, 1e-9)
+        # Utilisation close to 1.0 means every worker of the stage is always busy -> bottleneck
+        utilisation = self.busy_seconds / (elapsed * self.concurrency)
+        return f"{self.name}: {self.items} items ({self.items / elapsed:.1f}/s), busy {utilisation:.0%}"
+
+
+class StagePipeline:
+    """
+    Chain of async stages connected by bounded queues.
+
+    Each stage is (name, worker, concurrency); a worker receives one batch and returns the batch
+    for the next stage (or None to drop it). Bounded queues give back-pressure, so a slow stage
+    stalls the ones before it instead of piling batches up in memory.
+    """
+
+    def __init__(self, stages: list[tuple], queue_size: int = 4, log_interval: float = 15.0, on_batch_done=None, on_batch_failed=None):
+        self.stages = stages
+        # on_batch_done(key): the batch left the pipeline (last stage or nothing left to do)
+        # on_batch_failed(stage_name, batch, error): a stage raised; the batch is dropped
+        self.on_batch_done = on_batch_done
+        self.on_batch_failed = on_batch_failed
+        self.queue_size = queue_size
+        self.log_interval = log_interval
+        self.stats = [StageStats(name, concurrency) for name, _, concurrency in stages]
+        self.queues = [asyncio.Queue(maxsize=queue_size) for _ in stages]
+
+    async def _worker(self, index: int, worker):
+        in_queue = self.queues[index]
+        out_queue = self.queues[index + 1] if index + 1 < len(self.queues) else None
+        stats = self.stats[index]
+        while True:
+            batch = await in_queue.get()
+            if batch is _DONE:
+                # Let the sibling workers of this stage see it too
+                await in_queue.put(_DONE)
+                return
+            start = time.perf_counter()
+            failed = False
+            try:
+                result = await worker(batch)
+            except Exception as e:
+                logger.error(f"Stage {stats.name} failed on a batch of {len(batch)}: {e}")
+                result = None
+                failed = True
+                if self.on_batch_failed:
+                    self.on_batch_failed(stats.name, batch, e)
+            stats.busy_seconds += time.perf_counter() - start
+            stats.batches += 1
+            stats.items += len(batch)
+            key = getattr(batch, "key", None)
+            if out_queue is not None and result:
+                await out_queue.put(result if isinstance(result, Batch) else Batch(result, key=key))
+            elif not failed and self.on_batch_done:
+                self.on_batch_done(key)
+
+    async def _run_stage(self, index: int, worker, concurrency: int):
+        await asyncio.gather(*(self._worker(index, worker) for _ in range(concurrency)))
+        if index + 1 < len(self.queues):
+            await self.queues[index + 1].put(_DONE)
+
+    async def _feed(self, source):
+        async for batch in source:
+            await self.queues[0].put(batch)
+        await self.queues[0].put(_DONE)
+
+    def log_progress(self):
+        depths = " | ".join(f"{stats.name} q={queue.qsize()}" for stats, queue in zip(self.stats, self.queues))
+        logger.info(f"Pipeline queues: {depths}")
+        for stats in self.stats:
+            logger.info(f"  {stats.summary()}")
+
+    async def _monitor(self):
+        while True:
+            await asyncio.sleep(self.log_interval)
+            self.log_progress()
+
+    async def run(self, source):
+        monitor = asyncio.create_task(self._monitor())
+        tasks = [asyncio.create_task(self._feed(source))] + [
+            asyncio.create_task(self._run_stage(i, worker, concurrency))
+            for i, (_, worker, concurrency) in enumerate(self.stages)
+        ]
+        try:
+            await asyncio.gather(*tasks)
+        finally:
+            # When the source raises (or run is cancelled) the stage workers would wait on their queues forever
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            monitor.cancel()
+        self.log_progress()
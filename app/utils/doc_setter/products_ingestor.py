@@ -7,6 +7,7 @@ if __name__ == "__main__":
         bulk_fetch_size=100,
         batch_create_embeddings_size=50,
         batch_insert_points_size=50,
-        recreate_collection=True
+        max_in_flight_uploads=4,
+        incremental=True
     ))
 
@@ -0,0 +1,8 @@
+import asyncio
+from products import run_products_pipeline
+
+if __name__ == "__main__":
+    asyncio.run(run_products_pipeline(
+        collection_name="gorgia_products_hybrid",
+        retry_failed=True
+    ))
@@ -2,6 +2,7 @@ from google import genai
 from google.genai import types
 from ..config import settings
 import asyncio
+import numpy as np
 
 class GeminiEmbeddings:
     def __init__(self, model: str, dimensions: int):
@@ -9,8 +10,8 @@ class GeminiEmbeddings:
         self.dimensions = dimensions
         self.client = genai.Client(api_key=settings.gemini_api_key)
 
-    async def embed_query(self, text: str) -> list[float]:
-        """Async wrapper for embedding a single query."""
+    async def embed_query(self, text: str) -> np.ndarray:
+        """Async wrapper for embedding a single query; returns a float32 vector."""
         loop = asyncio.get_event_loop()
         result = await loop.run_in_executor(
             None,
@@ -20,10 +21,10 @@ class GeminiEmbeddings:
                 config=types.EmbedContentConfig(output_dimensionality=self.dimensions)
             )
         )
-        return result.embeddings[0].values
+        return np.asarray(result.embeddings[0].values, dtype=np.float32)
 
-    async def embed_documents(self, texts: list[str]) -> list[list[float]]:
-        """Async wrapper for embedding multiple documents."""
+    async def embed_documents(self, texts: list[str]) -> np.ndarray:
+        """Async wrapper for embedding multiple documents; returns a (len(texts), dimensions) float32 matrix."""
         loop = asyncio.get_event_loop()
         result = await loop.run_in_executor(
             None,
@@ -33,7 +34,7 @@ class GeminiEmbeddings:
                 config=types.EmbedContentConfig(output_dimensionality=self.dimensions)
             )
         )
-        return [embedding.values for embedding in result.embeddings]
+        return np.asarray([embedding.values for embedding in result.embeddings], dtype=np.float32)
 
 def get_embeddings():
     embeddings = GeminiEmbeddings(
@@ -1,8 +1,11 @@
+import re
 import unicodedata
+from functools import lru_cache
 from typing import Literal
 from pydantic import BaseModel, Field
 from langchain_google_genai import ChatGoogleGenerativeAI
 from app.domain.services import BaseService
+from .language_id import ngram_language_identifier
 
 base_service = BaseService()
 
@@ -28,7 +31,7 @@ def in_ranges(cp, ranges):
             return True
     return False
 
-def classify_char(ch):
+def _classify_char_slow(ch):
     cp = ord(ch)
     cat = unicodedata.category(ch)
     if cat[0] in {"P","S","Z","C","N"}:
@@ -41,51 +44,128 @@ def classify_char(ch):
         return "han"
     return "other"
 
-def distribution(text):
+# Script lookup precomputed once at import: every BMP code point maps to a one-char code,
+# so a whole text is classified with a single str.translate call and counted with str.count.
+_SCRIPT_NAMES = [None, *RANGES.keys(), "other"]
+_SCRIPT_CODES = {name: chr(code) for code, name in enumerate(_SCRIPT_NAMES)}
+_IGNORED = _SCRIPT_CODES[None]
+_OTHER = _SCRIPT_CODES["other"]
+_BMP_SIZE = 0x10000
+
+def _build_script_table():
+    table = [
+        _IGNORED if unicodedata.category(chr(cp))[0] in "PSZCN" else _OTHER
+        for cp in range(_BMP_SIZE)
+    ]
+    # Reversed so that the first matching script in RANGES wins, as in _classify_char_slow
+    for lang, ranges in reversed(RANGES.items()):
+        for a,b in ranges:
+            for cp in range(a, b + 1):
+                if table[cp] != _IGNORED:
+                    table[cp] = _SCRIPT_CODES[lang]
+    for cp in range(_BMP_SIZE):
+        if table[cp] == _OTHER and "CJK UNIFIED IDEOGRAPH" in unicodedata.name(chr(cp), ""):
+            table[cp] = _SCRIPT_CODES["han"]
+    return table
+
+_SCRIPT_TABLE = _build_script_table()
+_RUN_RE = re.compile(
+    "([" + "".join(
+        re.escape(code) for name, code in _SCRIPT_CODES.items() if name not in (None, "georgian", "latin")
+    ) + r"])\1*"
+)
+
+@lru_cache(maxsize=4096)
+def _classify_astral(ch):
+    return _SCRIPT_CODES[_classify_char_slow(ch)]
+
+def _script_codes(text):
+    codes = text.translate(_SCRIPT_TABLE)
+    # Characters outside the BMP are left untouched by translate; classify them individually
+    if not codes.isascii():
+        codes = "".join(c if c.isascii() else _classify_astral(c) for c in codes)
+    return codes
+
+def classify_char(ch):
+    cp = ord(ch)
+    if cp < _BMP_SIZE:
+        return _SCRIPT_NAMES[ord(_SCRIPT_TABLE[cp])]
+    return _SCRIPT_NAMES[ord(_classify_astral(ch))]
+
+def _count_scripts(codes):
     counts = {k:0 for k in RANGES.keys()}
     total = 0
-    for ch in text:
-        lang = classify_char(ch)
-        if not lang:
+    for lang, code in _SCRIPT_CODES.items():
+        if lang is None:
             continue
-        counts[lang] = counts.get(lang,0) + 1
-        total += 1
-    perc = {k:v/total for k,v in counts.items() if total>0 and v>0}
-    return counts, perc, total
+        n = codes.count(code)
+        if n:
+            counts[lang] = n
+            total += n
+    return counts, total
 
-def longest_runs(text):
+def _longest_runs(codes):
     best = {}
-    prev = None
-    run = 0
-    for ch in text:
-        lang = classify_char(ch)
-        if not lang or lang in ("georgian","latin"):
-            if prev and prev not in ("georgian","latin"):
-                best[prev] = max(best.get(prev,0), run)
-            prev = None
-            run = 0
-            continue
-        if lang == prev:
-            run += 1
-        else:
-            if prev and prev not in ("georgian","latin"):
-                best[prev] = max(best.get(prev,0), run)
-            prev = lang
-            run = 1
-    if prev and prev not in ("georgian","latin"):
-        best[prev] = max(best.get(prev,0), run)
+    for m in _RUN_RE.finditer(codes):
+        lang = _SCRIPT_NAMES[ord(m.group(1))]
+        n = m.end() - m.start()
+        if n > best.get(lang,0):
+            best[lang] = n
     return best
 
+def _first_appearance_order(codes):
+    positions = []
+    for lang, code in _SCRIPT_CODES.items():
+        if lang is None:
+            continue
+        idx = codes.find(code)
+        if idx >= 0:
+            positions.append((idx, lang))
+    return {lang: i for i, (_, lang) in enumerate(sorted(positions))}
+
+def scan(text):
+    """
+    Classify text once and return (counts, total, longest_runs, first_appearance_order).
+    Runs are only tracked for scripts other than georgian and latin, as in longest_runs.
+    """
+    codes = _script_codes(text)
+    counts, total = _count_scripts(codes)
+    return counts, total, _longest_runs(codes), _first_appearance_order(codes)
+
+_WORD_RE = re.compile("[^" + re.escape(_IGNORED) + "]+")
+_FOREIGN_RE = re.compile(
+    "[" + "".join(
+        re.escape(code) for name, code in _SCRIPT_CODES.items() if name not in (None, "georgian", "latin", "other")
+    ) + "]"
+)
+
+def foreign_spans(text):
+    """
+    Return (start, end) offsets of every word containing letters from a script other than
+    georgian or latin, i.e. the spans that make needtranslate report other languages.
+    """
+    codes = _script_codes(text)
+    return [
+        (m.start(), m.end())
+        for m in _WORD_RE.finditer(codes)
+        if _FOREIGN_RE.search(codes, m.start(), m.end())
+    ]
+
+def _percentages(counts, total):
+    return {k:v/total for k,v in counts.items() if total>0 and v>0}
+
+def distribution(text):
+    counts, total = _count_scripts(_script_codes(text))
+    return counts, _percentages(counts, total), total
+
+def longest_runs(text):
+    return _longest_runs(_script_codes(text))
+
 def first_appearance_order(text):
-    order = {}
-    for ch in text:
-        lang = classify_char(ch)
-        if lang and lang not in order:
-            order[lang] = len(order)
-    return order
+    return _first_appearance_order(_script_codes(text))
 
 def needtranslate(text, min_ge=0.15):
-    counts, perc, _ = distribution(text)
+    _, perc, _ = distribution(text)
     if not perc:
         return False, "georgian", []
 
@@ -114,10 +194,17 @@ class LanguageDetectorOutput(BaseModel):
         description="If the 'language' field has the value 'other', specify the language here. Otherwise, leave this field empty."
     )
 
-language_detector_llm = ChatGoogleGenerativeAI(
-    model="gemini-2.5-flash",
-    google_api_key=base_service.get_gemini_key()
-).with_structured_output(LanguageDetectorOutput)
+_language_detector_llm = None
+
+def get_language_detector_llm():
+    """Gemini structured-output detector, only built the first time a low-confidence text needs it."""
+    global _language_detector_llm
+    if _language_detector_llm is None:
+        _language_detector_llm = ChatGoogleGenerativeAI(
+            model="gemini-2.5-flash",
+            google_api_key=base_service.get_gemini_key()
+        ).with_structured_output(LanguageDetectorOutput)
+    return _language_detector_llm
 
 def validate_language_output(output) -> bool:
     try:
@@ -137,3 +224,62 @@ def validate_language_output(output) -> bool:
     except Exception:
         return False
 
+SCRIPT_LANGUAGES = {"georgian": "georgian", "armenian": "armenian", "cyrillic": "russian"}
+OTHER_SCRIPT_LANGUAGES = {
+    "greek": "Greek", "arabic": "Arabic", "hebrew": "Hebrew", "devanagari": "Hindi", "thai": "Thai",
+    "han": "Chinese", "hiragana": "Japanese", "katakana": "Japanese", "hangul": "Korean",
+}
+UKRAINIAN_LETTERS = set("іїєґ")
+MIN_LANGUAGE_CONFIDENCE = 0.55
+
+def detect_language_local(text) -> tuple[LanguageDetectorOutput | None, float]:
+    """
+    Label text without an API call. The dominant script decides georgian, armenian, russian
+    and non-latin 'other' languages; latin text goes through the character n-gram identifier.
+    Confidence is in [0, 1].
+    """
+    _, perc, total = distribution(text)
+    if not total:
+        return None, 0.0
+
+    script, share = max(perc.items(), key=lambda item: item[1])
+
+    if script == "latin":
+        language, confidence = ngram_language_identifier.identify(text)
+        if language is None:
+            return None, 0.0
+        return LanguageDetectorOutput(language=language), round(confidence * share, 3)
+
+    if script == "cyrillic" and UKRAINIAN_LETTERS & set(text.lower()):
+        return LanguageDetectorOutput(language="other", if_other_then_which_language="Ukrainian"), share
+
+    if script in SCRIPT_LANGUAGES:
+        return LanguageDetectorOutput(language=SCRIPT_LANGUAGES[script]), share
+
+    if script in OTHER_SCRIPT_LANGUAGES:
+        return LanguageDetectorOutput(language="other", if_other_then_which_language=OTHER_SCRIPT_LANGUAGES[script]), share
+
+    return None, 0.0
+
+async def detect_language(text, min_confidence: float = MIN_LANGUAGE_CONFIDENCE) -> tuple[LanguageDetectorOutput | None, float]:
+    """
+    Local detection first; the Gemini detector is only called when the local confidence
+    is below min_confidence. LLM answers are reported with confidence 1.0.
+    """
+    output, confidence = detect_language_local(text)
+    if output is not None and confidence >= min_confidence:
+        return output, confidence
+
+    try:
+        llm_output = await get_language_detector_llm().ainvoke(text)
+        if validate_language_output(llm_output):
+            return LanguageDetectorOutput.model_validate(llm_output), 1.0
+    except Exception as e:
+        print(f"❌ Language detection LLM error: {e}")
+
+    return output, confidence
+
+def language_label(output: LanguageDetectorOutput) -> str:
+    if output.language == "other" and output.if_other_then_which_language:
+        return output.if_other_then_which_language.lower()
+    return output.language
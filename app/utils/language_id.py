@@ -0,0 +1,114 @@
+import math
+import re
+from collections import Counter
+
+# Short seed texts in the register our users write in (shopping, delivery, greetings).
+# Profiles are built from them once at import; "georgian" here is Georgian typed in latin letters.
+SEED_TEXTS = {
+    "english": (
+        "hello, I would like to buy a new phone. what is the price of this laptop and do you have it in stock? "
+        "how long does the delivery take to my city? can I return the item if it does not work? "
+        "thank you very much, which one is better for gaming and for the office? please show me the cheapest "
+        "headphones with a good battery. where is your nearest store and when are you open today?"
+    ),
+    "french": (
+        "bonjour, je voudrais acheter un nouveau téléphone. quel est le prix de cet ordinateur portable et "
+        "est-ce qu'il est disponible en stock? combien de temps prend la livraison dans ma ville? est-ce que je "
+        "peux retourner l'article s'il ne fonctionne pas? merci beaucoup, lequel est le meilleur pour les jeux "
+        "et pour le bureau? montrez-moi les écouteurs les moins chers avec une bonne batterie."
+    ),
+    "german": (
+        "hallo, ich möchte ein neues handy kaufen. wie viel kostet dieser laptop und ist er auf lager? wie lange "
+        "dauert die lieferung in meine stadt? kann ich den artikel zurückgeben, wenn er nicht funktioniert? "
+        "vielen dank, welches ist besser zum spielen und für das büro? bitte zeigen sie mir die günstigsten "
+        "kopfhörer mit einem guten akku. wo ist ihr nächstes geschäft und wann haben sie heute geöffnet?"
+    ),
+    "italian": (
+        "ciao, vorrei comprare un nuovo telefono. qual è il prezzo di questo portatile ed è disponibile in "
+        "magazzino? quanto tempo ci vuole per la consegna nella mia città? posso restituire l'articolo se non "
+        "funziona? grazie mille, quale è migliore per giocare e per l'ufficio? per favore mostrami le cuffie "
+        "più economiche con una buona batteria. dove si trova il vostro negozio più vicino?"
+    ),
+    "spanish": (
+        "hola, quiero comprar un teléfono nuevo. ¿cuál es el precio de este portátil y lo tienen en stock? "
+        "¿cuánto tarda la entrega a mi ciudad? ¿puedo devolver el artículo si no funciona? muchas gracias, "
+        "¿cuál es mejor para jugar y para la oficina? por favor muéstrame los auriculares más baratos con una "
+        "buena batería. ¿dónde está la tienda más cercana y a qué hora abren hoy?"
+    ),
+    "portuguese": (
+        "olá, eu gostaria de comprar um telefone novo. qual é o preço deste portátil e vocês têm em estoque? "
+        "quanto tempo demora a entrega na minha cidade? posso devolver o artigo se não funcionar? muito "
+        "obrigado, qual é melhor para jogos e para o escritório? por favor mostre-me os fones de ouvido mais "
+        "baratos com uma boa bateria. onde fica a loja mais próxima e quando vocês abrem hoje?"
+    ),
+    "turkish": (
+        "merhaba, yeni bir telefon satın almak istiyorum. bu dizüstü bilgisayarın fiyatı nedir ve stokta var "
+        "mı? şehrime teslimat ne kadar sürer? ürün çalışmazsa iade edebilir miyim? çok teşekkür ederim, oyun "
+        "ve ofis için hangisi daha iyi? lütfen bana iyi bataryalı en ucuz kulaklıkları gösterin. en yakın "
+        "mağazanız nerede ve bugün ne zaman açıksınız?"
+    ),
+    "georgian": (
+        "gamarjoba, minda viyido axali telefoni. ra girs es leptopi da gaqvt maragshi? ramdeni xani schirdeba "
+        "mitanas chems qalaqshi? shemidzlia davabruno nivti tu ar mushaobs? didi madloba, romelia ukete "
+        "tamashebistvis da ofisistvis? gtxovt machvenet yvelaze iafi yursasmenebi kargi batareit. sad aris "
+        "tqveni uaxloesi filiali da rodis xsnit dghes? ra ghirs, aris tu ara, ganvadeba gaqvt?"
+    ),
+}
+
+_WORD_RE = re.compile(r"[^\W\d_]+")
+
+
+def char_ngrams(text: str, n: int = 3) -> Counter:
+    words = _WORD_RE.findall(text.lower())
+    grams = Counter()
+    for word in words:
+        padded = f" {word} "
+        for i in range(len(padded) - n + 1):
+            grams[padded[i:i + n]] += 1
+    return grams
+
+
+class NGramLanguageIdentifier:
+    """
+    Character trigram identifier for latin-script text.
+    Scores are cosine similarities against per-language profiles; confidence is the
+    relative margin between the best and the runner-up, damped for very short inputs.
+    """
+
+    def __init__(self, seed_texts: dict[str, str] = SEED_TEXTS, n: int = 3, min_ngrams: int = 12):
+        self.n = n
+        self.min_ngrams = min_ngrams
+        self.profiles = {}
+        self.norms = {}
+        for language, text in seed_texts.items():
+            profile = char_ngrams(text, n)
+            self.profiles[language] = profile
+            self.norms[language] = math.sqrt(sum(v * v for v in profile.values()))
+
+    def _scores(self, grams: Counter) -> dict[str, float]:
+        norm = math.sqrt(sum(v * v for v in grams.values()))
+        if not norm:
+            return {}
+        return {
+            language: sum(count * profile.get(gram, 0) for gram, count in grams.items()) / (norm * self.norms[language])
+            for language, profile in self.profiles.items()
+        }
+
+    def scores(self, text: str) -> dict[str, float]:
+        return self._scores(char_ngrams(text, self.n))
+
+    def identify(self, text: str) -> tuple[str | None, float]:
+        grams = char_ngrams(text, self.n)
+        scores = self._scores(grams)
+        if not scores:
+            return None, 0.0
+        ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)
+        (best, best_score), (_, second_score) = ranked[0], ranked[1]
+        if best_score <= 0:
+            return None, 0.0
+        margin = (best_score - second_score) / best_score
+        length_factor = min(1.0, sum(grams.values()) / self.min_ngrams)
+        return best, round(margin * length_factor, 3)
+
+
+ngram_language_identifier = NGramLanguageIdentifier()
@@ -1,9 +1,14 @@
 import httpx
 import asyncio
 import json
+import os
+from pathlib import Path
 from typing import Any
 from pydantic import BaseModel
 
+# Same absolute path utils/brand_index.py reads, whatever directory this script is run from
+BRAND_SUMMARY_PATH = Path(__file__).resolve().parents[3] / "brand_summary.json"
+
 
 class ChildCategory(BaseModel):
     id: int
@@ -68,9 +73,12 @@ async def main():
         subs = await fetch_subcategories(client)
         summaries = await summarize(subs)
 
-    with open("brand_summary.json", "w", encoding="utf-8") as f:
+    # Write to a temp file and swap it in, so the runtime brand index never reads a partial file
+    tmp_path = BRAND_SUMMARY_PATH.with_suffix(".json.tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
         json.dump(summaries, f, indent=2, ensure_ascii=False)
-    print("✅ brand_summary.json written.")
+    os.replace(tmp_path, BRAND_SUMMARY_PATH)
+    print(f"✅ {BRAND_SUMMARY_PATH} written.")
 
 
 if __name__ == "__main__":
@@ -7,13 +7,21 @@ import asyncio
 import aiofiles
 import httpx
 from httpx import Response
+import hashlib
+import io
+import ijson
 import json
+import os
 import time
 
 load_dotenv()
 
 llm_semaphore = asyncio.Semaphore(70)
 
+PRODUCTS_PATH = "products.json"
+# {subcategory id: fingerprint of its products} for the summaries in PRODUCTS_PATH
+FINGERPRINTS_PATH = "products_fingerprints.json"
+
 
 class CategoryCatalogue(BaseModel):
     category_name: str = Field(
@@ -119,17 +127,68 @@ async def get_subcategories():
     return childCategories
 
 
+def _product_line(product: dict) -> str:
+    price_info = f"{product['price']}₾"
+    if product.get("previousPrice") and product["previousPrice"]:
+        price_info += f" (was:{product['previousPrice']}₾)"
+    return f"{product['id']}:{price_info}:{product['name']}\n"
+
+
+def _fingerprint_line(product: dict) -> str:
+    # The very line the LLM gets, so a new price, discount or name all count as a change
+    return _product_line(product).rstrip("\n")
+
+
+def fingerprint_lines(lines: list[str]) -> str:
+    """Order-independent hash of the products' summary lines (id, price, previous price, name), i.e. everything the summary is built from."""
+    return hashlib.sha256("\n".join(sorted(lines)).encode("utf-8")).hexdigest()
+
+
+def fingerprint_products(products: list[dict]) -> str:
+    return fingerprint_lines([_fingerprint_line(product) for product in products])
+
+
+async def stream_subcategory_products(client: httpx.AsyncClient, url: str) -> tuple[str, str]:
+    """
+    Read a subcategory listing (up to 10,000 full product objects) one product at a time while it downloads.
+    Returns the id:price:title lines for the LLM and the products' fingerprint; neither the response
+    body nor the product objects are ever held in memory as a whole.
+    """
+    lines = io.StringIO()
+    fingerprints = []
+    async with client.stream("GET", url) as response:
+        response.raise_for_status()
+        products = ijson.items_async(ijson.from_iter(response.aiter_bytes()), "products.item", use_float=True)
+        async for product in products:
+            if product["isInStock"] or True:
+                lines.write(_product_line(product))
+            fingerprints.append(_fingerprint_line(product))
+    return lines.getvalue(), fingerprint_lines(fingerprints)
+
+
+async def _read_json(path: str, default):
+    if not os.path.exists(path):
+        return default
+    async with aiofiles.open(path, "r", encoding="utf-8") as f:
+        return json.loads(await f.read())
+
+
 async def summarize_subcategorie(
     childCategory: dict,
     client: httpx.AsyncClient,
     max_retries: int = 3,
+    previous: dict | None = None,
+    previous_fingerprint: str | None = None,
 ):
+    """
+    Returns (summary dict, fingerprint), or None when there is nothing to summarize.
+    When the products' fingerprint matches previous_fingerprint the previous summary is reused without an LLM call.
+    """
     urlOfProducts = f"https://api.zoommer.ge/v1/Products/v3?CategoryId={childCategory['id']}&Limit=10000"
 
     for attempt in range(max_retries):
         try:
-            response = await client.get(urlOfProducts)
-            response.raise_for_status()
+            allProduct, fingerprint = await stream_subcategory_products(client, urlOfProducts)
             break  # Success, exit retry loop
         except (httpx.ConnectTimeout, httpx.ReadTimeout, httpx.ConnectError) as e:
             if attempt < max_retries - 1:
@@ -142,23 +201,14 @@ async def summarize_subcategorie(
                 print(
                     f"❌ HTTP error for {childCategory['name']} after {max_retries} attempts: {str(e)}"
                 )
-                return None
+                return _keep_previous(childCategory, previous, previous_fingerprint)
         except Exception as e:
             print(f"❌ HTTP error for {childCategory['name']}: {str(e)}")
-            return None
-
-    allProduct = ""
-    products = response.json()["products"]
+            return _keep_previous(childCategory, previous, previous_fingerprint)
 
-    if products:
-        for product in products:
-            if product["isInStock"] or True:
-                price_info = f"{product['price']}₾"
-                if product.get("previousPrice") and product["previousPrice"]:
-                    price_info += f" (was:{product['previousPrice']}₾)"
-                allProduct += (
-                    f"{product['id']}:{price_info}:{product['name']}\n"
-                )
+    if previous and fingerprint == previous_fingerprint:
+        print(f"⏭️ Unchanged: {childCategory['name']}")
+        return previous, fingerprint
 
     if not allProduct.strip():
         print(f"No in-stock products for {childCategory['name']}")
@@ -171,33 +221,68 @@ async def summarize_subcategorie(
         # Convert to dict and add parent category manually
         result_dict = result.model_dump()
         result_dict["parent_category_name"] = childCategory["parent_category_name"]
-        return result_dict
+        result_dict["subcategory_id"] = childCategory["id"]
+        return result_dict, fingerprint
     except Exception as e:
         print(f"llm analyzis failed for {childCategory['name']}:\n{str(e)}")
-        return None
+        return _keep_previous(childCategory, previous, previous_fingerprint)
 
 
-async def summarize_subcategories():
+def _keep_previous(childCategory: dict, previous: dict | None, previous_fingerprint: str | None):
+    # A failed fetch / LLM call keeps the last good summary; its old fingerprint makes the next run retry it
+    if previous:
+        print(f"↩️ Keeping previous summary for {childCategory['name']}")
+        return previous, previous_fingerprint
+    return None
+
+
+async def summarize_subcategories(products_path: str = PRODUCTS_PATH, fingerprints_path: str = FINGERPRINTS_PATH):
     timeout = httpx.Timeout(30.0, connect=10.0)
     limits = httpx.Limits(max_keepalive_connections=20, max_connections=50)
 
+    # Summaries written before subcategory_id was stored can't be matched and get re-summarized once
+    previous_by_id = {
+        str(entry["subcategory_id"]): entry
+        for entry in await _read_json(products_path, [])
+        if "subcategory_id" in entry
+    }
+    fingerprints = await _read_json(fingerprints_path, {})
+
     async with httpx.AsyncClient(timeout=timeout, limits=limits) as client:
         tasks = []
         subcategories = await get_subcategories()
 
         for subcategory in subcategories:
-            tasks.append(summarize_subcategorie(subcategory, client))
-
-        results = [
-            r
-            for r in await asyncio.gather(*tasks, return_exceptions=True)
-            if r and not isinstance(r, Exception)
-        ]
-
-        async with aiofiles.open("products.json", "w") as f:
+            subcategory_id = str(subcategory["id"])
+            tasks.append(summarize_subcategorie(
+                subcategory,
+                client,
+                previous=previous_by_id.get(subcategory_id),
+                previous_fingerprint=fingerprints.get(subcategory_id),
+            ))
+
+        results = []
+        new_fingerprints = {}
+        summarized = 0
+        for subcategory, r in zip(subcategories, await asyncio.gather(*tasks, return_exceptions=True)):
+            if not r or isinstance(r, Exception):
+                continue
+            entry, fingerprint = r
+            results.append(entry)
+            new_fingerprints[str(subcategory["id"])] = fingerprint
+            if entry is not previous_by_id.get(str(subcategory["id"])):
+                summarized += 1
+
+        # Subcategories that are gone from the listing drop out of both files
+        async with aiofiles.open(products_path, "w") as f:
             await f.write(json.dumps(results, indent=2, ensure_ascii=False))
+        async with aiofiles.open(fingerprints_path, "w") as f:
+            await f.write(json.dumps(new_fingerprints, indent=2))
 
-        print(f"Finished! Processed {len(results)} categories successfully.")
+        print(
+            f"Finished! {len(results)} categories: {summarized} summarized, "
+            f"{len(results) - summarized} unchanged or kept from the previous run."
+        )
 
 
 if __name__ == "__main__":
@@ -0,0 +1,179 @@
+from collections import OrderedDict
+from typing import Awaitable, Callable, Optional
+from pydantic import BaseModel, Field
+from .language_detector import foreign_spans, classify_char, distribution
+
+# Words LLM replies most often slip into Georgian text in Russian
+LOCAL_DICTIONARY = {
+    "georgian": {
+        "и": "და",
+        "или": "ან",
+        "да": "დიახ",
+        "нет": "არა",
+        "также": "ასევე",
+        "только": "მხოლოდ",
+        "очень": "ძალიან",
+        "сейчас": "ახლა",
+        "например": "მაგალითად",
+        "спасибо": "მადლობა",
+        "пожалуйста": "გთხოვთ",
+        "цена": "ფასი",
+        "скидка": "ფასდაკლება",
+        "гарантия": "გარანტია",
+        "доставка": "მიწოდება",
+        "рассрочка": "განვადება",
+        "магазин": "მაღაზია",
+        "филиал": "ფილიალი",
+        "модель": "მოდელი",
+        "телефон": "ტელეფონი",
+        "ноутбук": "ლეპტოპი",
+        "наушники": "ყურსასმენები",
+        "телевизор": "ტელევიზორი",
+        "цвет": "ფერი",
+        "память": "მეხსიერება",
+        "наличии": "მარაგშია",
+    },
+}
+
+CYRILLIC_TO_GEORGIAN = {
+    "а": "ა", "б": "ბ", "в": "ვ", "г": "გ", "д": "დ", "е": "ე", "ё": "იო", "ж": "ჟ",
+    "з": "ზ", "и": "ი", "й": "ი", "к": "კ", "л": "ლ", "м": "მ", "н": "ნ", "о": "ო",
+    "п": "პ", "р": "რ", "с": "ს", "т": "ტ", "у": "უ", "ф": "ფ", "х": "ხ", "ц": "ც",
+    "ч": "ჩ", "ш": "შ", "щ": "შჩ", "ъ": "", "ы": "ი", "ь": "", "э": "ე", "ю": "იუ",
+    "я": "ია",
+}
+
+TRANSLITERATION_TABLES = {
+    "georgian": {"cyrillic": CYRILLIC_TO_GEORGIAN},
+}
+
+
+class SpanFix(BaseModel):
+    source: str = Field(description="The word exactly as it was given")
+    fix: str = Field(description="The word rewritten in the target language")
+
+
+class SpanFixOutput(BaseModel):
+    fixes: list[SpanFix] = Field(description="One fix for every given word, in the same order")
+
+
+class SpanFixCache:
+    """Bounded LRU of (target_lang, span) -> fix, shared by every request in the worker."""
+
+    def __init__(self, max_size: int = 5000):
+        self.max_size = max_size
+        self._items: OrderedDict[tuple[str, str], str] = OrderedDict()
+
+    def get(self, target_lang: str, span: str):
+        key = (target_lang, span)
+        if key not in self._items:
+            return None
+        self._items.move_to_end(key)
+        return self._items[key]
+
+    def set(self, target_lang: str, span: str, fix: str):
+        key = (target_lang, span)
+        self._items[key] = fix
+        self._items.move_to_end(key)
+        while len(self._items) > self.max_size:
+            self._items.popitem(last=False)
+
+
+span_fix_cache = SpanFixCache()
+
+
+def _transliterate(word: str, target_lang: str) -> str | None:
+    tables = TRANSLITERATION_TABLES.get(target_lang, {})
+    out = []
+    for ch in word:
+        script = classify_char(ch)
+        if script in (None, target_lang, "latin"):
+            out.append(ch)
+            continue
+        table = tables.get(script)
+        if table is None or ch.lower() not in table:
+            return None
+        out.append(table[ch.lower()])
+    return "".join(out)
+
+
+def _local_fix(word: str, target_lang: str) -> str | None:
+    fix = LOCAL_DICTIONARY.get(target_lang, {}).get(word.lower())
+    if fix:
+        return fix
+
+    # Mixed-script words (e.g. "гარანტია") are a tokenization slip, so transliterating is enough
+    if any(classify_char(ch) == target_lang for ch in word):
+        return _transliterate(word, target_lang)
+    return None
+
+
+def _apply_fixes(text: str, spans: list[tuple[int, int]], fixes: dict[str, str]) -> str:
+    parts = []
+    last = 0
+    for start, end in spans:
+        word = text[start:end]
+        parts.append(text[last:start])
+        parts.append(fixes.get(word, word))
+        last = end
+    parts.append(text[last:])
+    return "".join(parts)
+
+
+async def repair_mixed_script(
+    text: str,
+    target_lang: str = "georgian",
+    llm_fixer: Optional[Callable[[list[str], str, str], Awaitable[dict[str, str]]]] = None,
+    max_span_share: float = 0.3,
+) -> str | None:
+    """
+    Rewrite only the words written in a foreign script, leaving the rest of the message
+    (markdown, numbers, brand names in latin) untouched.
+
+    Words are fixed from the span cache, then the local dictionary / transliteration table,
+    and whatever is left goes to llm_fixer(words, target_lang, text) in one batched call.
+    Returns None when the foreign part is too large for span repair or some spans could not
+    be fixed, so the caller can fall back to translating the whole message.
+    """
+    spans = foreign_spans(text)
+    if not spans:
+        return text
+
+    foreign_chars = sum(end - start for start, end in spans)
+    _, _, letters = distribution(text)
+    if letters and foreign_chars / letters > max_span_share:
+        return None
+
+    fixes = {}
+    unresolved = []
+    for start, end in spans:
+        word = text[start:end]
+        if word in fixes or word in unresolved:
+            continue
+        cached = span_fix_cache.get(target_lang, word)
+        if cached is not None:
+            fixes[word] = cached
+            continue
+        local = _local_fix(word, target_lang)
+        if local is not None:
+            fixes[word] = local
+            span_fix_cache.set(target_lang, word, local)
+        else:
+            unresolved.append(word)
+
+    print(f"🩹 Span repair: {len(spans)} spans, {len(fixes)} fixed locally/cached, {len(unresolved)} sent to LLM")
+
+    if unresolved and llm_fixer is not None:
+        try:
+            llm_fixes = await llm_fixer(unresolved, target_lang, text)
+        except Exception as e:
+            print(f"❌ Span repair LLM error: {e}")
+            llm_fixes = {}
+        for word, fix in llm_fixes.items():
+            fixes[word] = fix
+            span_fix_cache.set(target_lang, word, fix)
+
+    if any(word not in fixes for word in unresolved):
+        return None
+
+    return _apply_fixes(text, spans, fixes)
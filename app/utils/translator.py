@@ -1,8 +1,15 @@
+import asyncio
+import hashlib
+import json
 import logging
+import os
+import time
+from collections import OrderedDict
 from langchain_google_genai import ChatGoogleGenerativeAI
 from langchain_core.prompts import ChatPromptTemplate
 from app.config.settings import settings
 from .language_detector import needtranslate
+from .script_repair import repair_mixed_script, SpanFixOutput
 from pydantic import BaseModel, Field
 
 class TranslationOutput(BaseModel):
@@ -19,21 +26,9 @@ def _format_lang_list(langs: list[str]) -> str:
         return f"{langs[0]} and {langs[1]}"
     return ", ".join(langs[:-1]) + f", and {langs[-1]}"
 
-async def translate(msg: str, arg: tuple) -> str:
-    need_translate, target_lang, other_langs = arg
-    if not need_translate:
-        return msg
-
-    llm = ChatGoogleGenerativeAI(
-        model="gemini-2.5-flash",
-        google_api_key=settings.gemini_api_key,
-        temperature=0
-    )
-
-    structured_llm = llm.with_structured_output(TranslationOutput)
-
+def _build_hint(target_lang: str, other_langs: list[str]) -> str:
     others_str = _format_lang_list(other_langs)
-    hint = (
+    return (
         f"This message contains text written in multiple languages: {others_str}. "
         f"Your task is to carefully identify ANY text, words, or even individual characters that are NOT in {target_lang}, "
         f"and translate them into proper {target_lang}. "
@@ -43,28 +38,235 @@ async def translate(msg: str, arg: tuple) -> str:
         else f"Translate the following text into {target_lang}. Ensure all content is properly translated and maintains the original structure."
     )
 
-    translation_prompt = ChatPromptTemplate.from_messages(
-        [
-            ("system", hint),
-            ("human", "{text}"),
-        ]
-    )
+SPAN_FIX_HINT = (
+    "The following words were found inside a {target_lang} message but are written in another language or script. "
+    "Rewrite each word in {target_lang} so it fits the message. Brand and model names must be transliterated, not translated. "
+    "Return exactly one fix per word.\n\nMessage:\n{context}"
+)
 
-    try:
-        chain = translation_prompt | structured_llm
-        result = await chain.ainvoke({"text": msg})
 
-        if result is None:
-            print(f"⚠️ Translation failed: LLM returned None for message: {msg[:10000]}...")
+class TranslatorService:
+    """
+    Translation client shared by every request in a worker.
+
+    Holds a single Gemini client, a content-hash LRU cache of finished translations
+    (optionally persisted to a JSON file), hit-rate / time-saved metrics, and a semaphore
+    that caps concurrent translation calls so bursts don't eat the main agent's quota.
+    """
+
+    def __init__(
+        self,
+        model: str = "gemini-2.5-flash",
+        cache_size: int = 2000,
+        cache_path: str | None = None,
+        max_concurrency: int = 4,
+        persist_every: int = 20,
+    ):
+        self.model = model
+        self.cache_size = cache_size
+        self.cache_path = cache_path
+        self.max_concurrency = max_concurrency
+        self.persist_every = persist_every
+        self._llm = None
+        self._semaphore = None
+        self._cache: OrderedDict[str, str] = OrderedDict()
+        self._unsaved = 0
+        self._save_task: asyncio.Task | None = None
+        self.hits = 0
+        self.misses = 0
+        self.llm_calls = 0
+        self.llm_seconds = 0.0
+        self._load()
+
+    @property
+    def llm(self) -> ChatGoogleGenerativeAI:
+        if self._llm is None:
+            self._llm = ChatGoogleGenerativeAI(
+                model=self.model,
+                google_api_key=settings.gemini_api_key,
+                temperature=0
+            )
+        return self._llm
+
+    @property
+    def semaphore(self) -> asyncio.Semaphore:
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._semaphore
+
+    @staticmethod
+    def cache_key(text: str, target_lang: str, other_langs: list[str]) -> str:
+        content = f"{target_lang}|{','.join(sorted(other_langs))}|{text}"
+        return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+    def _load(self):
+        if not self.cache_path or not os.path.exists(self.cache_path):
+            return
+        try:
+            with open(self.cache_path, "r", encoding="utf-8") as f:
+                items = json.load(f)
+            for key, value in list(items.items())[-self.cache_size:]:
+                self._cache[key] = value
+            print(f"🈳 Loaded {len(self._cache)} cached translations from {self.cache_path}")
+        except (OSError, ValueError) as e:
+            logging.warning(f"Failed to load translation cache from {self.cache_path}: {e}")
+
+    def _write(self, snapshot: OrderedDict):
+        """
+        Merge `snapshot` over the file on disk (other workers share it) and swap the result in.
+        The tmp name is per process so concurrent writers never interleave in one file.
+        """
+        merged = OrderedDict()
+        try:
+            with open(self.cache_path, "r", encoding="utf-8") as f:
+                merged.update(json.load(f))
+        except FileNotFoundError:
+            pass
+        except ValueError as e:
+            logging.warning(f"Ignoring unreadable translation cache {self.cache_path}: {e}")
+        for key, value in snapshot.items():
+            merged.pop(key, None)
+            merged[key] = value
+        items = dict(list(merged.items())[-self.cache_size:])
+        tmp_path = f"{self.cache_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(items, f, ensure_ascii=False)
+        os.replace(tmp_path, self.cache_path)
+
+    def _take_snapshot(self) -> OrderedDict | None:
+        if not self.cache_path or not self._unsaved:
+            return None
+        self._unsaved = 0
+        return OrderedDict(self._cache)
+
+    def save(self):
+        """Persist synchronously (shutdown); request paths use asave so the loop never blocks on file I/O."""
+        snapshot = self._take_snapshot()
+        if snapshot is None:
+            return
+        try:
+            self._write(snapshot)
+        except OSError as e:
+            logging.warning(f"Failed to persist translation cache to {self.cache_path}: {e}")
+
+    async def asave(self):
+        unsaved = self._unsaved
+        snapshot = self._take_snapshot()
+        if snapshot is None:
+            return
+        try:
+            await asyncio.get_running_loop().run_in_executor(None, self._write, snapshot)
+        except OSError as e:
+            self._unsaved += unsaved
+            logging.warning(f"Failed to persist translation cache to {self.cache_path}: {e}")
+
+    def _cache_get(self, key: str) -> str | None:
+        if key not in self._cache:
+            return None
+        self._cache.move_to_end(key)
+        return self._cache[key]
+
+    def _cache_set(self, key: str, value: str):
+        self._cache[key] = value
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        self._unsaved += 1
+        if self._unsaved >= self.persist_every and (self._save_task is None or self._save_task.done()):
+            self._save_task = asyncio.create_task(self.asave())
+
+    async def _invoke(self, prompt: ChatPromptTemplate, output_schema, inputs: dict):
+        async with self.semaphore:
+            start = time.perf_counter()
+            try:
+                chain = prompt | self.llm.with_structured_output(output_schema)
+                return await chain.ainvoke(inputs)
+            finally:
+                self.llm_calls += 1
+                self.llm_seconds += time.perf_counter() - start
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        avg_llm_seconds = self.llm_seconds / self.llm_calls if self.llm_calls else 0.0
+        return {
+            "cache_size": len(self._cache),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "llm_calls": self.llm_calls,
+            "avg_llm_seconds": round(avg_llm_seconds, 3),
+            "seconds_saved": round(self.hits * avg_llm_seconds, 1),
+        }
+
+    async def translate(self, msg: str, target_lang: str, other_langs: list[str]) -> str:
+        key = self.cache_key(msg, target_lang, other_langs)
+        cached = self._cache_get(key)
+        if cached is not None:
+            self.hits += 1
+            print(f"🈳 Translation cache hit. Stats: {self.stats()}")
+            return cached
+        self.misses += 1
+
+        translation_prompt = ChatPromptTemplate.from_messages(
+            [
+                ("system", _build_hint(target_lang, other_langs)),
+                ("human", "{text}"),
+            ]
+        )
+
+        try:
+            result = await self._invoke(translation_prompt, TranslationOutput, {"text": msg})
+
+            if result is None:
+                print(f"⚠️ Translation failed: LLM returned None for message: {msg[:10000]}...")
+                return msg
+
+            print(f"\n🈳 Translated message:\n\"\"\"\n{msg}\n\"\"\"\n:\n\"\"\"{result.translated_text}\"\"\"\n📝 Reason: {result.reason}\n\n")
+            self._cache_set(key, result.translated_text)
+            print(f"🈳 Translation stats: {self.stats()}")
+            return result.translated_text
+        except Exception as e:
+            print(f"❌ Translation error: {e}. Returning original message: {msg[:10000]}...")
             return msg
 
-        print(f"\n🈳 Translated message:\n\"\"\"\n{msg}\n\"\"\"\n:\n\"\"\"{result.translated_text}\"\"\"\n📝 Reason: {result.reason}\n\n")
-        return result.translated_text
-    except Exception as e:
-        print(f"❌ Translation error: {e}. Returning original message: {msg[:10000]}...")
+    async def fix_spans(self, words: list[str], target_lang: str, context: str) -> dict[str, str]:
+        """Rewrite a batch of foreign-script words in one structured call (used by span repair)."""
+        prompt = ChatPromptTemplate.from_messages([
+            ("system", SPAN_FIX_HINT),
+            ("human", "{words}"),
+        ])
+        result = await self._invoke(prompt, SpanFixOutput, {
+            "target_lang": target_lang,
+            "context": context,
+            "words": "\n".join(words),
+        })
+        if result is None:
+            return {}
+        return {f.source: f.fix for f in result.fixes if f.source in words and f.fix}
+
+
+translator_service = TranslatorService(
+    cache_size=settings.translation_cache_size,
+    cache_path=settings.translation_cache_path,
+    max_concurrency=settings.translation_concurrency,
+)
+
+async def translate(msg: str, arg: tuple) -> str:
+    need_translate, target_lang, other_langs = arg
+    if not need_translate:
         return msg
+    return await translator_service.translate(msg, target_lang, other_langs)
 
 async def translate_if_needed(text: str) -> str:
     translation_result = needtranslate(text)
     print(f"🔍 Translation check result: {translation_result}")
-    return await translate(text, translation_result)
\ No newline at end of file
+    need_translate, target_lang, _ = translation_result
+    if not need_translate:
+        return text
+
+    repaired = await repair_mixed_script(text, target_lang, llm_fixer=translator_service.fix_spans)
+    if repaired is not None:
+        print(f"🩹 Repaired mixed-script spans:\n\"\"\"\n{text}\n\"\"\"\n:\n\"\"\"{repaired}\"\"\"\n")
+        return repaired
+
+    return await translate(text, translation_result)
@@ -0,0 +1,125 @@
+"""
+Peak RSS of a products reindex with list[float] embeddings (before) vs float32 arrays (after).
+
+Drives the real StagePipeline and EmbeddingClient with the products stage layout
+(dense -> sparse -> insert) and bounded queues. Only the outside world is replaced: the Gemini
+response is synthetic (a parsed JSON list of Python floats, like the SDK returns), sparse encoding
+is a fixed delay that makes it the bottleneck stage as in production, and the insert stage
+serialises the upsert request body instead of sending it.
+
+    legacy  - API lists are kept as they are and PointStructs are built for the whole batch
+    float32 - current code: as_float32_rows at the API boundary, PendingPoint until upsert
+
+Each variant runs in its own process so ru_maxrss is not shared. Run from the repository root:
+    python -m benchmarks.embedding_memory_bench --products 20000
+"""
+import argparse
+import asyncio
+import os
+import resource
+import subprocess
+import sys
+import time
+import numpy as np
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT_DIR, "app", "utils", "doc_setter"))
+
+DIMENSION = 3072
+
+
+def peak_rss_mb() -> float:
+    # ru_maxrss is in KiB on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+async def run_variant(variant: str, products: int, batch_size: int, insert_batch_size: int):
+    from qdrant_client.models import PointStruct
+    from common.embedding_client import EmbeddingClient
+    from common.vectors import PendingPoint, as_float32_rows, to_point_structs
+    from products.stages import StagePipeline
+
+    legacy = variant == "legacy"
+
+    class SyntheticEmbeddingClient(EmbeddingClient):
+        async def _request(self, texts: list[str]):
+            await asyncio.sleep(0.02)
+            response = np.random.rand(len(texts), DIMENSION).tolist()
+            return response if legacy else as_float32_rows(response)
+
+    client = SyntheticEmbeddingClient("synthetic", DIMENSION, requests_per_minute=10**9, tokens_per_minute=10**12)
+
+    class Sparse:
+        indices = np.array([1, 2, 3])
+        values = np.array([0.5, 0.3, 0.2], dtype=np.float32)
+
+        def as_object(self):
+            return {"indices": self.indices, "values": self.values}
+
+    async def id_batches():
+        for offset in range(0, products, batch_size):
+            yield list(range(offset, min(offset + batch_size, products)))
+
+    async def dense_stage(ids: list[int]) -> list[dict]:
+        embeddings = await client.embed([f"product {product_id}" for product_id in ids], batch_size=batch_size)
+        return [{"id": product_id, "dense": embedding} for product_id, embedding in zip(ids, embeddings)]
+
+    async def sparse_stage(records: list[dict]) -> list[dict]:
+        await asyncio.sleep(0.05)
+        for record in records:
+            record["sparse"] = Sparse()
+        return records
+
+    async def insert_stage(records: list[dict]) -> None:
+        payload = {"metadata": {"product": "name", "price": 1.0}}
+        if legacy:
+            points = [
+                PointStruct(id=r["id"], vector={"dense": r["dense"], "bm25": r["sparse"].as_object()}, payload=payload)
+                for r in records
+            ]
+        else:
+            points = [PendingPoint(r["id"], r["dense"], r["sparse"], payload) for r in records]
+        for i in range(0, len(points), insert_batch_size):
+            batch = to_point_structs(points[i:i + insert_batch_size])
+            body = "[" + ",".join(point.model_dump_json() for point in batch) + "]"
+            del body
+
+    baseline = peak_rss_mb()
+    start = time.perf_counter()
+    await StagePipeline(
+        [("dense", dense_stage, 2), ("sparse", sparse_stage, 1), ("insert", insert_stage, 2)],
+        queue_size=4,
+        log_interval=3600
+    ).run(id_batches())
+    print(f"{variant} {peak_rss_mb():.0f} {baseline:.0f} {time.perf_counter() - start:.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--products", type=int, default=20000)
+    parser.add_argument("--batch-size", type=int, default=100, help="bulk_fetch_size of the products pipeline")
+    parser.add_argument("--insert-batch-size", type=int, default=50)
+    parser.add_argument("--variant", choices=["legacy", "float32"], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.variant:
+        asyncio.run(run_variant(args.variant, args.products, args.batch_size, args.insert_batch_size))
+        return
+
+    print(f"{args.products} products, {DIMENSION} dims, batches of {args.batch_size}")
+    results = {}
+    for variant in ("legacy", "float32"):
+        output = subprocess.run(
+            [sys.executable, "-m", "benchmarks.embedding_memory_bench", "--variant", variant,
+             "--products", str(args.products), "--batch-size", str(args.batch_size),
+             "--insert-batch-size", str(args.insert_batch_size)],
+            cwd=ROOT_DIR, capture_output=True, text=True, check=True
+        ).stdout.split()
+        _, peak, baseline, elapsed = output[-4:]
+        results[variant] = float(peak) - float(baseline)
+        print(f"{variant:<8} peak RSS {float(peak):>6.0f} MB ({results[variant]:.0f} MB above start-up), {elapsed}s")
+    print(f"float32 saves {results['legacy'] - results['float32']:.0f} MB of peak RSS")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""
+Benchmark for the script classification used by needtranslate.
+
+Compares the previous per-character implementation (category lookup + linear scan over RANGES)
+with the precomputed lookup table in app/utils/language_detector.py.
+
+Run from the repository root:
+    python -m benchmarks.language_detector_bench
+"""
+import time
+import unicodedata
+from app.utils import language_detector as ld
+
+REPLIES = [
+    "გამარჯობა! 😊 ჩვენ გვაქვს **Samsung Galaxy S24 Ultra** 256GB — ფასი: **3,299 ₾** (იყო 3,599 ₾). "
+    "გსურთ, შეგირჩიოთ შესაბამისი ქეისი?",
+    "### iPhone 15 Pro\n- 128GB — 2,899 ₾\n- 256GB — 3,199 ₾\n- 512GB — 3,799 ₾\n\n"
+    "ყველა მოდელი ხელმისაწვდომია თბილისის ფილიალებში. რომელი ფერი გირჩევნიათ?",
+    "მიწოდება თბილისში ხდება 1-2 სამუშაო დღეში, რეგიონებში — 3-5 დღეში. например, თუ შეკვეთას "
+    "დღეს გააფორმებთ, ხვალ მიიღებთ. კიდევ რამე ხომ არ გაინტერესებთ?",
+    "ეს ლეპტოპი იდეალურია სამუშაოსთვის: Intel Core i7, 16GB RAM, 512GB SSD. Гарантия — 2 წელი. "
+    "💻 გსურთ სხვა ვარიანტების ნახვაც?",
+    "გარანტია ვრცელდება ქარხნულ დეფექტებზე. ნივთის დაბრუნება შესაძლებელია 14 დღის განმავლობაში, "
+    "თუ შენარჩუნებულია შეფუთვა და ჩეკი. დამატებითი ინფორმაციისთვის დაგვიკავშირდით: *2 22 22 22*.",
+]
+
+
+def _legacy_in_ranges(cp, ranges):
+    for a, b in ranges:
+        if a <= cp <= b:
+            return True
+    return False
+
+
+def _legacy_classify_char(ch):
+    cp = ord(ch)
+    cat = unicodedata.category(ch)
+    if cat[0] in {"P", "S", "Z", "C", "N"}:
+        return None
+    for lang, ranges in ld.RANGES.items():
+        if _legacy_in_ranges(cp, ranges):
+            return lang
+    name = unicodedata.name(ch, "")
+    if "CJK UNIFIED IDEOGRAPH" in name:
+        return "han"
+    return "other"
+
+
+def _legacy_distribution(text):
+    counts = {k: 0 for k in ld.RANGES.keys()}
+    total = 0
+    for ch in text:
+        lang = _legacy_classify_char(ch)
+        if not lang:
+            continue
+        counts[lang] = counts.get(lang, 0) + 1
+        total += 1
+    perc = {k: v / total for k, v in counts.items() if total > 0 and v > 0}
+    return counts, perc, total
+
+
+def _legacy_longest_runs(text):
+    best = {}
+    prev = None
+    run = 0
+    for ch in text:
+        lang = _legacy_classify_char(ch)
+        if not lang or lang in ("georgian", "latin"):
+            if prev and prev not in ("georgian", "latin"):
+                best[prev] = max(best.get(prev, 0), run)
+            prev = None
+            run = 0
+            continue
+        if lang == prev:
+            run += 1
+        else:
+            if prev and prev not in ("georgian", "latin"):
+                best[prev] = max(best.get(prev, 0), run)
+            prev = lang
+            run = 1
+    if prev and prev not in ("georgian", "latin"):
+        best[prev] = max(best.get(prev, 0), run)
+    return best
+
+
+def _legacy(text):
+    counts, perc, total = _legacy_distribution(text)
+    return counts, total, _legacy_longest_runs(text)
+
+
+def _current(text):
+    counts, total, runs, _ = ld.scan(text)
+    return counts, total, runs
+
+
+def _bench(fn, texts, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for text in texts:
+            fn(text)
+    return (time.perf_counter() - start) / (repeat * len(texts))
+
+
+def main(repeat: int = 2000):
+    texts = REPLIES + ["\n\n".join(REPLIES) * 4]
+
+    for text in texts:
+        legacy_counts, legacy_total, legacy_runs = _legacy(text)
+        counts, total, runs = _current(text)
+        assert {k: v for k, v in legacy_counts.items() if v} == {k: v for k, v in counts.items() if v}
+        assert legacy_total == total and legacy_runs == runs
+
+    start = time.perf_counter()
+    ld._build_script_table()
+    print(f"Table build (one-time, at import): {(time.perf_counter() - start) * 1000:.1f} ms")
+
+    chars = sum(len(t) for t in texts) / len(texts)
+    legacy_time = _bench(_legacy, texts, repeat)
+    current_time = _bench(_current, texts, repeat)
+    print(f"Average reply length: {chars:.0f} chars")
+    print(f"Legacy distribution + longest_runs: {legacy_time * 1e6:.1f} µs/reply")
+    print(f"Precomputed table scan:             {current_time * 1e6:.1f} µs/reply")
+    print(f"Speedup: {legacy_time / current_time:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
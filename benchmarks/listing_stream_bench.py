@@ -0,0 +1,167 @@
+"""
+Peak memory and time of parsing Zoommer listing responses whole (before) vs streamed with ijson (after).
+
+    category - Products/v3?CategoryId=...&Limit=10000 as used by app/utils/mappers/categories.py:
+               response.json() + `+=` line building vs categories.stream_subcategory_products
+    listing  - Products/v3?Limit=1000&Page=N (N > 1) as used by ZoommerFetcher.fetch_all_product_ids:
+               response.json() vs ZoommerFetcher._parse_listing_page(fields=("id",))
+
+Bodies are downloaded once (the largest --top subcategories by body size, or --category-ids) and then
+replayed through httpx.MockTransport in 64 KiB chunks, so both variants see the same bytes and network
+time is not part of the numbers. Time is the best of --repeat runs without tracing; peak is the
+tracemalloc peak of one more run. --synthetic N replaces the download with a generated N-product body.
+
+Run from the repository root:
+    python -m benchmarks.listing_stream_bench --top 5
+    python -m benchmarks.listing_stream_bench --synthetic 10000
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+import tracemalloc
+import httpx
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT_DIR, "app", "utils", "doc_setter"))
+sys.path.insert(0, os.path.join(ROOT_DIR, "app", "utils", "mappers"))
+
+import categories  # noqa: E402
+from products.fetcher import ELITE_BULK_BASE_URL, LISTING_PAGE_SIZE, ZoommerFetcher  # noqa: E402
+
+CHUNK_SIZE = 64 * 1024
+
+
+class ReplayStream(httpx.AsyncByteStream):
+    def __init__(self, body: bytes):
+        self.body = body
+
+    async def __aiter__(self):
+        for i in range(0, len(self.body), CHUNK_SIZE):
+            yield self.body[i:i + CHUNK_SIZE]
+
+
+def replay_client(body: bytes) -> httpx.AsyncClient:
+    return httpx.AsyncClient(transport=httpx.MockTransport(lambda request: httpx.Response(200, stream=ReplayStream(body))))
+
+
+async def category_legacy(body: bytes):
+    async with replay_client(body) as client:
+        response = await client.get("http://replay/category")
+        products = response.json()["products"]
+        fingerprint = categories.fingerprint_products(products)
+        lines = ""
+        for product in products:
+            price_info = f"{product['price']}₾"
+            if product.get("previousPrice"):
+                price_info += f" (was:{product['previousPrice']}₾)"
+            lines += f"{product['id']}:{price_info}:{product['name']}\n"
+        return len(lines), fingerprint
+
+
+async def category_streaming(body: bytes):
+    async with replay_client(body) as client:
+        lines, fingerprint = await categories.stream_subcategory_products(client, "http://replay/category")
+        return len(lines), fingerprint
+
+
+async def listing_legacy(body: bytes):
+    async with replay_client(body) as client:
+        response = await client.get("http://replay/listing")
+        return [product["id"] for product in response.json()["products"]]
+
+
+async def listing_streaming(body: bytes):
+    async with replay_client(body) as client:
+        async with client.stream("GET", "http://replay/listing") as response:
+            page = await ZoommerFetcher._parse_listing_page(response, ("id",))
+        return [product["id"] for product in page["products"]]
+
+
+async def measure(variant, body: bytes, repeat: int) -> tuple[float, float, object]:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = await variant(body)
+        best = min(best, time.perf_counter() - start)
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    await variant(body)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best, peak / 1e6, result
+
+
+def synthetic_body(products: int) -> bytes:
+    random.seed(7)
+    return json.dumps({"products": [
+        {
+            "id": 100000 + i,
+            "name": f"Product {i} {'x' * random.randint(20, 80)}",
+            "price": round(random.uniform(5, 5000), 2),
+            "previousPrice": round(random.uniform(5, 5000), 2) if i % 4 == 0 else None,
+            "isInStock": i % 7 != 0,
+            "imageUrl": f"https://s3.zoommer.ge/site/{i}.jpg",
+            "route": f"product-{i}",
+            "categoryId": 42,
+            "specifications": [{"name": f"spec {j}", "value": "v" * 20} for j in range(6)],
+        }
+        for i in range(products)
+    ], "totalCount": products}, ensure_ascii=False).encode("utf-8")
+
+
+async def download_largest(top: int, category_ids: list[str] | None) -> dict[str, bytes]:
+    async with httpx.AsyncClient(timeout=httpx.Timeout(60.0, connect=10.0)) as client:
+        if category_ids:
+            subcategories = [{"id": category_id, "name": category_id} for category_id in category_ids]
+        else:
+            subcategories = await categories.get_subcategories()
+        sem = asyncio.Semaphore(8)
+
+        async def download(subcategory):
+            async with sem:
+                response = await client.get(f"{ELITE_BULK_BASE_URL}?CategoryId={subcategory['id']}&Limit=10000")
+                return subcategory["name"], response.content if response.status_code == 200 else b""
+
+        bodies = await asyncio.gather(*(download(subcategory) for subcategory in subcategories))
+        return dict(sorted(bodies, key=lambda item: len(item[1]), reverse=True)[:top])
+
+
+async def download_listing_page() -> bytes:
+    async with httpx.AsyncClient(timeout=httpx.Timeout(60.0, connect=10.0)) as client:
+        response = await client.get(f"{ELITE_BULK_BASE_URL}?Limit={LISTING_PAGE_SIZE}&Page=1")
+        response.raise_for_status()
+        return response.content
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--top", type=int, default=5, help="Largest subcategories to benchmark")
+    parser.add_argument("--category-ids", help="Comma-separated subcategory IDs instead of the largest ones")
+    parser.add_argument("--synthetic", type=int, help="Generate a body with this many products instead of downloading")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    if args.synthetic:
+        bodies = {f"synthetic {args.synthetic}": synthetic_body(args.synthetic)}
+        listing_body = synthetic_body(LISTING_PAGE_SIZE)
+    else:
+        bodies = await download_largest(args.top, args.category_ids.split(",") if args.category_ids else None)
+        listing_body = await download_listing_page()
+
+    print(f"{'response':<32} {'MB':>6} {'variant':<10} {'time ms':>8} {'peak MB':>8}")
+    cases = [(name, body, category_legacy, category_streaming) for name, body in bodies.items()]
+    cases.append((f"listing page ({LISTING_PAGE_SIZE})", listing_body, listing_legacy, listing_streaming))
+    for name, body, legacy, streaming in cases:
+        legacy_time, legacy_peak, legacy_result = await measure(legacy, body, args.repeat)
+        streaming_time, streaming_peak, streaming_result = await measure(streaming, body, args.repeat)
+        assert legacy_result == streaming_result, f"{name}: variants disagree"
+        print(f"{name[:32]:<32} {len(body) / 1e6:>6.1f} {'legacy':<10} {legacy_time * 1000:>8.0f} {legacy_peak:>8.1f}")
+        print(f"{'':<32} {'':>6} {'streaming':<10} {streaming_time * 1000:>8.0f} {streaming_peak:>8.1f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,146 @@
+"""
+Benchmark for choosing a dense vector preset (common.vector_presets) and Matryoshka dimension.
+
+Samples points with their full 3072-dim vectors from an existing collection, loads them into a
+temporary collection per (dimension, preset) and reports, for each one:
+    recall@k  against exact float32 search on the full vectors (computed locally with numpy)
+    p50/p95   query latency, including rescoring with the app's oversampling settings
+    RAM       estimated bytes of vectors kept in RAM, scaled up to the source collection size
+
+Queries are held-out sampled points, or real query texts embedded with Gemini (--queries-file,
+one query per line), which is closer to production traffic.
+
+Run from the repository root:
+    python -m benchmarks.quantization_bench --source gorgia_products_hybrid --sample 5000 --dims 768,1536,3072
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+import numpy as np
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT_DIR, "app", "utils", "doc_setter"))
+
+from qdrant_client.http import models  # noqa: E402
+from products.clients import async_qdrant_client as client  # noqa: E402
+from common.embedding_client import get_embedding_client  # noqa: E402
+from common.vector_presets import (  # noqa: E402
+    COLLECTION_PRESETS, FULL_DENSE_DIMENSION, dense_vector_params, quantization_search_params, truncate_dense
+)
+from app.config import settings  # noqa: E402
+
+# Oversampling app.db.vector_store applies to collections of each preset
+PRESET_OVERSAMPLING = {"full": None, "scalar": settings.scalar_oversampling, "binary": settings.binary_oversampling}
+
+# Bits per dimension kept in RAM; quantized presets keep the float32 originals on disk
+RAM_BITS_PER_DIMENSION = {"full": 32, "scalar": 8, "binary": 1}
+
+
+async def load_sample(collection: str, count: int) -> tuple[list, np.ndarray]:
+    ids, vectors, offset = [], [], None
+    while len(ids) < count:
+        points, offset = await client.scroll(
+            collection_name=collection, limit=min(256, count - len(ids)), offset=offset,
+            with_payload=False, with_vectors=["dense"]
+        )
+        for point in points:
+            vector = point.vector["dense"] if isinstance(point.vector, dict) else point.vector
+            ids.append(point.id)
+            vectors.append(vector)
+        if offset is None:
+            break
+    vectors = np.asarray(vectors, dtype=np.float32)
+    if vectors.shape[1] != FULL_DENSE_DIMENSION:
+        raise SystemExit(f"{collection} stores {vectors.shape[1]}-dim vectors; the benchmark needs full {FULL_DENSE_DIMENSION}-dim ones")
+    return ids, vectors
+
+
+def exact_top_k(corpus: np.ndarray, queries: np.ndarray, k: int) -> list[set]:
+    corpus = corpus / np.linalg.norm(corpus, axis=1, keepdims=True)
+    queries = queries / np.linalg.norm(queries, axis=1, keepdims=True)
+    scores = queries @ corpus.T
+    return [set(np.argsort(-row)[:k].tolist()) for row in scores]
+
+
+async def wait_until_indexed(collection: str, timeout: float = 600.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        info = await client.get_collection(collection)
+        if info.status == models.CollectionStatus.GREEN:
+            return
+        await asyncio.sleep(1.0)
+    print(f"  {collection} still optimizing after {timeout:.0f}s; numbers may be off")
+
+
+async def bench_variant(corpus: np.ndarray, queries: np.ndarray, truth: list[set], dim: int, preset: str, k: int, keep: bool) -> dict:
+    name = f"bench_quantization_{preset}_{dim}"
+    if await client.collection_exists(name):
+        await client.delete_collection(collection_name=name)
+    await client.create_collection(name, vectors_config={"dense": dense_vector_params(dim, preset)})
+    for start in range(0, len(corpus), 256):
+        await client.upsert(name, points=[
+            models.PointStruct(id=start + i, vector={"dense": truncate_dense(vector.tolist(), dim)})
+            for i, vector in enumerate(corpus[start:start + 256])
+        ], wait=True)
+    await wait_until_indexed(name)
+
+    params = quantization_search_params(PRESET_OVERSAMPLING[preset])
+    latencies, recalls = [], []
+    for query, expected in zip(queries, truth):
+        start = time.perf_counter()
+        response = await client.query_points(
+            name, query=truncate_dense(query.tolist(), dim), using="dense", limit=k, search_params=params, with_payload=False
+        )
+        latencies.append(time.perf_counter() - start)
+        recalls.append(len({point.id for point in response.points} & expected) / k)
+
+    if not keep:
+        await client.delete_collection(collection_name=name)
+    latencies.sort()
+    return {
+        "recall": sum(recalls) / len(recalls),
+        "p50_ms": latencies[len(latencies) // 2] * 1000,
+        "p95_ms": latencies[int(len(latencies) * 0.95)] * 1000,
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--source", default="gorgia_products_hybrid", help="Collection (or alias) with full 3072-dim dense vectors")
+    parser.add_argument("--sample", type=int, default=5000)
+    parser.add_argument("--queries", type=int, default=200, help="Held-out sampled points used as queries")
+    parser.add_argument("--queries-file", help="Real query texts, one per line, embedded with Gemini instead")
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--dims", default="768,1536,3072")
+    parser.add_argument("--presets", default=",".join(COLLECTION_PRESETS))
+    parser.add_argument("--keep", action="store_true", help="Keep the benchmark collections")
+    args = parser.parse_args()
+
+    dims = [int(dim) for dim in args.dims.split(",")]
+    presets = args.presets.split(",")
+
+    ids, vectors = await load_sample(args.source, args.sample + (0 if args.queries_file else args.queries))
+    if args.queries_file:
+        with open(args.queries_file, "r", encoding="utf-8") as f:
+            texts = [line.strip() for line in f if line.strip()]
+        embeddings = await get_embedding_client("gemini-embedding-001", FULL_DENSE_DIMENSION).embed(texts)
+        queries = np.asarray([embedding for embedding in embeddings if embedding is not None], dtype=np.float32)
+        corpus = vectors
+    else:
+        queries, corpus = vectors[:args.queries], vectors[args.queries:]
+    truth = exact_top_k(corpus, queries, args.k)
+
+    total_points = (await client.count(collection_name=args.source, exact=True)).count
+    print(f"{len(corpus)} sampled points, {len(queries)} queries, k={args.k}; RAM scaled to {total_points} points in {args.source}")
+    print(f"{'dims':>5} {'preset':<7} {'recall@k':>9} {'p50 ms':>8} {'p95 ms':>8} {'vector RAM':>11}")
+    for dim in dims:
+        for preset in presets:
+            result = await bench_variant(corpus, queries, truth, dim, preset, args.k, args.keep)
+            ram_mb = total_points * dim * RAM_BITS_PER_DIMENSION[preset] / 8 / 1e6
+            print(f"{dim:>5} {preset:<7} {result['recall']:>9.3f} {result['p50_ms']:>8.1f} {result['p95_ms']:>8.1f} {ram_mb:>8.0f} MB")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
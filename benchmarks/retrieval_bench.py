@@ -0,0 +1,211 @@
+"""
+Retrieval benchmark: dense, lexical (BM25), hybrid RRF and hybrid DBSF at several prefetch sizes.
+
+Production VectorStore.hybrid_search fuses with RRF over a k*2 prefetch; the doc_setter search.py
+modules use DBSF over limit*10. This runs a labelled query set through each strategy against a
+local Qdrant and reports recall@k, MRR, p50/p95 Qdrant latency and returned payload bytes,
+overall and per query kind.
+
+Query set: JSONL, one query per line:
+    {"query": "...", "kind": "sku|name|georgian|english|price", "relevant": [product ids],
+     "filter": {"price_gte": 100, "price_lte": 500}}          # filter is optional
+Start one from the snapshot's own products (known-item SKU and name queries) with --generate,
+then add Georgian / English natural-language and price-filtered queries by hand.
+
+Embeddings are computed once per query (bypassing the ingestion embedding cache, so benchmark
+queries never end up in it) and are not part of the latency numbers, which only cover the Qdrant
+request. Quantized collections are searched with the rescoring / oversampling params the app uses.
+
+Run from the repository root, against a local Qdrant (docker run -p 6333:6333 qdrant/qdrant):
+    python -m benchmarks.retrieval_bench --snapshot products.snapshot --collection bench_products --generate 200
+    python -m benchmarks.retrieval_bench --collection bench_products --queries retrieval_queries.jsonl --prefetch 2,5,10
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+import httpx
+from qdrant_client import AsyncQdrantClient
+from qdrant_client.http import models
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT_DIR, "app", "utils", "doc_setter"))
+
+from fastembed import SparseTextEmbedding  # noqa: E402
+from common.embedding_client import get_embedding_client  # noqa: E402
+from common.vector_presets import FULL_DENSE_DIMENSION, preset_of, quantization_search_params, truncate_dense  # noqa: E402
+from app.config import settings  # noqa: E402
+
+# Oversampling app.db.vector_store applies to collections of each preset
+PRESET_OVERSAMPLING = {"full": None, "scalar": settings.scalar_oversampling, "binary": settings.binary_oversampling}
+
+
+async def restore_snapshot(qdrant_url: str, collection: str, snapshot_path: str):
+    async with httpx.AsyncClient(timeout=None) as http:
+        with open(snapshot_path, "rb") as f:
+            response = await http.post(
+                f"{qdrant_url}/collections/{collection}/snapshots/upload",
+                params={"priority": "snapshot", "wait": "true"},
+                headers={"api-key": os.getenv("QDRANT_API_KEY", "")},
+                files={"snapshot": (os.path.basename(snapshot_path), f)}
+            )
+    response.raise_for_status()
+    print(f"Restored {snapshot_path} into {collection}")
+
+
+async def generate_queries(client: AsyncQdrantClient, collection: str, count: int, path: str):
+    """Known-item queries from the collection itself: barcode -> product, product name -> product."""
+    points, offset = [], None
+    while True:
+        batch, offset = await client.scroll(collection_name=collection, limit=1000, offset=offset, with_payload=True, with_vectors=False)
+        points.extend(batch)
+        if offset is None:
+            break
+    random.seed(13)
+    queries = []
+    for point in random.sample(points, min(count, len(points))):
+        metadata = point.payload.get("metadata", {})
+        if metadata.get("bar_code"):
+            queries.append({"query": str(metadata["bar_code"]), "kind": "sku", "relevant": [point.id]})
+        if metadata.get("product"):
+            queries.append({"query": metadata["product"], "kind": "name", "relevant": [point.id]})
+    with open(path, "w", encoding="utf-8") as f:
+        for query in queries:
+            f.write(json.dumps(query, ensure_ascii=False) + "\n")
+    print(f"Wrote {len(queries)} generated queries to {path}")
+
+
+def build_filter(spec: dict | None) -> models.Filter | None:
+    if not spec:
+        return None
+    price_range = models.Range(gte=spec.get("price_gte"), lte=spec.get("price_lte"))
+    return models.Filter(must=[models.FieldCondition(key="metadata.price", range=price_range)])
+
+
+async def embed_queries(queries: list[dict], dense_size: int):
+    embedder = get_embedding_client("gemini-embedding-001", FULL_DENSE_DIMENSION, use_cache=False)
+    dense = await embedder.embed([q["query"] for q in queries])
+    bm25 = SparseTextEmbedding("Qdrant/bm25")
+    for query, dense_vector, sparse in zip(queries, dense, bm25.embed([q["query"].strip() for q in queries])):
+        query["dense"] = truncate_dense(dense_vector, dense_size) if dense_vector is not None else None
+        query["sparse"] = models.SparseVector(indices=sparse.indices.tolist(), values=sparse.values.tolist())
+
+
+def strategies(k: int, prefetch_multipliers: list[int], search_params: models.SearchParams | None = None) -> dict:
+    """name -> function(query) returning query_points kwargs; search_params go on the dense searches."""
+    def dense(q):
+        return {"query": q["dense"], "using": "dense", "search_params": search_params}
+
+    def lexical(q):
+        return {"query": q["sparse"], "using": "bm25"}
+
+    def fused(fusion, multiplier):
+        def run(q):
+            return {
+                "prefetch": [
+                    models.Prefetch(query=q["sparse"], using="bm25", limit=k * multiplier, filter=build_filter(q.get("filter"))),
+                    models.Prefetch(
+                        query=q["dense"], using="dense", limit=k * multiplier, filter=build_filter(q.get("filter")), params=search_params
+                    ),
+                ],
+                "query": models.FusionQuery(fusion=fusion),
+            }
+        return run
+
+    result = {"dense": dense, "lexical": lexical}
+    for multiplier in prefetch_multipliers:
+        result[f"rrf k*{multiplier}"] = fused(models.Fusion.RRF, multiplier)
+        result[f"dbsf k*{multiplier}"] = fused(models.Fusion.DBSF, multiplier)
+    return result
+
+
+def percentile(values: list[float], fraction: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+async def run_strategy(client: AsyncQdrantClient, collection: str, queries: list[dict], build, k: int) -> list[dict]:
+    rows = []
+    for q in queries:
+        start = time.perf_counter()
+        response = await client.query_points(
+            collection_name=collection, limit=k, with_payload=True, query_filter=build_filter(q.get("filter")), **build(q)
+        )
+        latency = time.perf_counter() - start
+        ids = [point.id for point in response.points]
+        relevant = set(q["relevant"])
+        first_hit = next((rank for rank, point_id in enumerate(ids, 1) if point_id in relevant), None)
+        rows.append({
+            "kind": q.get("kind", "other"),
+            "recall": len(relevant.intersection(ids)) / len(relevant),
+            "rr": 1 / first_hit if first_hit else 0.0,
+            "latency": latency,
+            "payload_bytes": sum(len(json.dumps(point.payload, ensure_ascii=False).encode("utf-8")) for point in response.points),
+        })
+    return rows
+
+
+def summarize(rows: list[dict]) -> dict:
+    return {
+        "recall": sum(row["recall"] for row in rows) / len(rows),
+        "mrr": sum(row["rr"] for row in rows) / len(rows),
+        "p50_ms": percentile([row["latency"] for row in rows], 0.5) * 1000,
+        "p95_ms": percentile([row["latency"] for row in rows], 0.95) * 1000,
+        "payload_kb": sum(row["payload_bytes"] for row in rows) / len(rows) / 1024,
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--qdrant-url", default=os.getenv("BENCH_QDRANT_URL", "http://localhost:6333"))
+    parser.add_argument("--collection", default="bench_products")
+    parser.add_argument("--snapshot", help="Restore this snapshot file into --collection first")
+    parser.add_argument("--queries", default="retrieval_queries.jsonl")
+    parser.add_argument("--generate", type=int, help="Write N sampled products' known-item queries to --queries and exit")
+    parser.add_argument("--k", type=int, default=7, help="Production default for product search")
+    parser.add_argument("--prefetch", default="2,5,10", help="Prefetch sizes as multiples of k")
+    parser.add_argument("--json", help="Also write per-strategy results here")
+    args = parser.parse_args()
+
+    client = AsyncQdrantClient(url=args.qdrant_url, api_key=os.getenv("QDRANT_API_KEY"))
+    if args.snapshot:
+        await restore_snapshot(args.qdrant_url, args.collection, args.snapshot)
+    if args.generate:
+        await generate_queries(client, args.collection, args.generate, args.queries)
+        return
+
+    with open(args.queries, "r", encoding="utf-8") as f:
+        queries = [json.loads(line) for line in f if line.strip()]
+    info = await client.get_collection(args.collection)
+    dense_params = info.config.params.vectors["dense"]
+    preset = preset_of(dense_params.quantization_config or info.config.quantization_config)
+    search_params = quantization_search_params(PRESET_OVERSAMPLING[preset])
+    await embed_queries(queries, dense_params.size)
+    labelled = [q for q in queries if q["dense"] is not None and q.get("relevant")]
+    skipped, queries = len(queries) - len(labelled), labelled
+    kinds = sorted({q.get("kind", "other") for q in queries})
+    print(f"{len(queries)} queries ({skipped} skipped) on {args.collection} ({info.points_count} points, {preset} preset), k={args.k}")
+
+    header = f"{'strategy':<12} {'recall@k':>9} {'MRR':>6} {'p50 ms':>7} {'p95 ms':>7} {'payload KB':>10}  " + " ".join(f"{kind:>9}" for kind in kinds)
+    print(header)
+    results = {}
+    for name, build in strategies(args.k, [int(m) for m in args.prefetch.split(",")], search_params).items():
+        rows = await run_strategy(client, args.collection, queries, build, args.k)
+        summary = summarize(rows)
+        summary["recall_by_kind"] = {kind: summarize([row for row in rows if row["kind"] == kind])["recall"] for kind in kinds}
+        results[name] = summary
+        print(
+            f"{name:<12} {summary['recall']:>9.3f} {summary['mrr']:>6.3f} {summary['p50_ms']:>7.1f} {summary['p95_ms']:>7.1f} "
+            f"{summary['payload_kb']:>10.1f}  " + " ".join(f"{summary['recall_by_kind'][kind]:>9.3f}" for kind in kinds)
+        )
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,121 @@
+"""
+Benchmark for BM25 encoding in the ingestion pipelines.
+
+Compares the previous in-loop call (bm25_embedding_model.embed on the event loop) with
+common.sparse_encoder.SparseEncoder (process pool, chunked), and reports how long the event
+loop was blocked in each case.
+
+Texts come from a dump of real product texts: a JSONL file with a "sparse_text" field per line
+(or one text per line). Without --dump, product entries are taken from products.json.
+
+Run from the repository root:
+    python -m benchmarks.sparse_embedding_bench --dump sparse_texts.jsonl --workers 4
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT_DIR, "app", "utils", "doc_setter"))
+
+from fastembed import SparseTextEmbedding  # noqa: E402
+from common.sparse_encoder import SparseEncoder, DEFAULT_SPARSE_MODEL  # noqa: E402
+
+
+def load_texts(dump_path: str | None, count: int) -> list[str]:
+    texts = []
+    if dump_path:
+        with open(dump_path, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    texts.append(json.loads(line)["sparse_text"])
+                except (ValueError, KeyError, TypeError):
+                    texts.append(line)
+    else:
+        with open(os.path.join(ROOT_DIR, "products.json"), "r", encoding="utf-8") as f:
+            for category in json.load(f):
+                texts.extend(part.strip() for part in category["summary"].split(";") if part.strip())
+    if not texts:
+        raise SystemExit("No texts to benchmark")
+    return (texts * (count // len(texts) + 1))[:count]
+
+
+class LoopLagMonitor:
+    """Measures the longest gap between ticks of a 10 ms timer, i.e. how long the loop was blocked."""
+
+    def __init__(self, interval: float = 0.01):
+        self.interval = interval
+        self.max_lag = 0.0
+        self._task = None
+
+    async def _tick(self):
+        while True:
+            start = time.perf_counter()
+            await asyncio.sleep(self.interval)
+            self.max_lag = max(self.max_lag, time.perf_counter() - start - self.interval)
+
+    def __enter__(self):
+        self._task = asyncio.create_task(self._tick())
+        return self
+
+    def __exit__(self, *exc):
+        self._task.cancel()
+
+
+async def bench_in_loop(texts: list[str]):
+    model = SparseTextEmbedding(DEFAULT_SPARSE_MODEL)
+    with LoopLagMonitor() as monitor:
+        await asyncio.sleep(0.02)
+        start = time.perf_counter()
+        embeddings = list(model.embed(text.strip() for text in texts))
+        elapsed = time.perf_counter() - start
+        await asyncio.sleep(0.02)
+    return embeddings, elapsed, monitor.max_lag
+
+
+async def bench_encoder(texts: list[str], workers: int, chunk_size: int):
+    encoder = SparseEncoder(workers=workers, chunk_size=chunk_size)
+    # Warm the pool up so worker start-up and model loading are not counted
+    await encoder.embed(texts[:workers * chunk_size or chunk_size])
+    with LoopLagMonitor() as monitor:
+        start = time.perf_counter()
+        embeddings = await encoder.embed([text.strip() for text in texts])
+        elapsed = time.perf_counter() - start
+    encoder.close()
+    return embeddings, elapsed, monitor.max_lag
+
+
+def _same(a, b) -> bool:
+    return a.indices.tolist() == b.indices.tolist() and a.values.tolist() == b.values.tolist()
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--dump", help="JSONL with a sparse_text field per line, or plain text lines")
+    parser.add_argument("--count", type=int, default=20000)
+    parser.add_argument("--workers", type=int, default=max(1, (os.cpu_count() or 1) - 1))
+    parser.add_argument("--chunk-size", type=int, default=256)
+    args = parser.parse_args()
+
+    texts = load_texts(args.dump, args.count)
+    avg_chars = sum(len(text) for text in texts) / len(texts)
+    print(f"{len(texts)} texts, {avg_chars:.0f} chars on average, {os.cpu_count()} CPUs")
+
+    baseline, baseline_time, baseline_lag = await bench_in_loop(texts)
+    print(f"In-loop embed:             {baseline_time:.2f}s ({len(texts) / baseline_time:.0f} texts/s), loop blocked up to {baseline_lag * 1000:.0f} ms")
+
+    for workers in sorted({0, args.workers}):
+        embeddings, elapsed, lag = await bench_encoder(texts, workers, args.chunk_size)
+        assert len(embeddings) == len(baseline) and all(_same(a, b) for a, b in zip(embeddings, baseline))
+        label = f"SparseEncoder(workers={workers}):"
+        print(f"{label:<27}{elapsed:.2f}s ({len(texts) / elapsed:.0f} texts/s), loop blocked up to {lag * 1000:.0f} ms, speedup {baseline_time / elapsed:.1f}x")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())